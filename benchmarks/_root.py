@@ -0,0 +1,8 @@
+# _root.py
+"""벤치마크 스크립트에서 저장소 루트 모듈을 import 할 수 있게 sys.path 에 추가"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,83 @@
+# bench_capture.py
+"""
+틱당 캡처 지연 벤치마크 (헤드리스)
+
+- 기존: 타깃마다 getPixel 2회 + 디버그 크롭 2회 = 화면 캡처 4회
+- 엔진: 합집합 bbox 를 틱당 1회 캡처 후 버퍼에서 읽기
+
+    python benchmarks/bench_capture.py [타깃수] [틱수] [캡처당 고정비용 ms]
+
+ArrayGrabber 는 메모리 복사뿐이라 실제 ImageGrab/mss 왕복 비용이 없으므로
+캡처 1회당 고정 비용(기본 0.5ms)을 더해 실제 화면 캡처를 흉내낸다.
+"""
+import sys
+import time
+
+from synth import make_screen, make_targets
+
+from grabber import CaptureEngine
+
+
+class CostGrabber:
+    """grab() 호출마다 cost_ms 만큼 busy-wait 하는 래퍼"""
+
+    def __init__(self, grabber, cost_ms):
+        self.grabber = grabber
+        self.cost = cost_ms / 1000
+
+    def grab(self, left, top, width, height):
+        end = time.perf_counter() + self.cost
+        out = self.grabber.grab(left, top, width, height)
+        while time.perf_counter() < end:
+            pass
+        return out
+
+    def close(self):
+        self.grabber.close()
+
+
+def tick_legacy(grabber, targets):
+    for t in targets:
+        for x, y in ((t["x0"], t["y0"]), (t["x1"], t["y1"])):
+            grabber.grab(x, y, 1, 1)[0, 0]
+        for x, y in ((t["x0"], t["y0"]), (t["x1"], t["y1"])):
+            grabber.grab(x - 5, y - 5, 20, 20)
+
+
+def tick_engine(engine, targets):
+    engine.tick()
+    for t in targets:
+        engine.pixel(t["x0"], t["y0"])
+        engine.pixel(t["x1"], t["y1"])
+        engine.crop(t["x0"] - 5, t["y0"] - 5, 20, 20)
+        engine.crop(t["x1"] - 5, t["y1"] - 5, 20, 20)
+
+
+def measure(fn, ticks):
+    fn()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        fn()
+    return (time.perf_counter() - start) / ticks * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    cost = float(sys.argv[3]) if len(sys.argv) > 3 else 0.5
+
+    targets = make_targets(n)
+    grabber = CostGrabber(make_screen(targets), cost)
+    points = [(t["x0"], t["y0"]) for t in targets] + [(t["x1"], t["y1"]) for t in targets]
+    engine = CaptureEngine(grabber, points, margin=20)
+
+    legacy = measure(lambda: tick_legacy(grabber, targets), ticks)
+    fast = measure(lambda: tick_engine(engine, targets), ticks)
+
+    print(f"targets={n} ticks={ticks} grab_cost={cost}ms")
+    print(f"  legacy : {legacy:.3f} ms/tick ({n * 4} grabs)")
+    print(f"  engine : {fast:.3f} ms/tick (1 grab, bbox={engine.bbox})")
+
+
+if __name__ == "__main__":
+    main()
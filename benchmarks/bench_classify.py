@@ -0,0 +1,68 @@
+# bench_classify.py
+"""
+프로브 분류 마이크로 벤치마크 (헤드리스)
+
+- getPixel   : 픽셀 1개씩 읽어 SIGNAL_COLORS 튜플 비교 (기존 main.py)
+- match_color: 픽셀 1개씩 color.match_color (채널별 near())
+- vectorized : SignalClassifier.classify 한 번
+
+    python benchmarks/bench_classify.py [타깃수] [반복수]
+"""
+import sys
+import time
+
+from synth import PALETTE, make_screen, make_targets
+
+from classifier import SignalClassifier
+from color import match_color
+from grabber import CaptureEngine
+
+WHITE = (255, 255, 255)
+SIGNAL_COLORS = set(PALETTE)
+
+
+def run_getpixel(engine, targets):
+    out = []
+    for t in targets:
+        for x, y in ((t["x0"], t["y0"]), (t["x1"], t["y1"])):
+            pixel = engine.pixel(x, y)
+            out.append(pixel if pixel in SIGNAL_COLORS else WHITE)
+    return out
+
+
+def run_match_color(engine, targets):
+    return [
+        match_color(engine.pixel(x, y))
+        for t in targets
+        for x, y in ((t["x0"], t["y0"]), (t["x1"], t["y1"]))
+    ]
+
+
+def measure(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    targets = make_targets(n)
+    points = [(t["x0"], t["y0"]) for t in targets] + [(t["x1"], t["y1"]) for t in targets]
+    engine = CaptureEngine(make_screen(targets), points)
+    frame = engine.tick()
+
+    classifier = SignalClassifier(PALETTE)
+    classifier.set_targets(targets, engine.bbox)
+
+    print(f"targets={n} probes={n * 2}")
+    print(f"  getPixel    : {measure(lambda: run_getpixel(engine, targets), repeat):9.1f} us")
+    print(f"  match_color : {measure(lambda: run_match_color(engine, targets), repeat):9.1f} us")
+    print(f"  vectorized  : {measure(lambda: classifier.classify(frame), repeat):9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# bench_debounce.py
+"""
+신호 판정 상태 머신(detector.SignalDetector) 벤치마크
+
+대상마다 봉(period 초, 같은 시간대 차트끼리는 같이 마감)이 바뀔 때 p1 색이 바뀌고
+절반 확률로 몇 초 안에 p0 에 신호색이 뜬다.
+그 위에 틱마다 한 프레임짜리 깜빡임(p0/p1 중 하나가 아무 색)을 섞는다.
+- 이전 checkSignals: 대상 전체가 send_color 하나를 공유, 디바운스 없음
+- 대상별 (debounce=1) / 대상별 + 디바운스 2 프레임 + 쿨다운 1 초
+에 대해 신호 수(= 캡처 + 전송 수), 그중 깜빡임 때문에 나간 것, 놓친 실제 신호, 지연, 틱당 비용을 본다.
+
+    python benchmarks/bench_debounce.py [타깃수] [초]
+"""
+import sys
+import time
+
+import numpy as np
+from _root import ROOT  # noqa: F401
+
+from classifier import NONE
+from detector import SignalDetector
+
+TICK = 0.01
+PERIOD = 60.0
+FLICKER = 0.002  # 틱마다 대상별 깜빡임 확률
+COLORS = 4
+
+
+def scenario(n, seconds, seed=0):
+    """틱별 (실제 라벨, 관측 라벨) 와 실제 신호 [(시각, 대상, p0)]"""
+    rng = np.random.default_rng(seed)
+    phase = rng.integers(4, size=n) * PERIOD / 4
+    truth = np.full((n, 2), NONE, dtype=np.intp)
+    truth[:, 1] = 0
+    bar = np.full(n, -1)
+    due = {}  # 대상 → (p0 가 뜰 시각, 색)
+    real = []
+    for k in range(int(seconds / TICK)):
+        now = k * TICK
+        current = ((now - phase) // PERIOD).astype(int)
+        for i in np.flatnonzero(current != bar).tolist():
+            bar[i] = current[i]
+            truth[i] = (NONE, (truth[i, 1] + 1) % COLORS)
+            if rng.random() < 0.5:
+                due[i] = (now + rng.uniform(0, 5), int(rng.integers(COLORS)))
+        for i, (t, color) in list(due.items()):
+            if t <= now:
+                del due[i]
+                truth[i, 0] = color
+                real.append((now, i, color))
+        obs = truth.copy()
+        for i in np.flatnonzero(rng.random(n) < FLICKER).tolist():
+            obs[i, rng.integers(2)] = rng.integers(-1, COLORS)
+        yield now, obs, real
+
+
+def shared_step(state, labels):
+    """이전 checkSignals (send_color 하나를 전체가 공유)"""
+    prev = state["prev"]
+    events = []
+    for i in np.flatnonzero((labels != prev).any(axis=1)).tolist():
+        p0, p1 = labels[i].tolist()
+        if prev[i, 1] != p1:
+            state["send_color"] = None
+        prev[i] = labels[i]
+        if p0 == NONE or state["send_color"] == p0:
+            continue
+        state["send_color"] = p0
+        events.append((i, p0, p1))
+    return events
+
+
+def run(n, seconds, step):
+    sent = []
+    elapsed = 0.0
+    for now, obs, real in scenario(n, seconds):
+        start = time.perf_counter()
+        events = step(obs, now)
+        elapsed += time.perf_counter() - start
+        if now > 0:
+            sent.extend((now, i, p0) for i, p0, _ in events)
+    return sent, real, elapsed / (seconds / TICK)
+
+
+def score(sent, real):
+    """(실제 신호로 나간 수, 깜빡임/중복으로 나간 수, 놓친 수, 평균 지연 ms)"""
+    pending = {}
+    for t, i, p0 in real:
+        pending.setdefault(i, []).append((t, p0))
+    hits, latency = 0, []
+    for t, i, p0 in sent:
+        queue = pending.get(i, [])
+        match = next((r for r in queue if r[1] == p0 and 0 <= t - r[0] < 1.5), None)
+        if match is not None:
+            queue.remove(match)
+            hits += 1
+            latency.append(t - match[0])
+    return hits, len(sent) - hits, len(real) - hits, np.mean(latency) * 1e3 if latency else 0.0
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 300
+    print(f"targets={n} {seconds:g}s tick={TICK * 1000:g}ms flicker={FLICKER:.1%}/tick")
+
+    state = {"prev": np.full((n, 2), -2, dtype=np.intp), "send_color": None}
+    cases = [("shared send_color", lambda labels, now: shared_step(state, labels))]
+    for title, kwargs in (("per-target", {}),
+                          ("per-target + debounce 2 + cooldown 1s", {"debounce": 2, "cooldown": 1.0})):
+        detector = SignalDetector(range(n), range(COLORS), **kwargs)
+        cases.append((title, lambda labels, now, d=detector: d.step(labels, now=now)))
+
+    for title, step in cases:
+        sent, real, cost = run(n, seconds, step)
+        hits, wasted, missed, latency = score(sent, real)
+        print(f"  {title:40s} sent {len(sent):5d}  real {hits:4d}/{len(real)}  wasted {wasted:5d}  "
+              f"missed {missed:3d}  latency {latency:5.1f}ms  {cost * 1e6:5.1f} us/tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# bench_delta.py
+"""
+델타 스냅샷 업로드 검증 + 업로드 용량 비교
+
+합성 차트의 마지막 봉들만 바뀌는 프레임 시퀀스를 만들어
+- 전체 PNG 업로드 용량
+- DeltaEncoder 패치 업로드 용량
+을 비교하고, 로컬 스텁 서버가 DeltaDecoder 로 복원한 프레임이 원본과 같은지 확인한다.
+
+    python benchmarks/bench_delta.py [업로드 횟수]
+"""
+import io
+import json
+import sys
+from email.parser import BytesParser
+from email.policy import HTTP
+
+import numpy as np
+from PIL import Image
+from synth import PALETTE, make_chart_frame
+from stub_server import start
+
+from delta import DeltaDecoder, DeltaEncoder
+from sender import SignalSender
+from snapshot import encode
+
+
+def parse_multipart(content_type, body):
+    """multipart/form-data → {필드명: bytes}"""
+    msg = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body
+    )
+    return {part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+            for part in msg.iter_parts()}
+
+
+def frames(n):
+    frame = make_chart_frame()
+    h, w = frame.shape[:2]
+    for i in range(n):
+        frame = frame.copy()
+        x = w - 80 - (i % 10) * 4
+        frame[h - 300:h - 120, x:x + 3] = PALETTE[2 + i % 2]
+        frame[h - 60:h - 50, x:x + 3] = PALETTE[i % 2]
+        yield frame
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+
+    decoder = DeltaDecoder()
+    restored = []
+
+    def handler(path, headers, body):
+        form = parse_multipart(headers["Content-Type"], body)
+        arr = np.asarray(Image.open(io.BytesIO(form["image"])).convert("RGB"))
+        restored.append(decoder.apply(form["name"].decode(), form["frame"], arr))
+        return 200
+
+    server, url = start(handler=handler)
+    sender = SignalSender()
+    sender.start()
+
+    delta = DeltaEncoder()
+    full_bytes = delta_bytes = keys = 0
+    originals = []
+    for frame in frames(n):
+        originals.append(frame)
+        full_bytes += len(encode(frame, "png")[0])
+
+        header, arr = delta.encode("Gold1920", frame)
+        keys += header["mode"] == "key"
+        data, filename, ctype = encode(arr, "png")
+        delta_bytes += len(data)
+        sender.post_multipart(
+            url + "/signalimg",
+            {"name": "Gold1920", "signal": "1", "frame": json.dumps(header)},
+            {"image": (filename, data, ctype)},
+        )
+
+    sender.stop(timeout=30)
+    server.shutdown()
+
+    ok = len(restored) == n and all((a == b).all() for a, b in zip(originals, restored))
+    print(f"uploads={n} keyframes={keys}")
+    print(f"  full  : {full_bytes / 1024:9.1f} KB")
+    print(f"  delta : {delta_bytes / 1024:9.1f} KB ({full_bytes / max(delta_bytes, 1):.1f}x smaller)")
+    print(f"  restored frames match: {ok}")
+
+
+if __name__ == "__main__":
+    main()
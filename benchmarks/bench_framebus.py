@@ -0,0 +1,85 @@
+# bench_framebus.py
+"""
+공유 메모리 프레임 버스 벤치마크
+
+생산자 하나가 sample.json 전체 ROI 크기 프레임을 게시하고
+- 같은 프로세스 소비자: view 읽기 비용
+- 다른 프로세스 소비자 n 개: BusGrabber 위의 DetectionCore 로 틱당 감지
+를 재서 한 번의 캡처를 여러 소비자가 복사 없이 나눠 쓰는지 확인한다.
+
+    python benchmarks/bench_framebus.py [소비자 프로세스 수] [프레임 수]
+"""
+import multiprocessing as mp
+import sys
+import time
+
+from synth import make_screen, make_targets
+
+from framebus import FrameBus
+
+NAME = "bujasignal_bench"
+
+
+def consumer(name, targets, frames, out):
+    from core import DetectionCore
+    from grabber import BusGrabber
+
+    bus = FrameBus.attach(name)
+    grabber = BusGrabber(bus)
+    core = DetectionCore(grabber, targets, gate=True)
+    last, seen, signals = 0, 0, 0
+    start = time.perf_counter()
+    while seen < frames and time.perf_counter() - start < 30:
+        if bus.seq == last:
+            time.sleep(0)
+            continue
+        signals += len(core.tick())
+        last = grabber.seq
+        seen += 1
+    out.put((seen, signals, time.perf_counter() - start))
+    del core, grabber
+    bus.close()
+
+
+def main():
+    consumers = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    targets = make_targets(3)
+    screen = make_screen(targets).screen
+    bus = FrameBus.create(screen.shape[:2], NAME)
+
+    # 같은 프로세스 소비자: view 만 받음
+    bus.publish(screen, time.time())
+    start = time.perf_counter()
+    for _ in range(10000):
+        bus.latest()
+    view = (time.perf_counter() - start) / 10000 * 1e6
+
+    ctx = mp.get_context("spawn")
+    out = ctx.Queue()
+    procs = [ctx.Process(target=consumer, args=(NAME, targets, frames, out)) for _ in range(consumers)]
+    for p in procs:
+        p.start()
+    time.sleep(1.0)
+
+    start = time.perf_counter()
+    for k in range(frames * 2):
+        bus.publish(screen, time.time())
+        time.sleep(0.002)
+    publish = (time.perf_counter() - start) / (frames * 2) * 1000
+
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+    bus.close()
+
+    print(f"frame={screen.shape} consumers={consumers}")
+    print(f"  latest() view : {view:.2f} us")
+    print(f"  publish (+2ms sleep): {publish:.3f} ms/frame")
+    for seen, signals, elapsed in results:
+        print(f"  consumer: frames={seen} signals={signals} {seen / elapsed:.0f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
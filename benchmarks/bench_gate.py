@@ -0,0 +1,65 @@
+# bench_gate.py
+"""
+변화 감지 게이트 벤치마크
+
+대상 n 개 중 틱마다 몇 개만 프로브 색이 바뀌는 화면에서
+게이트 없음 / RegionGate 의 틱 시간과 건너뛴 비율을 비교하고 신호가 같은지 확인한다.
+
+    python benchmarks/bench_gate.py [타깃수] [틱수]
+"""
+import sys
+import time
+
+import numpy as np
+from synth import PALETTE, make_screen, make_targets
+
+from core import DetectionCore
+
+
+class ViewGrabber:
+    """화면 배열의 view 를 그대로 반환 (캡처 비용을 빼고 분류/판정만 재기 위해)"""
+
+    def __init__(self, grabber):
+        self.grabber = grabber
+
+    def grab(self, left, top, width, height):
+        return self.grabber.screen[top:top + height, left:left + width]
+
+    def close(self):
+        pass
+
+
+def run(targets, ticks, gate):
+    grabber = make_screen(targets)
+    colors = {c: (str(n + 1), "") for n, c in enumerate(PALETTE)}
+    core = DetectionCore(ViewGrabber(grabber), targets, colors, margin=2, gate=gate)
+    rng = np.random.default_rng(0)
+
+    signals = []
+    elapsed = 0.0
+    for k in range(ticks):
+        if k % 10 == 0:
+            t = targets[rng.integers(len(targets))]
+            grabber.paint(t["x0"], t["y0"], PALETTE[rng.integers(len(PALETTE))], size=3)
+        start = time.perf_counter()
+        signals += [(k, s["name"]) for s in core.tick(float(k))]
+        elapsed += time.perf_counter() - start
+    return elapsed / ticks * 1e6, signals, core.gate
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    targets = make_targets(n)
+
+    plain, s0, _ = run(targets, ticks, False)
+    gated, s1, gate = run(targets, ticks, True)
+
+    print(f"targets={n} ticks={ticks}")
+    print(f"  no gate : {plain:8.1f} us/tick")
+    print(f"  gate    : {gated:8.1f} us/tick  {gate.metrics()}")
+    print(f"  same signals: {s0 == s1} ({len(s0)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench_geometry.py
+"""
+창 위치 추적기 시험 (가짜 창, 헤드리스)
+
+가짜 화면에서 차트 창을 옮기고 배율을 바꿔가며
+- 재시작 없이 이동 후에도 신호를 잡는지
+- 틱당 provider(win32) 호출 수
+를 확인한다.
+
+    python benchmarks/bench_geometry.py [틱수]
+"""
+import sys
+
+from synth import PALETTE, make_targets
+
+from core import DetectionCore
+from geometry import FakeWindowProvider, WindowTracker
+from grabber import ArrayGrabber
+from layout import P0, P1, X, Y, TargetLayout
+
+TICK = 0.01
+
+
+def paint(screen, targets, origin, scale, k):
+    """창 origin / 배율 기준으로 프로브 위치에 k 번째 색 조합을 칠함"""
+    ox, oy = origin
+    for i, p in enumerate(TargetLayout(targets, scale=scale).probes):
+        screen.paint(ox + p[P0, X], oy + p[P0, Y], PALETTE[(i + k) % 4], size=3)
+        screen.paint(ox + p[P1, X], oy + p[P1, Y], PALETTE[(i + k + 1) % 4], size=3)
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    targets = make_targets(3)
+    colors = {c: (str(n + 1), "") for n, c in enumerate(PALETTE)}
+
+    provider = FakeWindowProvider(rect=(100, 50, 1920, 1080))
+    tracker = WindowTracker(provider, "buja chart", refresh=0.5)
+    screen = ArrayGrabber.blank(3200, 2000)
+    core = DetectionCore(screen, targets, colors, gate=True)
+    tracker.listeners.append(core.set_geometry)
+
+    # (틱, 동작)
+    events = {ticks // 4: ("move", (700, 300)), ticks // 2: ("scale", 1.25),
+              3 * ticks // 4: ("move", (40, 10))}
+    expected, detected, k = 0, 0, 0
+    for n in range(ticks):
+        now = n * TICK
+        if n in events:
+            action, value = events[n]
+            if action == "move":
+                provider.move(*value)
+            else:
+                provider.set_scale(value)
+            screen.screen[:] = 255
+        tracker.poll(now)
+        if n % 100 == 50:
+            # 창 기준 같은 자리에 새 색 → 신호 하나 이상 기대
+            k += 1
+            paint(screen, targets, provider._rect[:2], provider._scale, k)
+            expected += 1
+        if core.tick(now):
+            detected += 1
+
+    print(f"ticks={ticks} moves={tracker.moves} provider calls={provider.calls} "
+          f"({provider.calls / ticks:.3f}/tick)")
+    print(f"  repaints with signals detected: {detected}/{expected}")
+    if detected != expected:
+        sys.exit("missed signals after window move")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# bench_layout.py
+"""
+컴파일된 대상 테이블(layout.TargetLayout) 벤치마크
+
+캡처 비용을 뺀 틱당 오버헤드(분류 → 판정 → 디버그 크롭 보관)를
+- 이전 방식: 대상 dict 를 돌며 이름 문자열/좌표 조회, 대상별 크롭 + 링버퍼 기록,
+  리스트로 보관한 이전 색을 대상마다 비교
+- 컴파일 : 배열 테이블로 전체 크롭을 한 번에, 바뀐 대상만 판정
+으로 비교하고, 신호와 보관된 크롭이 같은지 확인한다.
+
+    python benchmarks/bench_layout.py [타깃수] [틱수]
+"""
+import sys
+import tempfile
+import time
+
+import numpy as np
+from synth import PALETTE, make_config, make_screen, target_from_config
+
+from classifier import NONE
+from core import DetectionCore
+from debug_recorder import DebugRecorder
+
+DEBUG_SIZE = 10
+
+
+class ViewGrabber:
+    """화면 배열의 view 를 그대로 반환 (캡처 비용을 빼고 재기 위해)"""
+
+    def __init__(self, grabber):
+        self.grabber = grabber
+
+    def grab(self, left, top, width, height):
+        return self.grabber.screen[top:top + height, left:left + width]
+
+    def close(self):
+        pass
+
+
+def legacy_tick(core, targets, capturepoints, prev, state, recorder, now):
+    """컴파일 전 checkSignals 와 같은 틱 (분류만 벡터, 나머지는 대상별 dict / 리스트)"""
+    engine = core.engine
+    frame = engine.tick()
+    labels = core.classifier.classify(frame).tolist()
+
+    events = []
+    for i, (p0, p1) in enumerate(labels):
+        p = prev[i]
+        if p[1] != p1:
+            state[i] = None
+        if p[0] == p0 and p[1] == p1:
+            continue
+        p[0], p[1] = p0, p1
+        if p0 == NONE or state[i] == p0:
+            continue
+        state[i] = p0
+        events.append(i)
+
+    s = int(DEBUG_SIZE / 2)
+    for item in targets:
+        name = item["name"]
+        for x, y, key in ((item["x0"], item["y0"], name + "_p0"),
+                          (item["x1"], item["y1"], name + "_p1")):
+            crop = engine.crop(x - s, y - s, DEBUG_SIZE * 2, DEBUG_SIZE * 2)
+            recorder.record(key, crop, now)
+
+    out = []
+    for i in events:
+        name = targets[i]["name"]
+        point = capturepoints[name]
+        out.append((name, point["x"], point["y"]))
+    return out
+
+
+def compiled_tick(core, recorder, now):
+    layout = core.layout
+    signals = core.tick(now)
+    recorder.record_many(layout.keys, layout.crops(core.frame, DEBUG_SIZE), now)
+    out = []
+    for sig in signals:
+        x, y, _, _ = layout.roi(sig["index"])
+        out.append((sig["name"], x, y))
+    return out
+
+
+def run(n, ticks, compiled):
+    config = make_config(n)
+    targets = [target_from_config(c) for c in config]
+    screen = make_screen(targets)
+    colors = {c: (str(k + 1), "") for k, c in enumerate(PALETTE)}
+    core = DetectionCore(ViewGrabber(screen), targets, colors, margin=DEBUG_SIZE * 2,
+                         config=config)
+    recorder = DebugRecorder(tempfile.mkdtemp(), size=8)
+
+    capturepoints = {c["name"]: {k: c[k] for k in ("x", "y", "w", "h")} for c in config}
+    prev = [[None, None] for _ in targets]
+    state = [None] * len(targets)  # 대상별 send_color
+
+    rng = np.random.default_rng(0)
+    signals, elapsed = [], 0.0
+    for k in range(ticks):
+        if k % 10 == 0:
+            t = targets[rng.integers(n)]
+            screen.paint(t["x0"], t["y0"], PALETTE[rng.integers(len(PALETTE))], size=3)
+        start = time.perf_counter()
+        if compiled:
+            out = compiled_tick(core, recorder, float(k))
+        else:
+            out = legacy_tick(core, targets, capturepoints, prev, state, recorder, float(k))
+        elapsed += time.perf_counter() - start
+        signals += [(k,) + s for s in out]
+    return elapsed / ticks * 1e6, signals, recorder
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    legacy, s0, r0 = run(n, ticks, False)
+    compiled, s1, r1 = run(n, ticks, True)
+
+    same_crops = all(np.array_equal(r0.frames(key)[0], r1.frames(key)[0]) for key in r0._rings)
+    print(f"targets={n} ticks={ticks} (캡처 제외)")
+    print(f"  legacy   : {legacy:8.1f} us/tick")
+    print(f"  compiled : {compiled:8.1f} us/tick  ({legacy / compiled:.1f}x)")
+    print(f"  same signals: {s0 == s1} ({len(s0)})  same debug crops: {same_crops}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# bench_logview.py
+"""
+로그 버퍼(logview.LogBuffer) 벤치마크
+
+하루치 세션을 빠르게 흉내 낸다 (시각은 가상):
+- 평소: 대상 40 개가 봉 마감마다 신호 (분당 수십 줄)
+- 장애: 30 분 동안 초당 50 건 전송 실패 (오류 2 종류)
+이전 방식(메시지마다 한 줄씩 무한히 쌓음)과 비교해
+UI 에 붙는 줄 수 / 남는 줄 수, 메시지당 비용, 디스크 로그 크기(교체 포함)를 본다.
+
+    python benchmarks/bench_logview.py [시간]
+"""
+import glob
+import os
+import sys
+import tempfile
+import time
+
+from _root import ROOT  # noqa: F401
+
+from logview import LogBuffer
+
+FLUSH = 0.2  # LOG_FLUSH_MS
+
+
+def session(hours):
+    """(가상 시각, 메시지, level, key) 를 시간 순으로"""
+    outage = (hours * 3600 / 2, hours * 3600 / 2 + 1800)
+    t = 0.0
+    while t < hours * 3600:
+        if outage[0] <= t < outage[1]:
+            for k in range(50):
+                error = "ConnectTimeout" if k % 3 else "HTTP 503"
+                stamp = time.strftime("%m%d %H%M%S", time.gmtime(t))
+                yield t, f"[{stamp}] [전송 실패] Gold{k % 40} / {error}", "warning", ("send_fail", error)
+            t += 1.0
+        else:
+            for k in range(40):
+                stamp = time.strftime("%m%d %H%M%S", time.gmtime(t))
+                yield t, f"[{stamp}] Gold{k} - {k % 4 + 1} (상승 12.3KB)", "info", None
+            t += 60.0
+
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 24
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "signal.log")
+    buf = LogBuffer(path, max_lines=2000, dup_window=5.0, echo=False)
+
+    naive, shown, flushes, worst = [], 0, 0, 0
+    messages = 0
+    next_flush = FLUSH
+    start = time.perf_counter()
+    for t, msg, level, key in session(hours):
+        naive.append(msg)  # QTextEdit.append 처럼 계속 쌓임
+        messages += 1
+        buf.write(msg, level, key, now=t)
+        while t >= next_flush:
+            buf.tick(now=next_flush)
+            lines = buf.drain()
+            if lines:
+                flushes += 1
+                shown += len(lines)
+                worst = max(worst, len(lines))
+            next_flush += FLUSH
+    buf.close()
+    elapsed = time.perf_counter() - start
+
+    files = glob.glob(path + "*")
+    size = sum(os.path.getsize(f) for f in files)
+    print(f"session={hours:g}h messages={messages}")
+    print(f"  이전 방식 : UI 갱신 {messages}회, 위젯에 {len(naive)}줄 (계속 증가)")
+    print(f"  LogBuffer : UI 갱신 {flushes}회, 붙인 줄 {shown}, 위젯 최대 2000줄, "
+          f"한 번에 최대 {worst}줄")
+    print(f"              {elapsed / messages * 1e6:.1f} us/message  {buf.metrics()}")
+    print(f"  disk      : {len(files)} files, {size / 1024:.0f}KB (최대 6 x 5MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# bench_metrics.py
+"""
+계측(metrics.py) 벤치마크
+
+- Histogram.record 한 번의 비용과 백분위 정확도 (numpy 정확값과 비교)
+- 대상 100 개 DetectionCore 틱: metrics 없음 / 있음 (켜 둬도 되는 비용인지)
+- 스텁 서버로 보내며 감지 → 전송 완료(deliver) 지연과 /metrics 엔드포인트 응답 확인
+
+    python benchmarks/bench_metrics.py [타깃수] [틱수]
+"""
+import json
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import stub_server
+from synth import PALETTE, ViewGrabber, make_screen, make_targets
+
+from core import DetectionCore, HttpSink
+from metrics import Histogram, Metrics
+
+
+def bench_histogram(n=200000):
+    rng = np.random.default_rng(0)
+    samples = rng.lognormal(np.log(300e-6), 1.0, n)
+    hist = Histogram()
+    values = samples.tolist()
+    start = time.perf_counter()
+    for v in values:
+        hist.record(v)
+    per_call = (time.perf_counter() - start) / n * 1e9
+
+    us = np.floor(samples * 1e6)
+    errors = [abs(hist.percentile(p) - np.percentile(us, p)) / np.percentile(us, p)
+              for p in (50, 90, 99, 99.9)]
+    print(f"histogram: record {per_call:.0f} ns/call, buckets={len(hist.counts)}, "
+          f"max percentile error {max(errors):.2%}")
+
+
+def run(targets, ticks, metrics):
+    """캡처 복사를 뺀 틱 시간 (us)"""
+    screen = make_screen(targets)
+    colors = {c: (str(k + 1), "") for k, c in enumerate(PALETTE)}
+    core = DetectionCore(ViewGrabber(screen), targets, colors, gate=True, metrics=metrics)
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for k in range(ticks):
+        if k % 10 == 0:
+            t = targets[rng.integers(len(targets))]
+            screen.paint(t["x0"], t["y0"], PALETTE[rng.integers(len(PALETTE))], size=3)
+        core.tick()
+    return (time.perf_counter() - start) / ticks * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    targets = make_targets(n)
+
+    bench_histogram()
+
+    # 번갈아 3 번씩 재서 가장 빠른 값
+    plain = min(run(targets, ticks, None) for _ in range(3))
+    timed = min(run(targets, ticks, Metrics()) for _ in range(3))
+    metrics = Metrics()
+    run(targets, ticks, metrics)
+    print(f"targets={n} ticks={ticks}")
+    print(f"  no metrics : {plain:8.1f} us/tick")
+    print(f"  metrics    : {timed:8.1f} us/tick  (+{timed - plain:.1f} us)")
+    for stage, h in metrics.snapshot()["stages"].items():
+        print(f"    {stage:9s} p50={h['p50_us']}us p99={h['p99_us']}us max={h['max_us']}us")
+
+    # 감지 → 전송 완료 지연 (서버 응답 5ms)
+    server, base = stub_server.start(delay=0.005)
+    url = base + "/signal"
+    metrics = Metrics()
+    port = metrics.serve(0)
+    screen = make_screen(targets)
+    colors = {c: (str(k + 1), "") for k, c in enumerate(PALETTE)}
+    core = DetectionCore(screen, targets, colors, gate=True, metrics=metrics)
+    # 첫 틱은 모든 대상이 신호라 큐가 밀림 → 싱크 연결 전에 한 번 돌려 정상 상태만 잼
+    core.tick()
+    core.add_sink(HttpSink(url, metrics=metrics))
+    rng = np.random.default_rng(1)
+    # 신호 간격 20ms (서버 처리량 안에서 큐가 쌓이지 않는 정도)
+    for k in range(200):
+        t = targets[rng.integers(len(targets))]
+        screen.paint(t["x0"], t["y0"], PALETTE[rng.integers(len(PALETTE))], size=3)
+        core.tick()
+        time.sleep(0.02)
+    core.close()
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as res:
+        snap = json.loads(res.read())
+    metrics.close()
+    server.shutdown()
+    deliver, http = snap["stages"]["deliver"], snap["stages"]["http"]
+    print(f"  endpoint /metrics: sent={snap['sender']['sent']} failed={snap['sender']['failed']}")
+    print(f"    http    p50={http['p50_us'] / 1000:.1f}ms p99={http['p99_us'] / 1000:.1f}ms")
+    print(f"    deliver p50={deliver['p50_us'] / 1000:.1f}ms p99={deliver['p99_us'] / 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench_replay.py
+"""
+녹화/재생 벤치마크
+
+합성 차트에서 신호색이 바뀌는 하루치(기본 8시간, 10ms 틱) 녹화를 만들고
+replay.py 로 재생하는 속도(실시간 대비 배수)를 잰다.
+
+    python benchmarks/bench_replay.py [시간] [타깃수]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from synth import PALETTE, make_screen, make_targets
+
+from framerec import FrameRecorder
+from grabber import CaptureEngine
+from replay import replay
+
+TICK = 0.01
+
+
+def record(directory, hours, n):
+    targets = make_targets(n)
+    grabber = make_screen(targets)
+    points = [(t["x0"], t["y0"]) for t in targets] + [(t["x1"], t["y1"]) for t in targets]
+    engine = CaptureEngine(grabber, points, margin=20)
+
+    rec = FrameRecorder(directory, {
+        "bbox": list(engine.bbox), "targets": targets,
+        "palette": [list(c) for c in PALETTE], "tol": 20,
+    })
+    rng = np.random.default_rng(0)
+    ticks = int(hours * 3600 / TICK)
+    # 대략 30초에 한 번 어느 대상의 프로브 색이 바뀜
+    changes = set(rng.integers(0, ticks, size=max(1, ticks // 3000)).tolist())
+    frame = engine.tick()
+    for k in range(ticks):
+        if k in changes:
+            t = targets[rng.integers(n)]
+            x, y = (t["x0"], t["y0"]) if rng.random() < 0.5 else (t["x1"], t["y1"])
+            grabber.paint(x, y, PALETTE[rng.integers(len(PALETTE))], size=3)
+            frame = engine.tick()
+        rec.record(frame, k * TICK)
+    rec.close()
+    return ticks, rec.count
+
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as directory:
+        ticks, frames = record(directory, hours, n)
+        size = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory))
+
+        start = time.perf_counter()
+        events, _ = replay(directory)
+        elapsed = time.perf_counter() - start
+
+    print(f"recorded {hours}h: ticks={ticks} unique_frames={frames} size={size / 1024:.0f}KB")
+    print(f"  replay : {elapsed:.2f}s ({hours * 3600 / elapsed:.0f}x real time), signals={len(events)}")
+
+
+if __name__ == "__main__":
+    main()
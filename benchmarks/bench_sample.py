@@ -0,0 +1,86 @@
+# bench_sample.py
+"""
+여러 점 샘플링 벤치마크 (color.PointSampler)
+
+- 점마다   : get_pixel_color 처럼 점 하나당 1x1 캡처
+- 합집합   : 모든 점의 bbox 를 한 번 캡처 (grabber.CaptureEngine 방식)
+- 묶음     : plan_rects 로 가까운 점끼리 묶은 영역만 캡처
+을 비교한다. grabber.FakeGrabber 로 캡처 횟수 / 읽은 픽셀을 세고,
+실제 mss 처럼 캡처 1회 고정 비용 + 픽셀당 복사 비용을 busy-wait 로 더한다.
+
+    python benchmarks/bench_sample.py [타깃수] [반복수] [캡처당 고정비용 ms] [픽셀당 ns]
+"""
+import sys
+import time
+
+import numpy as np
+from synth import make_screen, make_targets
+
+from color import PointSampler, match_color, match_colors
+from grabber import FakeGrabber
+
+
+class CostGrabber(FakeGrabber):
+    def __init__(self, screen, cost_ms, pixel_ns):
+        super().__init__(screen)
+        self.cost = cost_ms / 1e3
+        self.pixel = pixel_ns / 1e9
+
+    def grab(self, left, top, width, height):
+        end = time.perf_counter() + self.cost + width * height * self.pixel
+        out = super().grab(left, top, width, height)
+        while time.perf_counter() < end:
+            pass
+        return out
+
+
+def measure(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    cost = float(sys.argv[3]) if len(sys.argv) > 3 else 0.5
+    pixel = float(sys.argv[4]) if len(sys.argv) > 4 else 5.0
+
+    targets = make_targets(n)
+    grabber = CostGrabber(make_screen(targets).screen, cost, pixel)
+    points = np.array([(t["x0"], t["y0"]) for t in targets] + [(t["x1"], t["y1"]) for t in targets])
+    truth = grabber.screen[points[:, 1], points[:, 0]]
+
+    def per_point():
+        return np.array([grabber.grab(x, y, 1, 1)[0, 0] for x, y in points.tolist()])
+
+    def union():
+        (left, top), (right, bottom) = points.min(axis=0), points.max(axis=0) + 1
+        frame = grabber.grab(left, top, right - left, bottom - top)
+        return frame[points[:, 1] - top, points[:, 0] - left]
+
+    sampler = PointSampler(grabber)
+    print(f"points={len(points)} grab_cost={cost}ms pixel_cost={pixel}ns")
+    for title, fn in (("per point", per_point), ("union bbox", union),
+                      ("PointSampler", lambda: sampler.sample(points))):
+        same = bool((fn() == truth).all())
+        grabber.reset()
+        ms = measure(fn, repeat)
+        calls, pixels = grabber.calls // (repeat + 1), grabber.pixels // (repeat + 1)
+        print(f"  {title:12s}: {ms:8.3f} ms  {calls:4d} grabs  {pixels:8d} px  same={same}")
+
+    px = np.repeat(truth, 50, axis=0)
+    start = time.perf_counter()
+    scalar = [match_color(tuple(p)) for p in px.tolist()]
+    t0 = time.perf_counter() - start
+    start = time.perf_counter()
+    vector = match_colors(px)
+    t1 = time.perf_counter() - start
+    print(f"  match_color x{len(px)}: {t0 * 1e3:.2f} ms  match_colors: {t1 * 1e3:.2f} ms  "
+          f"same={list(vector) == scalar}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# bench_scheduler.py
+"""
+봉 마감 스케줄러 가상 시계 시험
+
+sample.json 의 세 대상(주기 120/480/1920초 가정)이 봉 마감마다 0~1.5초 늦게
+p1/p0 색을 바꾸는 하루치 화면을 가상 시계로 돌려
+- 10ms 고정 폴링과 BarScheduler 의 캡처 횟수
+- 놓친 신호 수와 감지 지연
+을 비교한다. 주기를 설정한 경우와 학습하는 경우 모두 실행.
+
+    python benchmarks/bench_scheduler.py [시간]
+"""
+import sys
+
+import numpy as np
+from synth import PALETTE, make_screen, make_targets
+
+from core import DetectionCore
+from scheduler import BarScheduler
+
+TICK = 0.01
+PERIODS = [1920, 480, 120]
+
+
+def make_flips(hours, seed=0):
+    """[(시각, 대상, p0 색, p1 색), ...] 봉 마감 직후 색 변화"""
+    rng = np.random.default_rng(seed)
+    flips = []
+    for i, period in enumerate(PERIODS):
+        # 끝나기 직전 마감은 감지할 시간이 없으므로 제외
+        for k in range(1, int((hours * 3600 - 2) // period) + 1):
+            color = PALETTE[(k + i) % len(PALETTE)]
+            flips.append((k * period + rng.uniform(0, 1.5), i, color, PALETTE[(k + i + 1) % 4]))
+    return sorted(flips)
+
+
+def simulate(hours, scheduler):
+    targets = make_targets(len(PERIODS))
+    grabber = make_screen(targets, seed=3)
+    core = DetectionCore(grabber, targets, {c: (str(n + 1), "") for n, c in enumerate(PALETTE)},
+                         scheduler=scheduler)
+
+    flips = make_flips(hours)
+    end = hours * 3600
+    now, f, captures = 0.0, 0, 0
+    detected = []
+    while now < end:
+        while f < len(flips) and flips[f][0] <= now:
+            _, i, c0, c1 = flips[f]
+            grabber.paint(targets[i]["x0"], targets[i]["y0"], c0, size=3)
+            grabber.paint(targets[i]["x1"], targets[i]["y1"], c1, size=3)
+            f += 1
+        for sig in core.tick(now):
+            detected.append((now, sig["index"]))
+        captures += core.captured
+        step = TICK if scheduler is None else max(TICK, scheduler.next_wakeup(now))
+        now = round(now + step, 6)
+
+    # 각 색 변화를 감지한 시각까지의 지연
+    latency, missed = [], 0
+    for t, i, _, _ in flips:
+        hit = [d for d, j in detected if j == i and d >= t]
+        if hit and hit[0] - t < 60:
+            latency.append(hit[0] - t)
+        else:
+            missed += 1
+    return captures, missed, latency
+
+
+def report(label, hours, scheduler):
+    captures, missed, latency = simulate(hours, scheduler)
+    lat = np.array(latency) * 1000
+    print(f"  {label:10s}: captures={captures:8d} missed={missed} "
+          f"latency p50={np.percentile(lat, 50):.0f}ms max={lat.max():.0f}ms")
+    return captures, missed
+
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    print(f"simulated {hours}h, flips={len(make_flips(hours))}")
+    base, m0 = report("fixed 10ms", hours, None)
+    conf, m1 = report("configured", hours, BarScheduler([(p, 0.0) for p in PERIODS], window=2.0))
+    learn, m2 = report("learned", hours, BarScheduler([None] * len(PERIODS), window=2.0))
+    print(f"  captures vs fixed: configured {base / conf:.1f}x fewer, learned {base / learn:.1f}x fewer")
+    if m0 or m1 or m2:
+        sys.exit("missed signals")
+
+
+if __name__ == "__main__":
+    main()
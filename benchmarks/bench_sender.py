@@ -0,0 +1,53 @@
+# bench_sender.py
+"""
+비동기 전송기 벤치마크 (로컬 스텁 서버)
+
+- enqueue : 타이머 슬롯이 post_* 에서 기다리는 시간
+- deliver : 큐에 넣은 신호가 모두 전송될 때까지 걸린 시간
+- 느린 서버(delay)와 503 을 섞어 재시도/큐 지표도 출력
+
+    python benchmarks/bench_sender.py [신호수] [서버지연 ms] [n번째마다 503]
+"""
+import sys
+import time
+
+from _root import ROOT  # noqa: F401
+from stub_server import start
+
+from sender import SignalSender
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    delay = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.0
+    fail_every = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    server, url = start(delay=delay, fail_every=fail_every)
+    sender = SignalSender(max_queue=n, backoff=0.01)
+    sender.start()
+
+    image = ("signal.png", b"\x89PNG" + b"\0" * 20000, "image/png")
+    enqueue = 0.0
+    start_time = time.perf_counter()
+    for i in range(n):
+        t = time.perf_counter()
+        if i % 2:
+            sender.post_json(url + "/signal", {"name": f"T{i}", "signal": "1"}, i)
+        else:
+            sender.post_multipart(url + "/signalimg", {"name": f"T{i}", "signal": "1"}, {"image": image}, i)
+        enqueue += time.perf_counter() - t
+
+    sender.stop(timeout=60)
+    elapsed = time.perf_counter() - start_time
+    results = sender.results()
+    server.shutdown()
+
+    ok = sum(1 for r in results if r[1])
+    print(f"signals={n} server_delay={delay * 1000:.0f}ms fail_every={fail_every}")
+    print(f"  enqueue : {enqueue / n * 1e6:.1f} us/signal")
+    print(f"  deliver : {elapsed:.3f} s ({n / elapsed:.0f} signals/s), ok={ok}/{n}")
+    print(f"  received: {len(server.received)}, metrics={sender.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
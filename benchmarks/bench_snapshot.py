@@ -0,0 +1,49 @@
+# bench_snapshot.py
+"""
+스냅샷 코덱별 인코딩 시간 / 크기 벤치마크
+
+    python benchmarks/bench_snapshot.py [프레임 파일(.npy/.png) ...]
+
+파일을 주지 않으면 sample.json 크기(645x989)의 합성 차트 프레임을 쓴다.
+"""
+import sys
+import time
+
+from synth import load_config, make_chart_frame
+
+from grabber import ArrayGrabber
+from snapshot import encode
+
+CASES = [
+    ("png (PIL 기본)", "png", {"level": 6}),
+    ("png level=1", "png", {"level": 1}),
+    ("png8 16색", "png8", {"level": 1, "colors": 16}),
+    ("webp q=80", "webp", {"quality": 80}),
+    ("webp 무손실", "webp", {"quality": 100}),
+    ("jpeg q=80", "jpeg", {"quality": 80}),
+]
+
+
+def load_frames(paths):
+    if paths:
+        return [ArrayGrabber.load(p).screen for p in paths]
+    return [make_chart_frame(c["w"], c["h"], seed=i) for i, c in enumerate(load_config())]
+
+
+def main():
+    frames = load_frames(sys.argv[1:])
+    repeat = 5
+
+    print(f"frames={len(frames)} shape={frames[0].shape}")
+    for label, codec, options in CASES:
+        size = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for frame in frames:
+                size = len(encode(frame, codec, **options)[0])
+        elapsed = (time.perf_counter() - start) / (repeat * len(frames)) * 1000
+        print(f"  {label:16s}: {elapsed:7.2f} ms  {size / 1024:8.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench_startup.py
+"""
+콜드 스타트 벤치마크 (run.py 런처, 헤드리스)
+
+합성 화면(.npy)으로 `run.py headless --ticks 1` 을 새 프로세스로 여러 번 띄워
+- 실행 → 종료 전체 시간
+- 띄운 시각 → 첫 틱 (core.DetectionCore.startup, 인터프리터 시작 포함)
+을 잰다. 비교:
+- launcher : 지금 run.py (같은 프로세스에서 core 만 import, requests / http.server / PIL 은 쓸 때)
+- eager    : 예전처럼 requests / http.server / PIL 을 시작할 때 미리 import
+- respawn  : 예전 run.py 처럼 인터프리터를 하나 더 띄워 실행
+
+    python benchmarks/bench_startup.py [반복수]
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from synth import ROOT, make_screen, make_targets
+
+EAGER = "import requests, requests.adapters, http.server, PIL.Image"
+
+
+def once(cmd, env):
+    # 첫 틱 시간은 띄운 시각부터 (인터프리터 시작 포함)
+    env = dict(env, BUJA_STARTED=repr(time.time()))
+    start = time.perf_counter()
+    out = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    found = re.search(r"startup=(\d+)ms", out.stdout)
+    return wall * 1000, float(found.group(1)) if found else float("nan")
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    directory = tempfile.mkdtemp()
+    targets = make_targets(40)
+    screen = os.path.join(directory, "screen.npy")
+    np.save(screen, make_screen(targets).screen)
+    target_file = os.path.join(directory, "target.json")
+    with open(target_file, "w", encoding="utf-8") as f:
+        json.dump(targets, f)
+
+    args = ["headless", "--source", screen, "--targets", target_file, "--ticks", "1",
+            "--metrics", os.path.join(directory, "metrics.json")]
+    py = sys.executable
+    run = os.path.join(ROOT, "run.py")
+    cases = {
+        "launcher": [py, run] + args,
+        "eager": [py, "-c", f"import runpy, sys; {EAGER}; sys.argv = {[run] + args!r}; "
+                            f"runpy.run_path({run!r}, run_name='__main__')"],
+        "respawn": [py, "-c", f"import subprocess, sys; "
+                              f"sys.exit(subprocess.run([sys.executable, {run!r}] + {args!r}).returncode)"],
+    }
+    env = dict(os.environ)
+
+    print(f"repeat={repeat} targets={len(targets)}")
+    for name, cmd in cases.items():
+        once(cmd, env)  # 디스크 캐시 워밍업
+        runs = np.array([once(cmd, env) for _ in range(repeat)])
+        wall, startup = np.median(runs, axis=0)
+        print(f"  {name:9s}: wall {wall:6.0f} ms  spawn→first tick {startup:5.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# bench_vote.py
+"""
+프로브 커널 다수결 벤치마크 (classifier.KERNELS)
+
+대상마다 신호색 표시(3x7, 테두리는 흰색과 반씩 섞인 안티에일리어싱)를 그리고
+틱마다 1px 스크롤(위치 ±1)과 ClearType 같은 채널 잡음을 섞는다. 색은 바뀌지 않으므로
+- 정확도: 프로브가 실제 색으로 분류된 비율
+- 깜빡임: 같은 색인데 분류가 바뀐 횟수 (중복 전송의 원인)
+- 분류 시간: 같은 캡처 버퍼에서 classify 한 번 (추가 캡처 없음)
+을 단일 픽셀 / vstrip / 3x3 으로 비교한다.
+마지막 항목은 프로브는 흰색이고 바로 위에 2px 표시만 걸친 경우 (정답은 NONE, 오탐 비율).
+
+    python benchmarks/bench_vote.py [타깃수] [틱수]
+"""
+import sys
+import time
+
+import numpy as np
+from synth import PALETTE, make_targets
+
+from classifier import KERNELS, SignalClassifier
+from grabber import CaptureEngine
+from palette import NONE
+
+W, H = 1920, 1080
+MARK_W, MARK_H = 3, 7
+
+
+def draw(rng, targets, truth, jitter, noise, above=False):
+    """흰 화면에 대상별 표시를 그린 (H, W, 3) 프레임 (above 면 프로브 위 2px 에만)"""
+    frame = np.full((H, W, 3), 255, dtype=np.int16)
+    for i, t in enumerate(targets):
+        for p, (x, y) in enumerate(((t["x0"], t["y0"]), (t["x1"], t["y1"]))):
+            if above:
+                frame[y - 2:y, x - 1:x + 2] = PALETTE[truth[i, p]]
+                continue
+            dx, dy = rng.integers(-jitter, jitter + 1, size=2) if jitter else (0, 0)
+            x0, y0 = x + dx - MARK_W // 2, y + dy - MARK_H // 2
+            color = np.array(PALETTE[truth[i, p]], dtype=np.int16)
+            # 테두리는 흰색과 반씩 (허용 오차 밖)
+            frame[y0 - 1:y0 + MARK_H + 1, x0 - 1:x0 + MARK_W + 1] = (color + 255) // 2
+            frame[y0:y0 + MARK_H, x0:x0 + MARK_W] = color
+    if noise:
+        mask = rng.random((H, W)) < noise
+        frame[mask] += rng.integers(-30, 31, size=(mask.sum(), 3), dtype=np.int16)
+    return frame.clip(0, 255).astype(np.uint8)
+
+
+class FrameGrabber:
+    def __init__(self):
+        self.frame = None
+
+    def grab(self, left, top, width, height):
+        return self.frame[top:top + height, left:left + width]
+
+    def close(self):
+        pass
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    targets = make_targets(n)
+    rng = np.random.default_rng(0)
+    truth = rng.integers(len(PALETTE), size=(n, 2))
+
+    grabber = FrameGrabber()
+    points = [(t["x0"], t["y0"]) for t in targets] + [(t["x1"], t["y1"]) for t in targets]
+    engine = CaptureEngine(grabber, points, margin=4)
+    kernels = ["pixel", "vstrip", "3x3"]
+    classifiers = {}
+    for name in kernels:
+        classifiers[name] = SignalClassifier(PALETTE, kernel=name)
+        classifiers[name].set_targets(targets, engine.bbox)
+
+    for title, jitter, noise, above in (("깨끗한 화면", 0, 0.0, False), ("1px 스크롤", 1, 0.0, False),
+                                        ("1px 스크롤 + 잡음 15%", 1, 0.15, False),
+                                        ("흰 프로브 + 위 2px 표시", 0, 0.0, True)):
+        frames = [draw(rng, targets, truth, jitter, noise, above) for _ in range(ticks)]
+        expected = np.full_like(truth, NONE) if above else truth
+        print(f"[{title}] targets={n} ticks={ticks}")
+        for name in kernels:
+            classifier = classifiers[name]
+            correct, flaps, prev, conf = 0, 0, None, []
+            elapsed = 0.0
+            for frame in frames:
+                grabber.frame = frame
+                buf = engine.tick()
+                start = time.perf_counter()
+                labels = classifier.classify(buf)
+                elapsed += time.perf_counter() - start
+                correct += int((labels == expected).sum())
+                conf.append(classifier.confidence.mean())
+                if prev is not None:
+                    flaps += int((labels != prev).sum())
+                prev = labels
+            print(f"  {name:6s} (K={len(KERNELS[name])}): 정확도 {correct / (ticks * n * 2):7.2%}  "
+                  f"깜빡임 {flaps:5d}  confidence {np.mean(conf):.2f}  "
+                  f"{elapsed / ticks * 1e6:6.1f} us/classify")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# bench_watchdog.py
+"""
+워치독 / 핫 재시작 벤치마크 (run.py watch headless)
+
+합성 화면(.npy)으로 `run.py watch headless` 를 띄우고 자식에게
+- hang  : SIGSTOP (Qt 이벤트 루프 정지 / 막힌 전송처럼 프로세스는 살아 있는데 틱이 멈춤)
+- crash : SIGKILL
+을 번갈아 걸어 감독자가 새 자식을 띄울 때까지를 잰다.
+- recovery : 감독자가 정지/종료를 감지 → 새 자식 첫 틱
+- outage   : 죽은 자식의 마지막 틱 → 새 자식 첫 틱 (이 동안 신호가 늦어짐)
+- 신호 수  : 화면이 그대로면 재시작해도 신호가 늘지 않아야 함 (판정 상태 인계)
+             마지막에 화면을 바꿔 재시작 뒤에도 새 신호는 나오는지 확인
+--no-handover 와 비교한다 (재시작마다 화면의 신호를 다시 보냄). POSIX 전용 (SIGSTOP).
+
+    python benchmarks/bench_watchdog.py [장애 수] [stall 초]
+"""
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from synth import ROOT, make_screen, make_targets
+
+from watchdog import FIELDS, HEARTBEAT_FILE, PID, TICKS, WATCH_DIR
+
+SIGNAL_LINE = re.compile(r"^\[\d{4} \d{6}\] (\S+) - (\S+) ")
+
+
+def wait_for(fn, timeout=30.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        got = fn()
+        if got:
+            return got
+        time.sleep(0.01)
+    raise TimeoutError
+
+
+def run(directory, faults, stall, handover):
+    targets = make_targets(40)
+    screen = os.path.join(directory, "screen.npy")
+    np.save(screen, make_screen(targets).screen)
+    target_file = os.path.join(directory, "target.json")
+    with open(target_file, "w", encoding="utf-8") as f:
+        json.dump(targets, f)
+
+    report = os.path.join(directory, "watchdog.json")
+    cmd = [sys.executable, os.path.join(ROOT, "run.py"), "watch", "--stall", str(stall), "--check", "0.05",
+           "--metrics", report] + ([] if handover else ["--no-handover"]) + \
+          ["headless", "--source", screen, "--targets", target_file, "--interval", "0.01",
+           "--metrics", os.path.join(directory, "metrics.json")]
+    sup = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+
+    path = os.path.join(ROOT, WATCH_DIR, str(sup.pid), HEARTBEAT_FILE)
+    wait_for(lambda: os.path.exists(path) and os.path.getsize(path) >= FIELDS * 8)
+    fields = np.memmap(path, dtype=np.float64, mode="r", shape=(FIELDS,))
+
+    def child():
+        return int(fields[PID]) if fields[TICKS] > 5 else 0
+
+    pid = wait_for(child)
+    time.sleep(0.3)
+    for n in range(faults):
+        os.kill(pid, signal.SIGSTOP if n % 2 == 0 else signal.SIGKILL)
+        pid = wait_for(lambda: child() not in (0, pid) and child())
+        time.sleep(0.3)
+
+    # 화면이 바뀌면 재시작 뒤 자식도 새 신호를 내야 함
+    np.save(screen, make_screen(targets, seed=1).screen)
+    time.sleep(0.5)
+    sup.send_signal(signal.SIGINT)
+    out, _ = sup.communicate(timeout=30)
+    del fields
+
+    signals = [m.groups() for m in map(SIGNAL_LINE.match, out.splitlines()) if m]
+    with open(report, "r", encoding="utf-8") as f:
+        metrics = json.load(f)
+    return signals, metrics, len(targets)
+
+
+def main():
+    faults = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    stall = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    directory = tempfile.mkdtemp()
+
+    print(f"faults={faults} (hang/crash 번갈아) stall={stall}s")
+    for handover in (True, False):
+        signals, metrics, n = run(directory, faults, stall, handover)
+        stages, counters = metrics["stages"], metrics["counters"]
+        rec, out = stages.get("recovery", {}), stages.get("outage", {})
+        expected = 2 * n  # 처음 화면 + 바뀐 화면, 대상마다 한 번씩
+        print(f"  handover={handover!s:5s}: restarts={counters.get('restarts', 0)} "
+              f"({', '.join(f'{k}={v}' for k, v in counters.items() if k.startswith('stall_'))})")
+        print(f"    recovery p50 {rec.get('p50_us', 0) / 1e3:6.0f} ms  max {rec.get('max_us', 0) / 1e3:6.0f} ms"
+              f" | outage p50 {out.get('p50_us', 0) / 1e3:6.0f} ms  max {out.get('max_us', 0) / 1e3:6.0f} ms")
+        print(f"    signals {len(signals)} (expected {expected}, duplicates {len(signals) - len(set(signals))})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# stub_server.py
+"""
+buja.tim.pe.kr 대신 쓰는 로컬 HTTP 스텁 서버
+
+    python benchmarks/stub_server.py [포트]
+
+코드에서는 start() 로 백그라운드 스레드에 띄워 쓴다.
+"""
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        with server.lock:
+            server.count += 1
+            n = server.count
+        if server.delay:
+            time.sleep(server.delay)
+
+        status = 200
+        if server.fail_every and n % server.fail_every == 0:
+            status = 503
+        elif server.handler is not None:
+            status = server.handler(self.path, self.headers, body) or 200
+
+        if status == 200:
+            with server.lock:
+                server.received.append((self.path, self.headers.get("Content-Type", ""), body))
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(port=0, delay=0.0, fail_every=0, handler=None):
+    """
+    스텁 서버를 띄우고 (server, base_url) 반환
+
+    delay     : 요청마다 지연(초)
+    fail_every: n 번째 요청마다 503 응답 (재시도 확인용)
+    handler   : handler(path, headers, body) → 상태 코드 (None 이면 200)
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.count = 0
+    server.received = []
+    server.delay = delay
+    server.fail_every = fail_every
+    server.handler = handler
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    server, url = start(port)
+    print(f"stub server: {url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,261 @@
+# suite.py
+"""
+캡처 → 감지 → 전송 파이프라인 벤치마크 모음 (헤드리스, 리눅스에서 실행)
+
+    python benchmarks/suite.py [--quick] [--out 결과.json] [--compare 이전.json] [--threshold 0.15]
+                               [--only classify,tick,encode,send]
+
+- classify : 프로브 분류 (getPixel 튜플 비교 / color.match_color / SignalClassifier / 팔레트 LUT) 대상 100 개
+- tick     : checkSignals 한 틱 (캡처 → 분류 → 판정 → 디버그 크롭 보관) 대상 1 / 10 / 100 개
+- encode   : sendToServerWithImg 스냅샷 인코딩 (sample.json ROI 크기 차트, 코덱별)
+- send     : SignalSender → 로컬 스텁 서버 처리량 (JSON / multipart)
+
+합성 프레임은 core.SIGNAL_COLORS 팔레트와 sample.json 배치를 그대로 쓴다.
+결과는 JSON 으로 저장 (기본 dist/bench/bench_<커밋>.json):
+    {"meta": {...}, "results": {"tick.100.median": {"value": ..., "unit": "us", "better": "lower"}, ...}}
+--compare 를 주면 같은 이름끼리 비교해 threshold 이상 나빠진 항목을 출력하고 종료 코드 1
+(median / 크기 / 처리량 / 성공률만 판정, p90·p99 는 기록만).
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from stub_server import start
+from synth import PALETTE, ROOT, load_config, make_chart_frame, make_screen, make_targets
+
+from classifier import SignalClassifier
+from color import match_color
+from core import SIGNAL_COLORS, DetectionCore
+from debug_recorder import DebugRecorder
+from palette import build_lut
+from grabber import CaptureEngine
+from sender import SignalSender
+from snapshot import encode
+
+DEBUG_SIZE = 10  # main.py 와 동일
+WHITE = (255, 255, 255)
+CODECS = [("png", {"level": 1}), ("png8", {"level": 1, "colors": 16}),
+          ("webp", {"quality": 80}), ("jpeg", {"quality": 80})]
+
+
+def timed(fn, repeat):
+    """fn 을 repeat 번 (워밍업 1 번 뒤) 재서 호출당 us 배열"""
+    fn()
+    out = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        out[i] = time.perf_counter() - start
+    return out * 1e6
+
+
+def summary(samples):
+    return {"median": float(np.median(samples)), "p90": float(np.percentile(samples, 90))}
+
+
+# ------------------------------------------------------------
+# 케이스
+# ------------------------------------------------------------
+def bench_classify(quick):
+    repeat = 50 if quick else 300
+    targets = make_targets(100)
+    points = [(t["x0"], t["y0"]) for t in targets] + [(t["x1"], t["y1"]) for t in targets]
+    engine = CaptureEngine(make_screen(targets), points)
+    frame = engine.tick()
+    classifier = SignalClassifier(SIGNAL_COLORS.keys())
+    classifier.set_targets(targets, engine.bbox)
+    lut = SignalClassifier(SIGNAL_COLORS.keys(), lut=build_lut(SIGNAL_COLORS.keys(), 20, None))
+    lut.set_targets(targets, engine.bbox)
+    probes = [p for t in targets for p in ((t["x0"], t["y0"]), (t["x1"], t["y1"]))]
+
+    def getpixel():
+        # 기존 main.py: 픽셀마다 튜플을 만들어 SIGNAL_COLORS 와 비교
+        out = []
+        for x, y in probes:
+            pixel = engine.pixel(x, y)
+            out.append(pixel if pixel in SIGNAL_COLORS else WHITE)
+        return out
+
+    def matchcolor():
+        return [match_color(engine.pixel(x, y)) for x, y in probes]
+
+    out = {}
+    for name, fn in (("getpixel", getpixel), ("match_color", matchcolor),
+                     ("vectorized", lambda: classifier.classify(frame)),
+                     ("lut", lambda: lut.classify(frame))):
+        out[f"classify.{name}"] = summary(timed(fn, repeat))
+    return out
+
+
+def bench_tick(quick):
+    ticks = 200 if quick else 2000
+    colors = {c: SIGNAL_COLORS[c] for c in PALETTE}
+    out = {}
+    for n in (1, 10, 100):
+        targets = make_targets(n)
+        screen = make_screen(targets)
+        core = DetectionCore(screen, targets, colors, margin=DEBUG_SIZE * 2, gate=True)
+        recorder = DebugRecorder(tempfile.mkdtemp(), size=64)
+        layout = core.layout
+        rng = np.random.default_rng(0)
+        state = {"k": 0}
+
+        def tick():
+            # 10 틱마다 어느 대상의 p0 색이 바뀜
+            if state["k"] % 10 == 0:
+                t = targets[rng.integers(n)]
+                screen.paint(t["x0"], t["y0"], PALETTE[rng.integers(len(PALETTE))], size=3)
+            state["k"] += 1
+            core.tick()
+            recorder.record_many(layout.keys, layout.crops(core.frame, DEBUG_SIZE))
+
+        samples = timed(tick, ticks)
+        stats = summary(samples)
+        stats["p99"] = float(np.percentile(samples, 99))
+        out[f"tick.{n}"] = stats
+    return out
+
+
+def bench_encode(quick):
+    frames = [make_chart_frame(c["w"], c["h"], seed=i) for i, c in enumerate(load_config())]
+    repeat = 2 if quick else 5
+    out = {}
+    for codec, options in CODECS:
+        samples = timed(lambda: [encode(f, codec, **options) for f in frames], repeat) / len(frames)
+        size = sum(len(encode(f, codec, **options)[0]) for f in frames) / len(frames)
+        stats = summary(samples)
+        stats["kb"] = size / 1024
+        out[f"encode.{codec}"] = stats
+    return out
+
+
+def bench_send(quick):
+    n = 100 if quick else 500
+    server, url = start()
+    image = ("signal.png", b"\x89PNG" + b"\0" * 20000, "image/png")
+    out = {}
+    try:
+        for kind in ("json", "multipart"):
+            sender = SignalSender(max_queue=n)
+            sender.start()
+            begin = time.perf_counter()
+            for i in range(n):
+                data = {"name": f"T{i}", "signal": "1"}
+                if kind == "json":
+                    sender.post_json(url + "/signal", data, i)
+                else:
+                    sender.post_multipart(url + "/signalimg", data, {"image": image}, i)
+            sender.stop(timeout=60)
+            elapsed = time.perf_counter() - begin
+            results = sender.results()
+            latency = np.array([r[3] for r in results if r[1]]) * 1e3
+            out[f"send.{kind}"] = {
+                "throughput": n / elapsed,
+                "latency_p50": float(np.median(latency)) if len(latency) else 0.0,
+                "ok": sum(1 for r in results if r[1]) / n,
+            }
+    finally:
+        server.shutdown()
+    return out
+
+
+CASES = {"classify": bench_classify, "tick": bench_tick, "encode": bench_encode, "send": bench_send}
+
+# 지표별 단위 / 좋은 방향 / 회귀 판정에 쓰는지 (꼬리 지연은 흔들려서 기록만)
+UNITS = {
+    "median": ("us", "lower", True), "p90": ("us", "lower", False), "p99": ("us", "lower", False),
+    "kb": ("KB", "lower", True), "throughput": ("signals/s", "higher", True),
+    "latency_p50": ("ms", "lower", False), "ok": ("ratio", "higher", True),
+}
+
+
+# ------------------------------------------------------------
+# 결과 저장 / 비교
+# ------------------------------------------------------------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(raw):
+    results = {}
+    for case, stats in raw.items():
+        for key, value in stats.items():
+            unit, better, gate = UNITS[key]
+            results[f"{case}.{key}"] = {"value": round(value, 3), "unit": unit, "better": better,
+                                        "gate": gate}
+    return results
+
+
+def compare(results, baseline, threshold):
+    """threshold 비율 이상 나빠진 항목 [(이름, 이전, 지금, 변화율)]"""
+    worse = []
+    for name, now in results.items():
+        before = baseline.get(name)
+        if not now["gate"] or before is None or not before["value"]:
+            continue
+        change = (now["value"] - before["value"]) / before["value"]
+        if now["better"] == "higher":
+            change = -change
+        if change > threshold:
+            worse.append((name, before["value"], now["value"], change))
+    return worse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="파이프라인 벤치마크 모음")
+    parser.add_argument("--quick", action="store_true", help="반복 수를 줄여 빠르게")
+    parser.add_argument("--only", default=",".join(CASES), help="실행할 케이스 (쉼표 구분)")
+    parser.add_argument("--out", default=None, help="결과 JSON (기본 dist/bench/bench_<커밋>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.15, help="회귀로 볼 변화율")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    raw = {}
+    for name in args.only.split(","):
+        start = time.perf_counter()
+        raw.update(CASES[name](args.quick))
+        print(f"[{name}] {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    results = flatten(raw)
+    report = {
+        "meta": {
+            "commit": commit, "time": time.time(), "quick": args.quick,
+            "python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    out = args.out or os.path.join(ROOT, "dist", "bench", f"bench_{commit}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+
+    width = max(len(k) for k in results)
+    for name, r in results.items():
+        print(f"{name:{width}s} {r['value']:12.3f} {r['unit']}")
+    print(f"→ {out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        worse = compare(results, baseline["results"], args.threshold)
+        print(f"vs {baseline['meta']['commit']}: {len(worse)} regression(s) > {args.threshold:.0%}")
+        for name, before, now, change in worse:
+            print(f"  {name}: {before} → {now} ({change:+.0%})")
+        if worse:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# synth.py
+"""
+벤치마크용 합성 차트 프레임
+
+sample.json 의 ROI 배치를 그대로 쓰고, 프로브 좌표는
+setting.py(RoiRectangle.getPoints) 와 같은 규칙으로 계산한다.
+"""
+import json
+import os
+
+from _root import ROOT
+
+from core import SIGNAL_COLORS
+from grabber import ArrayGrabber
+
+SAMPLE_FILE = os.path.join(ROOT, "sample.json")
+SCREEN_W, SCREEN_H = 1920, 1080
+
+# core.SIGNAL_COLORS 팔레트 그대로 (같은 순서)
+PALETTE = list(SIGNAL_COLORS)
+
+
+def load_config(path=SAMPLE_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def target_from_config(cfg):
+    """config.json 항목 → target.json 항목 (RoiRectangle.getPoints 와 동일)"""
+    x = cfg["x"] + cfg["w"]
+    cy = cfg["y"] + cfg["h"] - 45 - 10
+    return {
+        "name": cfg["name"],
+        "x0": x - cfg["ox0"],
+        "y0": cy,
+        "x1": x - cfg["ox1"],
+        "y1": cy,
+    }
+
+
+def make_config(n):
+    """sample.json 을 반복/세로 이동해 n 개짜리 config 를 만든다."""
+    base = load_config()
+    out = []
+    for i in range(n):
+        cfg = dict(base[i % len(base)])
+        row = i // len(base)
+        cfg["name"] = f"{cfg['name']}_{i}"
+        # 화면 안에 들어오도록 프로브 행을 위로 겹쳐 쌓는다
+        cfg["h"] = cfg["h"] - (row * 7) % (cfg["h"] - 80)
+        out.append(cfg)
+    return out
+
+
+def make_targets(n):
+    return [target_from_config(c) for c in make_config(n)]
+
+
+def make_screen(targets, seed=0):
+    """흰 배경 위 각 프로브 좌표에 팔레트 색을 칠한 ArrayGrabber"""
+    grabber = ArrayGrabber.blank(SCREEN_W, SCREEN_H)
+    for i, t in enumerate(targets):
+        color = PALETTE[(i + seed) % len(PALETTE)]
+        grabber.paint(t["x0"], t["y0"], color, size=3)
+        grabber.paint(t["x1"], t["y1"], PALETTE[(i + seed + 1) % len(PALETTE)], size=3)
+    return grabber
+
+
+class ViewGrabber:
+    """ArrayGrabber 화면의 view 를 그대로 반환 (캡처 복사 비용을 빼고 재기 위해)"""
+
+    def __init__(self, grabber):
+        self.grabber = grabber
+
+    def grab(self, left, top, width, height):
+        return self.grabber.screen[top:top + height, left:left + width]
+
+    def close(self):
+        pass
+
+
+def make_chart_frame(w=645, h=989, bars=60, seed=0):
+    """
+    캔들 차트처럼 보이는 (h, w, 3) RGB 프레임 (스냅샷 인코딩 벤치마크용)
+
+    흰 배경, 회색 격자, 빨강/파랑 캔들, 하단 신호 색 막대
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    frame = np.full((h, w, 3), 255, dtype=np.uint8)
+    frame[::50, :] = (220, 220, 220)
+    frame[:, ::80] = (220, 220, 220)
+
+    bar_w = max(3, (w - 80) // bars)
+    price = h / 2
+    for i in range(bars):
+        x = 10 + i * bar_w
+        move = rng.normal(0, h / 60)
+        top, bottom = sorted((price, price + move))
+        top, bottom = int(max(60, top)), int(min(h - 100, bottom + 2))
+        color = (255, 0, 0) if move < 0 else (0, 0, 255)
+        frame[top - 6:bottom + 6, x + bar_w // 2] = color
+        frame[top:bottom, x + 1:x + bar_w - 1] = color
+        price += move
+        frame[h - 60:h - 50, x + 1:x + bar_w - 1] = PALETTE[i % len(PALETTE)]
+    return frame
@@ -0,0 +1,108 @@
+# classifier.py
+import numpy as np
+
+from palette import NONE, nearest, pack
+
+# 프로브 주변 샘플 위치 [(dy, dx), ...] (첫 번째가 프로브 픽셀)
+KERNELS = {
+    "pixel": [(0, 0)],
+    # 세로 5 픽셀 (옆 캔들 색이 섞이지 않고 1px 세로 스크롤 / 안티에일리어싱에 강함)
+    "vstrip": [(0, 0), (-1, 0), (1, 0), (-2, 0), (2, 0)],
+    "3x3": [(0, 0)] + [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx],
+}
+
+
+class SignalClassifier:
+    """
+    모든 타깃의 프로브 좌표를 한 번에 분류하는 벡터 분류기
+
+    - 타깃별 (x0,y0) / (x1,y1) 을 캡처 버퍼 기준 인덱스 배열로 미리 변환
+    - classify() 한 번으로 전체 프로브를 팔레트 인덱스로 분류
+    - 채널별 오차가 tol 이하인 가장 가까운 팔레트 색을 고름
+      (안티에일리어싱 된 픽셀이 흰색으로 떨어지지 않도록)
+    - kernel 을 주면 프로브마다 주변 샘플(KERNELS 이름 또는 [(dy, dx), ...])을 같은 버퍼에서 읽어
+      다수결 (NONE 샘플도 표로 세어 이긴 색이 min_votes 표 미만이면 NONE, 기본은 과반 k//2+1
+      — 흰 프로브 옆에 1~2px 표시가 걸쳐도 신호색으로 읽지 않음, 동점이면 프로브 픽셀 쪽)
+      confidence 에 이긴 색의 득표율(0~1)을 남긴다 (캡처는 그대로 한 번)
+    - lut(palette.build_lut 결과)를 주면 거리 계산 없이 0xRRGGBB 로 한 번 색인
+    """
+
+    def __init__(self, palette, tol=20, kernel="pixel", min_votes=None, lut=None):
+        self.colors = [tuple(c) for c in palette]
+        self.palette = np.array(self.colors, dtype=np.int16).reshape(-1, 3)
+        self.tol = tol
+        self.lut = lut
+        self.kernel = kernel
+        offsets = KERNELS[kernel] if isinstance(kernel, str) else [tuple(o) for o in kernel]
+        self.offsets = np.array(offsets, dtype=np.intp).reshape(-1, 2)
+        k = len(self.offsets)
+        self.min_votes = k // 2 + 1 if min_votes is None else min_votes
+        # 동점이면 프로브 픽셀(첫 샘플) 색이 이기도록 작은 가중치
+        self._weights = np.full(k, 1.0)
+        self._weights[0] += 0.5
+        self.ys = np.zeros((0, 2), dtype=np.intp)
+        self.xs = np.zeros((0, 2), dtype=np.intp)
+        self._kys = self._kxs = None
+        self.confidence = np.zeros((0, 2))
+
+    def set_targets(self, targets, bbox):
+        """target.json 항목들을 bbox(창 기준 left, top, ...) 기준 인덱스로 변환"""
+        left, top = bbox[0], bbox[1]
+        self.xs = np.array([[t["x0"], t["x1"]] for t in targets], dtype=np.intp).reshape(-1, 2) - left
+        self.ys = np.array([[t["y0"], t["y1"]] for t in targets], dtype=np.intp).reshape(-1, 2) - top
+        self._expand(bbox)
+
+    def set_layout(self, layout):
+        """컴파일된 layout.TargetLayout (bind 후) 의 버퍼 인덱스를 그대로 사용"""
+        self.xs, self.ys = layout.xs, layout.ys
+        self._expand(layout.bbox)
+
+    def _expand(self, bbox):
+        """커널 샘플 인덱스 (N, 2, K), 버퍼 밖은 가장자리로"""
+        self._kys = self._kxs = None
+        if len(self.offsets) == 1:
+            return
+        h, w = bbox[3] - bbox[1], bbox[2] - bbox[0]
+        self._kys = (self.ys[..., None] + self.offsets[:, 0]).clip(0, h - 1)
+        self._kxs = (self.xs[..., None] + self.offsets[:, 1]).clip(0, w - 1)
+
+    def match(self, pixels):
+        """(..., 3) RGB 배열 → (...) 팔레트 인덱스 (없으면 NONE)"""
+        if self.lut is not None:
+            return self.lut[pack(pixels)].astype(np.intp)
+        return nearest(pixels, self.palette, self.tol)
+
+    def vote(self, labels):
+        """(..., K) 샘플 팔레트 인덱스 → ((...) 다수결 인덱스, (...) 득표율)"""
+        shape, k = labels.shape[:-1], labels.shape[-1]
+        p = len(self.colors)
+        flat = labels.reshape(-1, k)
+        m = len(flat)
+        valid = flat != NONE
+        bins = (np.arange(m)[:, None] * p + flat)[valid]
+        score = np.bincount(bins, np.broadcast_to(self._weights, flat.shape)[valid], minlength=m * p)
+        best = score.reshape(m, p).argmax(axis=1)
+        votes = np.bincount(bins, minlength=m * p).reshape(m, p)[np.arange(m), best]
+        ok = votes >= self.min_votes
+        return (np.where(ok, best, NONE).reshape(shape),
+                np.where(ok, votes / k, 0.0).reshape(shape))
+
+    def classify(self, frame, indices=None):
+        """
+        캡처 버퍼 → (타깃 수, 2) 팔레트 인덱스 배열 ([:, 0] = p0, [:, 1] = p1)
+
+        indices 를 주면 그 타깃들만 (len(indices), 2)
+        """
+        if self._kys is None:
+            ys, xs = (self.ys, self.xs) if indices is None else (self.ys[indices], self.xs[indices])
+            labels = self.match(frame[ys, xs])
+            self.confidence = (labels != NONE).astype(np.float64)
+            return labels
+
+        ys, xs = (self._kys, self._kxs) if indices is None else (self._kys[indices], self._kxs[indices])
+        labels, self.confidence = self.vote(self.match(frame[ys, xs]))
+        return labels
+
+    def color(self, index):
+        """팔레트 인덱스 → RGB 튜플 (NONE 이면 None)"""
+        return None if index == NONE else self.colors[index]
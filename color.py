@@ -1,25 +1,28 @@
 # colorutil.py
-import mss
-import win32gui
-import win32ui
-import win32con
+import threading
+
 import numpy as np
 
+from palette import DEFAULT_PALETTE
+
+# mss / win32 는 실제 화면을 읽을 때만 import (리눅스에서도 match_color 사용 가능)
+
 # Buja chart window title
 WINDOW_TITLE = "Buja Chart"
 
-# 신호 색상 정의 (RGB 기반)
-COLOR_MAP = {
-    "red":     (255, 0, 0),
-    "blue":    (0, 0, 255),
-    "pink":    (255, 0, 255),
-    "sky":     (0, 255, 255),
-}
+# 신호 색상 정의 (RGB 기반, palette.DEFAULT 의 신호색)
+COLOR_MAP = {n: c for n, c in DEFAULT_PALETTE.colors.items() if c in DEFAULT_PALETTE.signal_colors}
+
+# 캡처 한 번의 고정 비용을 픽셀 수로 (mss 왕복 ≈ 256x256 영역 복사)
+# 두 영역을 합쳐서 늘어나는 픽셀이 이보다 적으면 한 번에 캡처
+GRAB_COST = 256 * 256
 
 def get_pixel_color2(x, y):
     """
     화면 전체 기준 (screen 좌표)의 특정 픽셀 RGB 반환
     """
+    import win32gui
+
     hwnd = win32gui.GetDesktopWindow()
     hdc = win32gui.GetWindowDC(hwnd)
     colorref = win32gui.GetPixel(hdc, x, y)
@@ -35,42 +38,162 @@ def get_pixel_color(x, y):
     """
     mss로 좌표 1픽셀만 캡처해서 색상 추출
     (win32gui.GetPixel 불가 문제 완전 해결)
-    """
-    with mss.mss() as sct:
-        grab_area = {"top": y, "left": x, "width": 1, "height": 1}
-        
-        img = sct.grab(grab_area)
-        arr = np.array(img)
-
-        # BGRA → RGB 변환
-        b, g, r, _ = arr[0, 0]
-        return (r, g, b)
-
 
-def match_color(rgb):
-    R, G, B = rgb
-
-    def near(a, b, tol=20):
-        return abs(a - b) <= tol
+    여러 점이면 sample_points 로 한 번에 (mss 핸들도 스레드별로 재사용)
+    """
+    r, g, b = sample_points([(x, y)])[0]
+    return (int(r), int(g), int(b))
 
-    # 흰색 제외 (배경)
-    if near(R, 255) and near(G, 255) and near(B, 255):
-        return "white"
 
-    # 빨강(상승2)
-    if near(R, 255) and near(G, 0) and near(B, 0):
-        return "red"
+def plan_rects(points, gap=16, cost=GRAB_COST):
+    """
+    (N, 2) 화면 좌표 → 캡처 영역 [(left, top, width, height, 점 인덱스 배열), ...]
 
-    # 파랑(하락2)
-    if near(R, 0) and near(G, 0) and near(B, 255):
-        return "blue"
+    - gap 픽셀 격자에서 이웃한 칸의 점끼리 한 덩어리로 묶고
+    - 덩어리 bbox 끼리 합쳐서 늘어나는 픽셀이 cost(캡처 한 번 비용) 이하면 계속 합친다
+    """
+    pts = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+    if not len(pts):
+        return []
+
+    # 격자 칸 → 이웃 칸과 union-find
+    cells = pts // gap
+    keys, owner = np.unique(cells, axis=0, return_inverse=True)
+    owner = owner.ravel()
+    parent = list(range(len(keys)))
+
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    index = {k: n for n, k in enumerate(map(tuple, keys.tolist()))}
+    for n, (cx, cy) in enumerate(keys.tolist()):
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                m = index.get((cx + dx, cy + dy))
+                if m is not None:
+                    parent[find(m)] = find(n)
+
+    groups = {}
+    for i, n in enumerate(owner.tolist()):
+        groups.setdefault(find(n), []).append(i)
+
+    # [left, top, right, bottom, 인덱스]
+    rects = []
+    for members in groups.values():
+        sub = pts[members]
+        (left, top), (right, bottom) = sub.min(axis=0), sub.max(axis=0) + 1
+        rects.append([int(left), int(top), int(right), int(bottom), members])
+
+    def area(r):
+        return (r[2] - r[0]) * (r[3] - r[1])
+
+    # a 가 커지면 뒤쪽 영역들과 다시 비교
+    a = 0
+    while a < len(rects):
+        grown = False
+        b = a + 1
+        while b < len(rects):
+            ra, rb = rects[a], rects[b]
+            union = [min(ra[0], rb[0]), min(ra[1], rb[1]), max(ra[2], rb[2]), max(ra[3], rb[3])]
+            if area(union) <= area(ra) + area(rb) + cost:
+                rects[a] = union + [ra[4] + rb[4]]
+                del rects[b]
+                grown = True
+            else:
+                b += 1
+        if not grown:
+            a += 1
+
+    return [(l, t, r - l, b - t, np.array(m, dtype=np.intp)) for l, t, r, b, m in rects]
+
+
+class PointSampler:
+    """
+    여러 화면 좌표의 RGB 를 최소한의 캡처로 읽는 샘플러
 
-    # 분홍(상승1)
-    if near(R, 255) and near(G, 0) and near(B, 255):
-        return "pink"
+    - 좌표 목록이 같으면 plan_rects 결과를 재사용 (틱마다 묶기 계산 안 함)
+    - grabber(grabber.MssGrabber 등) 하나를 계속 재사용, 기본은 MssGrabber
+    - sample() 은 (N, 3) RGB uint8 배열 (좌표 순서 그대로)
+    - grabs: 지금까지 캡처 횟수
+    """
 
-    # 하늘(하락1)
-    if near(R, 0) and near(G, 255) and near(B, 255):
-        return "sky"
+    def __init__(self, grabber=None, gap=16, cost=GRAB_COST):
+        if grabber is None:
+            from grabber import MssGrabber
+            grabber = MssGrabber()
+        self.grabber = grabber
+        self.gap = gap
+        self.cost = cost
+        self.grabs = 0
+        self._key = None
+        self._plan = []
+        self._count = 0
+
+    def plan(self, points):
+        pts = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        key = pts.tobytes()
+        if key != self._key:
+            self._plan = [
+                (left, top, width, height, idx, pts[idx, 1] - top, pts[idx, 0] - left)
+                for left, top, width, height, idx in plan_rects(pts, self.gap, self.cost)
+            ]
+            self._key = key
+            self._count = len(pts)
+        return self._plan
+
+    def sample(self, points):
+        plan = self.plan(points)
+        out = np.empty((self._count, 3), dtype=np.uint8)
+        for left, top, width, height, idx, ys, xs in plan:
+            frame = self.grabber.grab(left, top, width, height)
+            out[idx] = frame[ys, xs]
+        self.grabs += len(plan)
+        return out
+
+    def close(self):
+        self.grabber.close()
+
+
+# mss 핸들은 만든 스레드에서만 쓸 수 있으므로 스레드마다 샘플러 하나
+_local = threading.local()
+
+
+def sample_points(points):
+    """(N, 2) 화면 좌표 → (N, 3) RGB uint8 (스레드별 PointSampler 재사용)"""
+    sampler = getattr(_local, "sampler", None)
+    if sampler is None:
+        sampler = _local.sampler = PointSampler()
+    return sampler.sample(points)
+
+
+def match_color(rgb, palette=None):
+    """
+    RGB → 팔레트 색 이름 (white 는 배경, 맞는 색이 없으면 "unknown")
 
-    return "unknown"
+    채널별 오차가 tol 이하인 가장 가까운 색 (palette.nearest 와 같은 규칙, 기본 palette.DEFAULT)
+    """
+    palette = DEFAULT_PALETTE if palette is None else palette
+    R, G, B = (int(v) for v in rgb)
+    tol = palette.tol
+    if palette.disjoint:
+        for n, (r, g, b) in zip(palette.names, palette.rgb):
+            if abs(R - r) <= tol and abs(G - g) <= tol and abs(B - b) <= tol:
+                return n
+        return "unknown"
+
+    best, name = tol + 1, "unknown"
+    for n, (r, g, b) in zip(palette.names, palette.rgb):
+        d = max(abs(R - r), abs(G - g), abs(B - b))
+        if d < best:
+            best, name = d, n
+    return name
+
+
+def match_colors(pixels, palette=None):
+    """match_color 의 벡터 버전: (..., 3) RGB 배열 → (...) 색 이름 배열"""
+    palette = DEFAULT_PALETTE if palette is None else palette
+    names = np.array(palette.names + ["unknown"])
+    return names[palette.classify(pixels)]
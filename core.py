@@ -0,0 +1,450 @@
+# core.py
+"""
+Qt / win32 없이 도는 신호 감지 코어
+
+    python run.py headless [--source screen|<파일>] [--targets dist/target.json]
+                           [--interval 0.01] [--ticks N] [--send] [--dev]
+
+- 프레임 소스: grabber.py 의 캡처기 (grab(left, top, w, h) / close())
+- 싱크: emit(signal) / close() 를 가진 객체 (PrintSink, HttpSink)
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from classifier import SignalClassifier
+from detector import SignalDetector
+from gate import RegionGate
+from grabber import CaptureEngine
+from layout import TargetLayout
+from metrics import Metrics
+from palette import DEFAULT_PALETTE, PALETTE_FILE, PaletteFile, build_lut, prune_luts
+
+# ===== 색 정의 =====
+# 기본 팔레트 (palette.DEFAULT, 실제 실행은 dist/palette.json 을 palette.PaletteFile 로 읽음)
+SIGNAL_COLORS = DEFAULT_PALETTE.signal_colors
+WHITE = (255, 255, 255)
+COLOR_TOL = DEFAULT_PALETTE.tol  # 팔레트 색 허용 오차 (채널별, color.match_color 와 동일)
+TARGET_FILE = os.path.join("dist", "target.json")
+STARTED_ENV = "BUJA_STARTED"  # run.py 가 넣는 프로세스 시작 시각 (time.time())
+METRICS_FILE = os.path.join("dist", "metrics.json")
+# 대상별 신호 확정 / 중복 제거 기본값 (detector.SignalDetector, 앱 / headless / multi 공통)
+# 한 프레임 깜빡임으로 캡처/전송하지 않도록 연속 2 번 관측돼야 확정, 같은 대상은 1 초에 한 번까지
+SIGNAL_DEBOUNCE = 2
+SIGNAL_HOLD_SEC = 0.0
+SIGNAL_COOLDOWN_SEC = 1.0
+# 프로브 주변 샘플 다수결 (classifier.KERNELS, "pixel" 이면 기존처럼 한 픽셀)
+# 같은 캡처 버퍼에서 읽으므로 추가 캡처 없음, 1px 스크롤/잡음에 덜 깜빡임
+PROBE_KERNEL = "vstrip"
+
+
+class DetectionCore:
+    """
+    캡처 → 분류 → 판정을 한 틱으로 묶은 헤드리스 엔진
+
+    tick() 은 이번 틱 신호 목록을 반환하고 등록된 싱크에 emit 한다.
+    신호는 dict: name, index(대상 순번), signal, msg, p0, p1(RGB), confidence(p0 색 득표율), time
+    """
+
+    def __init__(self, grabber, targets, colors=SIGNAL_COLORS, tol=COLOR_TOL, margin=0,
+                 scheduler=None, gate=False, config=(), roi=False, metrics=None,
+                 kernel="pixel", min_votes=None, debounce=1, hold=0.0, cooldown=0.0, lut=False,
+                 heartbeat=None):
+        # 대상 좌표(+ config.json 스냅샷 ROI)는 시작 / 배율 변경 때 한 번 배열로 컴파일
+        self.base_layout = TargetLayout(targets, config)
+        self.signal_colors = colors
+        # scheduler.BarScheduler: 폴링할 대상이 있는 틱에만 캡처하고 그 대상만 판정
+        self.scheduler = scheduler
+        # metrics.Metrics: 단계별 지연(grab / classify / detect / tick / tick_gap)과 카운터
+        self.metrics = metrics
+        self.margin = margin
+        self.roi = roi  # ROI 까지 캡처 영역에 넣음 (버스 모드)
+        self.scale = 1.0
+        self.base_scale = None
+
+        # kernel / min_votes: 프로브 주변 샘플 다수결, lut: 팔레트 LUT(디스크 캐시) 한 번 색인
+        self.use_lut = lut
+        self.classifier = SignalClassifier(colors.keys(), tol=tol, kernel=kernel, min_votes=min_votes,
+                                           lut=build_lut(colors.keys(), tol) if lut else None)
+        # 대상별 디바운스 / 봉별 중복 제거 / 쿨다운
+        self.detector = SignalDetector(self.base_layout.names, self.classifier.colors,
+                                       debounce=debounce, hold=hold, cooldown=cooldown)
+        self.engine = CaptureEngine(grabber, [], margin=margin)
+        self.use_gate = gate  # 프로브 주변 영역이 바뀐 대상만 분류 / 판정 (gate.RegionGate)
+        self.labels = None
+        self.confidence = None
+        self._compile(self.base_layout)
+
+        self.sinks = []
+        self.frame = None
+        self.captured = False  # 이번 tick 에 캡처했는지 (스케줄러가 건너뛰면 False)
+        self.startup = None  # run.py 프로세스 시작 → 첫 캡처 (초)
+        self._first = True
+        self._last_tick = None
+        # watchdog.Heartbeat: 틱 / 캡처마다 하트비트, 이전 자식의 판정 상태를 이어받아 바뀔 때마다 저장
+        self.heartbeat = heartbeat
+        self.restored = 0
+        self.palettes = None
+        self._palette_pool = None
+        self._palette_job = None
+        if heartbeat is not None:
+            self.restored = heartbeat.restore(self.detector)
+
+    def _compile(self, layout):
+        """layout 기준으로 캡처 영역 / 분류기 / 게이트 인덱스를 다시 계산"""
+        points = layout.points() + (layout.roi_points() if self.roi else [])
+        self.engine.set_points(points, self.margin)
+        self.layout = layout.bind(self.engine.bbox)
+        self.targets = layout.targets
+        self.classifier.set_layout(layout)
+        self.gate = None
+        if self.use_gate:
+            self.gate = RegionGate(self.targets, self.engine.bbox, offsets=self.classifier.offsets)
+
+    def set_palette(self, colors, tol=COLOR_TOL, lut=None):
+        """
+        신호색({RGB: (signal, msg)}) / 허용 오차 교체 (palette.PaletteFile 리로드)
+
+        판정 상태의 색은 같은 signal 값의 새 색으로 옮기므로 화면이 그대로면 다시 신호를 내지 않는다.
+        다음 tick 은 전체 대상을 다시 분류한다.
+        lut 에 미리 만든 build_lut(colors.keys(), tol) 결과를 주면 여기서 만들지 않는다 (UI 스레드 밖에서 빌드).
+        """
+        old = self.classifier
+        if not self.use_lut:
+            lut = None
+        elif lut is None:
+            lut = build_lut(colors.keys(), tol)
+        codes = {v[0]: i for i, v in enumerate(colors.values())}
+        table = [codes.get(self.signal_colors[c][0], -1) for c in old.colors]
+        self.signal_colors = colors
+        self.classifier = SignalClassifier(colors.keys(), tol=tol, kernel=old.kernel,
+                                           min_votes=old.min_votes, lut=lut)
+        self.classifier.set_layout(self.layout)
+        self.detector.remap(table, self.classifier.colors)
+        self.labels = None
+
+    def watch_palette(self, palettes):
+        """palettes(palette.PaletteFile) 를 poll_palette 로 핫 리로드 (LUT 는 작업 스레드에서 빌드)"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.palettes = palettes
+        self._palette_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="palette")
+        if self.use_lut:
+            # 이전 실행 / 편집에서 남은 LUT 캐시 정리
+            self._palette_pool.submit(prune_luts, [getattr(self.classifier.lut, "filename", None)])
+
+    def poll_palette(self, now=None):
+        """
+        palette.json 이 바뀌었으면 LUT 빌드를 시작하고, 끝난 빌드가 있으면 교체 → 교체한 Palette (없으면 None)
+
+        빌드하는 동안은 이전 팔레트로 감지하고, 그 사이 또 바뀌면 마지막 것만 교체한다.
+        빌드 실패는 읽기 실패처럼 palettes.error 에 남긴다.
+        """
+        swapped = None
+        if self._palette_job is not None and self._palette_job[1].done():
+            palette, future = self._palette_job
+            self._palette_job = None
+            try:
+                lut = future.result()
+            except (OSError, MemoryError, ValueError) as e:
+                self.palettes.error = e
+            else:
+                self.set_palette(palette.signal_colors, palette.tol, lut=lut)
+                if lut is not None:
+                    # 교체 후 쓰지 않는 캐시 파일 삭제 (팔레트를 고칠 때마다 16MB 씩 쌓이지 않도록)
+                    self._palette_pool.submit(prune_luts, [getattr(lut, "filename", None)])
+                swapped = palette
+
+        palette = self.palettes.poll(now)
+        if palette is not None:
+            colors, tol = list(palette.signal_colors), palette.tol
+            build = (lambda: build_lut(colors, tol)) if self.use_lut else (lambda: None)
+            self._palette_job = (palette, self._palette_pool.submit(build))
+        return swapped
+
+    def set_geometry(self, origin, scale=1.0):
+        """
+        창 이동/배율 변경 반영 (geometry.WindowTracker 리스너)
+
+        이동만이면 캡처 origin 만 바꾸고, 배율이 바뀌면 전체 프로브 좌표를 한 번에 다시 계산.
+        target.json 은 처음 알려준 배율 기준으로 본다. 판정 상태(이전 색)는 유지한다.
+        """
+        self.engine.set_origin(*origin)
+        if self.base_scale is None:
+            self.base_scale = scale
+        scale = scale / self.base_scale
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self._compile(self.base_layout.scaled(scale))
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def tick(self, now=None):
+        now = time.time() if now is None else now
+        metrics = self.metrics
+        heartbeat = self.heartbeat
+        if heartbeat is not None:
+            heartbeat.tick()
+        if metrics is not None:
+            started = time.perf_counter()
+            if self._last_tick is not None:
+                # 틱 사이 간격 (이벤트 루프 / 틱이 멈춘 시간)
+                metrics.record("tick_gap", started - self._last_tick)
+            self._last_tick = started
+        due = None
+        if self.scheduler is not None:
+            due = self.scheduler.due(now)
+            if not due:
+                self.captured = False
+                if heartbeat is not None:
+                    # 캡처할 대상이 없는 틱도 캡처 정상으로
+                    heartbeat.grabbed()
+                if metrics is not None:
+                    metrics.count("idle")
+                return []
+
+        t0 = time.perf_counter()
+        self.frame = self.engine.tick()
+        self.captured = True
+        t1 = time.perf_counter()
+        if heartbeat is not None:
+            heartbeat.grabbed()
+        if self._first:
+            self._first = False
+            started = os.environ.get(STARTED_ENV)
+            if started:
+                self.startup = time.time() - float(started)
+                if metrics is not None:
+                    metrics.record("startup", self.startup)
+
+        labels = self.labels
+        if labels is None:
+            self.labels = self.classifier.classify(self.frame)
+            self.confidence = self.classifier.confidence
+            if self.gate is not None:
+                self.gate.changed(self.frame)
+        elif self.gate is not None:
+            # 영역이 바뀐 대상만 분류 (안 바뀐 대상은 판정해도 결과가 같음)
+            polled = due
+            due = self.gate.changed(self.frame, polled)
+            if len(due):
+                rows = self.classifier.classify(self.frame, due)
+                self._observe(due, rows, now)
+                labels[due] = rows
+                self.confidence[due] = self.classifier.confidence
+            if self.detector.waiting:
+                # 확정 대기 중(디바운스 / 쿨다운)인 대상은 화면이 그대로여도 판정
+                pending = np.flatnonzero(self.detector.pending)
+                if polled is not None:
+                    pending = np.intersect1d(pending, polled)
+                due = np.union1d(due, pending)
+        else:
+            rows = self.classifier.classify(self.frame)
+            if due is not None:
+                self._observe(due, rows[due], now)
+            self.labels = rows
+            self.confidence = self.classifier.confidence
+        t2 = time.perf_counter()
+
+        events = self.detector.step(self.labels, due, now)
+        if heartbeat is not None:
+            # 신호를 싱크로 내보내기 전에 저장 (재시작 뒤 같은 신호를 다시 보내지 않도록)
+            heartbeat.checkpoint(self.detector)
+        signals = []
+        for i, p0, p1 in events:
+            p0 = self.detector.color(p0, WHITE)
+            p1 = self.detector.color(p1, WHITE)
+            signal, msg = self.signal_colors[p0]
+            sig = {"name": self.layout.names[i], "index": i, "signal": signal, "msg": msg,
+                   "p0": p0, "p1": p1, "time": now, "confidence": float(self.confidence[i, 0])}
+            for sink in self.sinks:
+                sink.emit(sig)
+            signals.append(sig)
+
+        if metrics is not None:
+            t3 = time.perf_counter()
+            metrics.record("grab", t1 - t0)
+            metrics.record("classify", t2 - t1)
+            metrics.record("detect", t3 - t2)
+            metrics.record("tick", t3 - t0)
+            metrics.count("ticks")
+            if signals:
+                metrics.count("signals", len(signals))
+        return signals
+
+    def _observe(self, indices, rows, now):
+        """p1 이 바뀐 대상을 스케줄러에 봉 마감으로 알림 (self.labels 갱신 전에 호출)"""
+        if self.scheduler is None:
+            return
+        indices = np.asarray(indices, dtype=np.intp)
+        for i in indices[self.labels[indices, 1] != rows[:, 1]].tolist():
+            self.scheduler.observe(i, now)
+
+    def run(self, interval=0.01, ticks=None):
+        """interval 초마다 tick (ticks 번, None 이면 무한), 스케줄러가 있으면 그 간격으로"""
+        n = 0
+        next_tick = time.monotonic()
+        while ticks is None or n < ticks:
+            self.tick()
+            n += 1
+            if self.palettes is not None:
+                self._report_palette()
+            if self.metrics is not None:
+                self.metrics.maybe_dump()
+            if self.scheduler is not None:
+                interval = self.scheduler.next_wakeup(time.time())
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # 틱이 간격보다 오래 걸림
+                if self.metrics is not None:
+                    self.metrics.count("tick_overrun")
+                next_tick = time.monotonic()
+        return n
+
+    def _report_palette(self):
+        palette = self.poll_palette()
+        if palette is not None:
+            print(f"팔레트 다시 읽음: {', '.join(palette.names)} (tol={palette.tol})", flush=True)
+        elif self.palettes.error is not None:
+            error, self.palettes.error = self.palettes.error, None
+            print(f"[팔레트 읽기 실패] {self.palettes.path} / {error}", flush=True)
+
+    def close(self):
+        self.engine.close()
+        if self._palette_pool is not None:
+            self._palette_pool.shutdown(wait=False)
+        for sink in self.sinks:
+            sink.close()
+
+
+class PrintSink:
+    """신호를 표준 출력으로"""
+
+    def emit(self, sig):
+        timestamp = datetime.fromtimestamp(sig["time"]).strftime("%m%d %H%M%S")
+        print(f"[{timestamp}] {sig['name']} - {sig['signal']} ({sig['msg']})", flush=True)
+
+    def close(self):
+        pass
+
+
+class HttpSink:
+    """신호를 SignalSender 로 서버에 전송 (sendToServer 와 같은 JSON)"""
+
+    def __init__(self, url, sender=None, metrics=None):
+        from sender import SignalSender
+
+        self.url = url
+        self.sender = sender or SignalSender(timings=metrics)
+        if metrics is not None:
+            metrics.add_source("sender", self.sender.metrics)
+        self.sender.start()
+
+    def emit(self, sig):
+        timestamp = datetime.fromtimestamp(sig["time"]).strftime("%m%d %H%M%S")
+        data = {"timestamp": timestamp, "name": sig["name"], "signal": sig["signal"]}
+        self.sender.post_json(self.url, data, (timestamp, sig["name"], sig["signal"], sig["msg"]),
+                              detected_at=sig["time"])
+
+    def close(self):
+        self.sender.stop()
+
+
+def load_targets(path=TARGET_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def open_source(source):
+    """--source 값 → 캡처기 (screen 이면 mss, bus:<이름> 이면 공유 메모리 프레임, 아니면 파일)"""
+    from grabber import BusGrabber, FileGrabber, MssGrabber
+
+    if source == "screen":
+        return MssGrabber()
+    if source.startswith("bus:"):
+        from framebus import FrameBus
+
+        return BusGrabber(FrameBus.attach(source[4:]))
+    return FileGrabber(source)
+
+
+def add_detect_args(parser):
+    """--kernel / --debounce / --hold / --cooldown (headless / multi 공통 CLI 옵션)"""
+    from classifier import KERNELS
+
+    parser.add_argument("--kernel", choices=sorted(KERNELS), default=PROBE_KERNEL,
+                        help="프로브 주변 샘플 다수결 커널 (classifier.KERNELS)")
+    parser.add_argument("--debounce", type=int, default=SIGNAL_DEBOUNCE, help="신호 확정에 필요한 연속 관측 수")
+    parser.add_argument("--hold", type=float, default=SIGNAL_HOLD_SEC, help="신호 확정에 필요한 유지 시간(초)")
+    parser.add_argument("--cooldown", type=float, default=SIGNAL_COOLDOWN_SEC, help="대상별 신호 최소 간격(초)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="run.py headless", description="Qt 없이 신호 감지")
+    parser.add_argument("--source", default="screen",
+                        help="screen, bus:<공유 메모리 이름>, 또는 화면 이미지/.npy 파일")
+    parser.add_argument("--targets", default=TARGET_FILE)
+    parser.add_argument("--origin", default="0,0", help="창 좌상단 화면 좌표 x,y (bus: 소스는 무시)")
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--ticks", type=int, default=None)
+    parser.add_argument("--send", action="store_true", help="서버로 전송")
+    parser.add_argument("--dev", action="store_true", help="개발 서버로 전송")
+    parser.add_argument("--metrics", default=METRICS_FILE, help="단계별 지연 JSON 을 주기적으로 쓸 파일")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="127.0.0.1:<포트>/metrics 로 지표 제공")
+    add_detect_args(parser)
+    args = parser.parse_args(argv)
+
+    metrics = Metrics(args.metrics)
+    if args.metrics_port is not None:
+        metrics.serve(args.metrics_port)
+    # run.py watch 아래에서 실행 중이면 하트비트 / 판정 상태 인계
+    from watchdog import Heartbeat
+
+    heartbeat = Heartbeat.attach()
+    # 앱과 같은 dist/palette.json (LUT 분류, 실행 중 수정하면 다시 읽음)
+    palettes = PaletteFile(PALETTE_FILE)
+    palette = palettes.palette
+    core = DetectionCore(open_source(args.source), load_targets(args.targets), palette.signal_colors,
+                         tol=palette.tol, gate=True, metrics=metrics, kernel=args.kernel,
+                         debounce=args.debounce, hold=args.hold, cooldown=args.cooldown, lut=True,
+                         heartbeat=heartbeat)
+    core.watch_palette(palettes)
+    metrics.add_source("detector", core.detector.metrics)
+    if core.restored:
+        print(f"판정 상태 인계: {core.restored}개 대상", flush=True)
+    if not args.source.startswith("bus:"):
+        # 버스 프레임은 생산자 창 기준으로 자르므로 origin 이 필요 없음
+        core.engine.set_origin(*(int(v) for v in args.origin.split(",")))
+    core.add_sink(PrintSink())
+    if args.send:
+        # endpoints 는 sys.argv 의 --dev 로 개발 서버를 고른다
+        from endpoints import FASTAPI_URL
+
+        sink = core.add_sink(HttpSink(FASTAPI_URL, metrics=metrics))
+        if heartbeat is not None:
+            heartbeat.send = lambda: sink.sender.alive
+
+    try:
+        n = core.run(args.interval, args.ticks)
+        startup = "" if core.startup is None else f" startup={core.startup * 1000:.0f}ms"
+        print(f"ticks={n}{startup} gate={core.gate.metrics()} detector={core.detector.metrics()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        core.close()
+        metrics.close()
+
+
+if __name__ == "__main__":
+    main()
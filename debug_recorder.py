@@ -0,0 +1,123 @@
+# debug_recorder.py
+import io
+import os
+import time
+import zipfile
+
+import numpy as np
+
+FORMATS = ("npy", "archive")
+
+
+class DebugRecorder:
+    """
+    프로브 주변 크롭을 메모리 링버퍼에 모아두는 디버그 레코더
+
+    - record() 는 매 틱 호출 (메모리 복사만, 디스크 I/O 없음)
+    - record_many() 는 같은 키 목록의 크롭 묶음을 한 번에 (키 목록당 링버퍼 하나, 복사 한 번)
+    - 대상(key)별 마지막 size 개 크롭과 시각을 보관
+    - flush() 할 때만 디스크에 씀: 신호 발생 시, 수동(on demand), sample_interval 초마다
+    - fmt="npy"     : key 별로 <시각>_<key>.npy (크롭, (N, h, w, 3)) + _t.npy (시각)
+      fmt="archive" : 한 개의 debug.zip 에 같은 내용을 추가, max_bytes 넘으면 debug.1.zip 으로 교체
+    """
+
+    def __init__(self, directory, size=64, fmt="npy", sample_interval=0.0, max_bytes=64 << 20):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown debug format: {fmt}")
+        self.directory = directory
+        self.size = size
+        self.fmt = fmt
+        self.sample_interval = sample_interval
+        self.max_bytes = max_bytes
+        self.writes = 0
+        self._rings = {}  # key → [frames, times, 기록 수]
+        self._blocks = {}  # 키 튜플 → [frames (size, K, ...), times, 기록 수, key → 열]
+        self._next_sample = time.monotonic() + sample_interval
+
+    def record(self, key, crop, now=None):
+        now = time.time() if now is None else now
+        ring = self._rings.get(key)
+        if ring is None or ring[0].shape[1:] != crop.shape:
+            ring = [np.zeros((self.size,) + crop.shape, dtype=np.uint8),
+                    np.zeros(self.size, dtype=np.float64), 0]
+            self._rings[key] = ring
+
+        i = ring[2] % self.size
+        ring[0][i] = crop
+        ring[1][i] = now
+        ring[2] += 1
+
+    def record_many(self, keys, crops, now=None):
+        """keys(튜플) 순서대로 쌓은 (K, h, w, 3) 크롭을 한 번에 기록"""
+        now = time.time() if now is None else now
+        block = self._blocks.get(keys)
+        if block is None or block[0].shape[1:] != crops.shape:
+            block = [np.zeros((self.size,) + crops.shape, dtype=np.uint8),
+                     np.zeros(self.size, dtype=np.float64), 0,
+                     {key: j for j, key in enumerate(keys)}]
+            self._blocks[keys] = block
+
+        i = block[2] % self.size
+        block[0][i] = crops
+        block[1][i] = now
+        block[2] += 1
+
+    def tick(self):
+        """sample_interval 이 지났으면 전체 flush (매 틱 호출)"""
+        if self.sample_interval <= 0 or time.monotonic() < self._next_sample:
+            return []
+        self._next_sample = time.monotonic() + self.sample_interval
+        return self.flush()
+
+    def frames(self, key):
+        """key 의 (크롭, 시각) 을 오래된 순서로"""
+        ring = self._rings.get(key)
+        if ring is None:
+            for block in self._blocks.values():
+                if key in block[3]:
+                    ring = (block[0][:, block[3][key]], block[1], block[2])
+                    break
+            else:
+                raise KeyError(key)
+        frames, times, n = ring
+        if n <= self.size:
+            return frames[:n], times[:n]
+        order = np.roll(np.arange(self.size), -(n % self.size))
+        return frames[order], times[order]
+
+    def flush(self, keys=None):
+        """keys(None 이면 전체)의 링버퍼를 디스크에 쓰고 쓴 경로 목록 반환"""
+        known = dict.fromkeys(self._rings)
+        for block in self._blocks.values():
+            known.update(dict.fromkeys(block[3]))
+        keys = list(known) if keys is None else [k for k in keys if k in known]
+        if not keys:
+            return []
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%m%d_%H%M%S")
+
+        paths = []
+        for key in keys:
+            frames, times = self.frames(key)
+            name = f"{stamp}_{key}"
+            if self.fmt == "npy":
+                path = os.path.join(self.directory, name + ".npy")
+                np.save(path, frames)
+                np.save(os.path.join(self.directory, name + "_t.npy"), times)
+            else:
+                path = self._append(name, frames, times)
+            paths.append(path)
+            self.writes += 1
+        return paths
+
+    def _append(self, name, frames, times):
+        path = os.path.join(self.directory, "debug.zip")
+        if os.path.exists(path) and os.path.getsize(path) > self.max_bytes:
+            os.replace(path, os.path.join(self.directory, "debug.1.zip"))
+
+        with zipfile.ZipFile(path, "a", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            for suffix, arr in (("", frames), ("_t", times)):
+                buf = io.BytesIO()
+                np.save(buf, arr)
+                zf.writestr(name + suffix + ".npy", buf.getvalue())
+        return path
@@ -0,0 +1,152 @@
+# delta.py
+import json
+
+import numpy as np
+
+WHITE = 255
+
+
+class DeltaEncoder:
+    """
+    대상별 마지막 업로드 프레임과 비교해 바뀐 타일만 올리는 델타 인코더
+
+    - 프레임을 tile x tile 타일로 나눠 바뀐 타일만 세로로 이어붙인 '패치 스트립' 생성
+    - keyframe_every 번마다, 크기가 바뀌었을 때, 바뀐 타일 비율이 max_ratio 를 넘을 때는 전체 키프레임
+    - 헤더(dict)는 그대로 JSON 으로 보내고, 서버는 DeltaDecoder 로 복원
+    - seq 는 대상별로 reset 뒤에도 계속 증가 (늦게 도착한 이전 델타를 서버가 새 키프레임에 붙이지 않도록)
+    - 델타는 서버의 직전 프레임에만 맞으므로 아웃박스에 남겨 나중에 재전송하지 않는다.
+      실패하면 rekey 로 같은 프레임을 키프레임으로 다시 보낸다
+    """
+
+    def __init__(self, tile=32, keyframe_every=20, max_ratio=0.5):
+        self.tile = tile
+        self.keyframe_every = keyframe_every
+        self.max_ratio = max_ratio
+        self._last = {}  # name → (seq, frame)
+        self._count = {}
+        self._seq = {}  # name → 마지막으로 쓴 seq (reset 해도 유지)
+
+    def reset(self, name=None):
+        """다음 업로드를 키프레임으로 (업로드 실패 등으로 서버와 기준이 어긋났을 때)"""
+        if name is None:
+            self._last.clear()
+        else:
+            self._last.pop(name, None)
+
+    def rekey(self, name, seq):
+        """
+        업로드에 실패한 seq 프레임을 새 seq 의 키프레임으로 (header, frame)
+
+        그 뒤에 같은 대상을 또 인코딩했으면 (실패한 프레임이 마지막이 아니면) reset 만 하고 None
+        """
+        last = self._last.get(name)
+        if last is None or last[0] != seq:
+            self.reset(name)
+            return None
+        return self._key(name, self._next(name), last[1])
+
+    def _next(self, name):
+        seq = self._seq.get(name, -1) + 1
+        self._seq[name] = seq
+        return seq
+
+    def encode(self, name, frame):
+        """
+        (h, w, 3) RGB 프레임 → (header, 업로드할 RGB 배열)
+
+        header["mode"] 는 "key" 또는 "delta"
+        """
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        h, w = frame.shape[:2]
+        last = self._last.get(name)
+        n = self._count.get(name, 0)
+        self._count[name] = n + 1
+        seq = self._next(name)
+
+        if last is None or last[1].shape != frame.shape or n % self.keyframe_every == 0:
+            return self._key(name, seq, frame)
+
+        t = self.tile
+        changed = _tile_mask(frame != last[1], t)
+        if changed.mean() > self.max_ratio:
+            return self._key(name, seq, frame)
+
+        tiles = np.argwhere(changed)
+        self._last[name] = (seq, frame)
+        header = {"mode": "delta", "seq": seq, "base": last[0], "w": w, "h": h, "tile": t,
+                  "tiles": tiles.tolist()}
+        if not len(tiles):
+            return header, np.full((1, 1, 3), WHITE, dtype=np.uint8)
+        return header, _tiles(frame, t)[tiles[:, 0], tiles[:, 1]].reshape(-1, t, 3)
+
+    def _key(self, name, seq, frame):
+        self._last[name] = (seq, frame)
+        self._count[name] = 1
+        h, w = frame.shape[:2]
+        return {"mode": "key", "seq": seq, "w": w, "h": h}, frame
+
+
+class DeltaDecoder:
+    """
+    DeltaEncoder 업로드를 복원하는 서버 측 디코더 (로컬 검증/스텁 서버용)
+
+    apply(name, header, arr) → 복원된 전체 프레임
+    기준 프레임(base)이 없거나 어긋나면 ValueError
+    키프레임은 seq 가 지금 기준보다 새로울 때만 기준을 바꾼다 (늦게 재전송된 키프레임은 복원만)
+    """
+
+    def __init__(self):
+        self._frames = {}  # name → (seq, frame)
+
+    def apply(self, name, header, arr):
+        if isinstance(header, (str, bytes)):
+            header = json.loads(header)
+        arr = np.asarray(arr, dtype=np.uint8)
+
+        current = self._frames.get(name)
+        if header["mode"] == "key":
+            frame = arr[:, :, :3].copy()
+            if current is not None and current[0] >= header["seq"]:
+                return frame
+        else:
+            if current is None or current[0] != header["base"]:
+                raise ValueError(f"{name}: missing base frame {header['base']}")
+            frame = apply_patch(current[1], header, arr)
+
+        self._frames[name] = (header["seq"], frame)
+        return frame
+
+
+def apply_patch(base, header, strip):
+    """기준 프레임에 패치 스트립을 덮어쓴 새 프레임"""
+    t = header["tile"]
+    h, w = header["h"], header["w"]
+    tiles = np.asarray(header["tiles"], dtype=np.intp).reshape(-1, 2)
+
+    padded = _pad(base, t).copy()
+    view = padded.reshape(padded.shape[0] // t, t, padded.shape[1] // t, t, 3).swapaxes(1, 2)
+    if len(tiles):
+        view[tiles[:, 0], tiles[:, 1]] = strip[:, :, :3].reshape(-1, t, t, 3)
+    return padded[:h, :w].copy()
+
+
+def _pad(frame, t):
+    h, w = frame.shape[:2]
+    ph, pw = -h % t, -w % t
+    if not ph and not pw:
+        return frame
+    return np.pad(frame, ((0, ph), (0, pw), (0, 0)), constant_values=WHITE)
+
+
+def _tiles(frame, t):
+    """(th, tw, t, t, 3) 타일 뷰"""
+    padded = _pad(frame, t)
+    return padded.reshape(padded.shape[0] // t, t, padded.shape[1] // t, t, 3).swapaxes(1, 2)
+
+
+def _tile_mask(diff, t):
+    """픽셀 차이 (h, w, 3) → 타일별 변경 여부 (th, tw)"""
+    diff = diff.any(axis=2)
+    h, w = diff.shape
+    diff = np.pad(diff, ((0, -h % t), (0, -w % t)))
+    return diff.reshape(diff.shape[0] // t, t, diff.shape[1] // t, t).any(axis=(1, 3))
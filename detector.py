@@ -0,0 +1,188 @@
+# detector.py
+import time
+
+import numpy as np
+
+from classifier import NONE
+
+# 아직 한 번도 읽지 않은 상태 (checkSignals 의 prev_color 초기값 None)
+UNSET = -2
+
+
+class SignalDetector:
+    """
+    대상별 신호 판정 상태 머신 (Qt / win32 없이)
+
+    팔레트 인덱스(SignalClassifier.classify 결과)를 받아 대상마다
+    - 디바운스: 새 (p0, p1) 이 debounce 번 연속 관측되고 hold 초 이상 유지돼야 확정
+      (debounce=1, hold=0 이면 바로 확정 → 한 프레임 깜빡임도 신호)
+      확정 전에 원래 값으로 돌아오면 아무 일도 없었던 것으로 (flickers)
+    - 봉: 확정된 p1 이 바뀔 때마다 그 대상의 봉 번호(bar) 증가 (p1 = 직전 봉 위치의 색)
+    - 중복 제거: 같은 봉에서 마지막으로 보낸 색과 같으면 무시 (duplicates)
+      → 봉이 바뀌면 같은 색도 다시 신호, 다른 색이면 같은 봉에서도 신호
+    - 쿨다운: 마지막 신호 뒤 cooldown 초 안의 신호는 확정을 미뤘다가 끝난 뒤에도 그대로면 신호
+    를 판정한다. checkSignals 의 send_color 처럼 대상 전체가 한 상태를 공유하지 않는다.
+
+    상태는 모두 대상 인덱스로 색인한 배열이고, 값이 바뀌었거나 확정 대기 중인 행만 판정한다.
+    """
+
+    def __init__(self, names, colors, debounce=1, hold=0.0, cooldown=0.0):
+        self.names = list(names)
+        self.colors = list(colors)
+        self.debounce = max(1, int(debounce))
+        self.hold = hold
+        self.cooldown = cooldown
+
+        n = len(self.names)
+        self.prev = np.full((n, 2), UNSET, dtype=np.intp)  # 확정된 (p0, p1)
+        self.cand = np.full((n, 2), UNSET, dtype=np.intp)  # 확정 대기 중인 (p0, p1)
+        self.seen = np.zeros(n, dtype=np.intp)  # cand 연속 관측 수
+        self.since = np.zeros(n)  # cand 처음 관측 시각
+        self.pending = np.zeros(n, dtype=bool)  # cand != prev
+        self.waiting = 0  # pending 인 대상 수
+        self.bar = np.zeros(n, dtype=np.intp)
+        self.sent_bar = np.full(n, -1, dtype=np.intp)
+        self.sent_color = np.full(n, NONE, dtype=np.intp)
+        self.sent_at = np.full(n, -np.inf)
+        self.version = 0  # 확정 상태(prev / bar / sent_*)가 바뀔 때마다 증가 (state 저장 판단)
+
+        self.signals = 0
+        self.flickers = 0
+        self.duplicates = 0
+        self.deferred = 0
+
+    def step(self, labels, indices=None, now=None):
+        """
+        (대상 수, 2) 팔레트 인덱스 → 이번 틱 신호 [(대상 인덱스, p0, p1), ...]
+
+        indices 를 주면 그 대상만 판정 (스케줄러가 이번 틱에 폴링하는 대상)
+        now 는 hold / cooldown 에 쓰는 시각 (기본 time.monotonic())
+        """
+        if indices is not None and not len(indices):
+            return []
+        labels = np.asarray(labels, dtype=np.intp).reshape(-1, 2)
+        if indices is None:
+            rows = np.flatnonzero((labels != self.cand).any(axis=1) | self.pending)
+        else:
+            indices = np.asarray(indices, dtype=np.intp)
+            rows = indices[(labels[indices] != self.cand[indices]).any(axis=1) | self.pending[indices]]
+        if not len(rows):
+            # 변화 없으면 아무 동작 안함
+            return []
+        now = time.monotonic() if now is None else now
+
+        # 새 후보면 처음부터 다시 셈 (대기 중이던 후보가 사라지면 깜빡임)
+        obs = labels[rows]
+        restart = (obs != self.cand[rows]).any(axis=1)
+        fresh = rows[restart]
+        self.flickers += int(self.pending[fresh].sum())
+        self.cand[fresh] = obs[restart]
+        self.seen[fresh] = 0
+        self.since[fresh] = now
+        self.seen[rows] += 1
+
+        differs = (self.cand[rows] != self.prev[rows]).any(axis=1)
+        ready = differs & (self.seen[rows] >= self.debounce) & (now - self.since[rows] >= self.hold)
+        self.pending[rows] = differs & ~ready
+
+        events = []
+        for i in rows[ready].tolist():
+            p0, p1 = self.cand[i].tolist()
+            bar = self.bar[i] + (p1 != self.prev[i, 1])
+            fire = p0 != NONE and not (self.sent_bar[i] == bar and self.sent_color[i] == p0)
+            if fire and now - self.sent_at[i] < self.cooldown:
+                # 쿨다운 중 → 확정을 미루고 다음 틱에 다시 판정
+                self.pending[i] = True
+                self.deferred += 1
+                continue
+
+            self.prev[i] = self.cand[i]
+            self.bar[i] = bar
+            self.version += 1
+            # p0이 지정 색이 아니면 skip, 같은 봉에서 이미 보낸 색이면 중복
+            if p0 == NONE:
+                continue
+            if not fire:
+                self.duplicates += 1
+                continue
+            self.sent_bar[i] = bar
+            self.sent_color[i] = p0
+            self.sent_at[i] = now
+            self.signals += 1
+            events.append((i, p0, p1))
+        self.waiting = int(self.pending.sum())
+        return events
+
+    def remap(self, table, colors):
+        """
+        팔레트 교체: 이전 인덱스 i → table[i] (없어진 색은 NONE) 로 상태를 옮기고 colors 로 바꿈
+        """
+        lookup = np.append(np.asarray(table, dtype=np.intp), [UNSET, NONE])
+        for state in (self.prev, self.cand, self.sent_color):
+            # NONE(-1) / UNSET(-2) 은 lookup 끝의 두 칸으로 그대로
+            state[...] = lookup[state]
+        self.colors = list(colors)
+        self.version += 1
+
+    def state(self):
+        """
+        확정 상태 → {대상 이름: {prev, bar, sent_bar, sent_color, sent_at}} (JSON 으로 쓸 수 있는 dict)
+
+        색은 팔레트 인덱스 대신 RGB (신호색 아니면 None) 로 남겨 팔레트 / 대상 순서가 바뀌어도 restore 가능.
+        아직 한 번도 읽지 않은 대상은 빠진다. sent_at 은 step 에 넘긴 now 기준 (core 는 time.time()).
+        """
+        out = {}
+        for i in np.flatnonzero(self.prev[:, 0] != UNSET).tolist():
+            sent_at = float(self.sent_at[i])
+            out[self.names[i]] = {
+                "prev": [self._rgb(v) for v in self.prev[i].tolist()],
+                "bar": int(self.bar[i]),
+                "sent_bar": int(self.sent_bar[i]),
+                "sent_color": self._rgb(int(self.sent_color[i])),
+                "sent_at": sent_at if np.isfinite(sent_at) else None,
+            }
+        return out
+
+    def restore(self, state):
+        """
+        state() 결과로 확정 상태를 되살린다 (감시 프로세스 재시작 인계, 복원한 대상 수 반환)
+
+        화면이 그대로면 다시 신호를 내지 않는다. 지금 팔레트에 없는 색이 있는 대상은 건너뜀 (새로 읽음).
+        """
+        index = {name: i for i, name in enumerate(self.names)}
+        lookup = {tuple(c): i for i, c in enumerate(self.colors)}
+        lookup[None] = NONE
+        restored = 0
+        for name, item in state.items():
+            i = index.get(name)
+            colors = [None if c is None else tuple(c) for c in item["prev"] + [item["sent_color"]]]
+            if i is None or any(c not in lookup for c in colors):
+                continue
+            p0, p1, sent = (lookup[c] for c in colors)
+            self.prev[i] = self.cand[i] = (p0, p1)
+            self.seen[i] = 0
+            self.pending[i] = False
+            self.bar[i] = item["bar"]
+            self.sent_bar[i] = item["sent_bar"]
+            self.sent_color[i] = sent
+            self.sent_at[i] = -np.inf if item["sent_at"] is None else item["sent_at"]
+            restored += 1
+        self.waiting = int(self.pending.sum())
+        self.version += 1
+        return restored
+
+    def _rgb(self, label):
+        return list(self.colors[label]) if label >= 0 else None
+
+    def color(self, label, default=(255, 255, 255)):
+        """팔레트 인덱스 → RGB 튜플 (신호색이 아니면 default)"""
+        return self.colors[label] if label >= 0 else default
+
+    def metrics(self):
+        return {
+            "signals": self.signals,
+            "flickers": self.flickers,
+            "duplicates": self.duplicates,
+            "deferred": self.deferred,
+            "pending": self.waiting,
+        }
@@ -0,0 +1,14 @@
+# endpoints.py
+import sys
+
+# 개발 모드 여부 확인
+IS_DEV = "--dev" in sys.argv
+
+if IS_DEV:
+    FASTAPI_URL = "http://buja.tim.pe.kr/dev/signal"
+    FASTAPI_URL_IMG = "http://buja.tim.pe.kr/dev/signalimg"
+    FASTAPI_URL_BATCH = "http://buja.tim.pe.kr/dev/signals"
+else:
+    FASTAPI_URL = "https://buja.tim.pe.kr/signal"
+    FASTAPI_URL_IMG = "https://buja.tim.pe.kr/signalimg"
+    FASTAPI_URL_BATCH = "https://buja.tim.pe.kr/signals"
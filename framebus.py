@@ -0,0 +1,143 @@
+# framebus.py
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# 헤더 (int64 8개): 최신 seq, 슬롯 수, 처음 h, 처음 w, 슬롯당 용량(바이트), 예약 3
+HEADER = 8
+LATEST, SLOTS, HEIGHT, WIDTH, CAPACITY = range(5)
+# 슬롯 테이블 (슬롯마다 int64/float64 8개): seq, 시각, 프레임 화면 좌표 left, top, 프레임 h, w,
+# 그 때의 창 좌상단 화면 좌표 x, y (소비자가 창 기준 좌표로 자르도록)
+SLOT_FIELDS = 8
+
+
+class FrameBus:
+    """
+    캡처 프레임을 여러 소비자(감지, 스냅샷, 녹화 ...)가 복사 없이 읽는 공유 메모리 링버퍼
+
+    - 생산자 하나가 publish() 로 슬롯에 순서대로 쓰고 seq 를 1씩 올림
+    - 소비자는 latest() / get(seq) 로 슬롯의 NumPy view 를 받음 (복사 없음)
+    - 슬롯은 slots 틱 뒤에 덮어써지므로, 오래 쓰는 소비자는 다 쓴 뒤 valid(seq) 로 확인
+      (쓰는 중인 슬롯은 seq 가 -1)
+    - 다른 프로세스는 FrameBus.attach(name) 으로 붙음
+    - 슬롯마다 프레임 크기를 따로 기록하므로 용량(headroom x 처음 크기) 안이면 크기가 바뀌어도 그대로 게시
+      (창을 DPI 배율이 다른 모니터로 옮겨 캡처 영역이 커져도 버스를 다시 만들지 않음)
+    """
+
+    def __init__(self, shape, slots=8, name=None, headroom=1.0, _shm=None):
+        h, w = int(shape[0]), int(shape[1])
+        if _shm is None:
+            capacity = int(h * w * 3 * headroom)
+            size = (HEADER + slots * SLOT_FIELDS) * 8 + slots * capacity
+            _shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self.owner = True
+        else:
+            self.owner = False
+        self.shm = _shm
+        self.name = _shm.name
+
+        buf = _shm.buf
+        self.header = np.ndarray((HEADER,), dtype=np.int64, buffer=buf)
+        if self.owner:
+            self.header[:] = 0
+            self.header[SLOTS], self.header[HEIGHT], self.header[WIDTH] = slots, h, w
+            self.header[CAPACITY] = capacity
+        self.slots = int(self.header[SLOTS])
+        self.capacity = int(self.header[CAPACITY])
+
+        offset = HEADER * 8
+        self.seqs = np.ndarray((self.slots,), dtype=np.int64, buffer=buf, offset=offset)
+        self.times = np.ndarray((self.slots,), dtype=np.float64, buffer=buf, offset=offset + self.slots * 8)
+        self.origins = np.ndarray((self.slots, 2), dtype=np.int64, buffer=buf, offset=offset + self.slots * 16)
+        self.shapes = np.ndarray((self.slots, 2), dtype=np.int64, buffer=buf, offset=offset + self.slots * 32)
+        self.windows = np.ndarray((self.slots, 2), dtype=np.int64, buffer=buf, offset=offset + self.slots * 48)
+        offset += self.slots * SLOT_FIELDS * 8
+        self.frames = np.ndarray((self.slots, self.capacity), dtype=np.uint8, buffer=buf, offset=offset)
+        if self.owner:
+            self.seqs[:] = 0
+            self.shapes[:] = (h, w)
+
+    @classmethod
+    def create(cls, shape, name, slots=8, headroom=1.0):
+        """name 으로 새로 만듦 (이전 실행이 비정상 종료해 남은 같은 이름은 지우고)"""
+        try:
+            return cls(shape, slots, name, headroom)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            return cls(shape, slots, name, headroom)
+
+    @classmethod
+    def attach(cls, name):
+        shm = shared_memory.SharedMemory(name=name)
+        header = np.ndarray((HEADER,), dtype=np.int64, buffer=shm.buf)
+        shape = (int(header[HEIGHT]), int(header[WIDTH]))
+        del header
+        return cls(shape, _shm=shm)
+
+    @property
+    def shape(self):
+        """최신 프레임 크기 (아직 없으면 처음 크기)"""
+        h, w = self.shapes[max(self.seq, 0) % self.slots]
+        return int(h), int(w)
+
+    def fits(self, shape):
+        return int(shape[0]) * int(shape[1]) * 3 <= self.capacity
+
+    def origin(self, seq):
+        """seq 프레임 좌상단의 화면 좌표"""
+        left, top = self.origins[seq % self.slots]
+        return int(left), int(top)
+
+    def window(self, seq):
+        """seq 프레임을 캡처할 때의 창 좌상단 화면 좌표"""
+        x, y = self.windows[seq % self.slots]
+        return int(x), int(y)
+
+    @property
+    def seq(self):
+        return int(self.header[LATEST])
+
+    def publish(self, frame, t, origin=(0, 0), window=(0, 0)):
+        """프레임을 다음 슬롯에 복사하고 seq 반환 (생산자만 호출, origin / window 는 프레임 / 창의 화면 좌표)"""
+        h, w = frame.shape[:2]
+        if not self.fits((h, w)):
+            raise ValueError(f"frame {h}x{w} exceeds bus slot capacity {self.capacity} bytes")
+        seq = int(self.header[LATEST]) + 1
+        i = seq % self.slots
+        self.seqs[i] = -1
+        self.frames[i, :h * w * 3].reshape(h, w, 3)[...] = frame
+        self.times[i] = t
+        self.origins[i] = origin
+        self.shapes[i] = (h, w)
+        self.windows[i] = window
+        self.seqs[i] = seq
+        self.header[LATEST] = seq
+        return seq
+
+    def get(self, seq):
+        """seq 프레임의 (시각, view), 이미 덮어써졌으면 None"""
+        i = seq % self.slots
+        if seq <= 0 or self.seqs[i] != seq:
+            return None
+        h, w = self.shapes[i].tolist()
+        return float(self.times[i]), self.frames[i, :h * w * 3].reshape(h, w, 3)
+
+    def latest(self):
+        """(seq, 시각, view) — 아직 프레임이 없으면 (0, 0.0, None)"""
+        seq = self.seq
+        got = self.get(seq)
+        if got is None:
+            return 0, 0.0, None
+        return (seq,) + got
+
+    def valid(self, seq):
+        return self.seqs[seq % self.slots] == seq
+
+    def close(self):
+        # view 가 남아 있으면 shm.close() 가 실패하므로 먼저 놓음
+        self.header = self.seqs = self.times = self.origins = self.shapes = self.windows = self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,146 @@
+# framerec.py
+import json
+import os
+import zlib
+
+import numpy as np
+
+META_FILE = "meta.json"
+FRAMES_FILE = "frames.bin"
+INDEX_FILE = "index.bin"
+TICKS_FILE = "ticks.bin"
+
+# ticks.bin 한 행: (시각, frames.bin 안의 프레임 번호)
+TICK_DTYPE = np.dtype([("t", "<f8"), ("frame", "<u4")])
+# index.bin 한 행: frames.bin 안의 압축 프레임 (시작 바이트, 길이)
+INDEX_DTYPE = np.dtype([("offset", "<u8"), ("size", "<u4")])
+# 차트 프레임은 대부분 흰 배경이라 zlib 1 로도 수십 배 줄고, 바뀐 프레임 하나에 1ms 안팎
+COMPRESS_LEVEL = 1
+FLUSH_SEC = 1.0  # 이 간격(녹화 시각 기준)마다 디스크로 (비정상 종료 직전까지 남도록)
+
+
+class FrameRecorder:
+    """
+    캡처 영역 프레임을 시각과 함께 디스크에 기록하는 레코더 (재현용)
+
+    - 직전 프레임과 같으면 프레임은 다시 쓰지 않고 틱만 기록 (차트는 대부분 그대로라 크게 줄어듦)
+    - frames.bin : 바뀐 프레임만 (h, w, 3) uint8 을 zlib 으로 압축해 이어붙임
+    - index.bin  : 압축 프레임마다 (시작 바이트, 길이) → FrameReader 가 frames.bin 을 memmap 으로 열고
+                   필요한 프레임만 풀어 읽음
+    - ticks.bin  : 틱마다 (시각, 프레임 번호)
+    - meta.json  : 프레임 크기, 캡처 bbox, 대상/팔레트 등 재생에 필요한 정보
+    - flush_interval 초마다 frames → index → ticks 순서로 flush (강제 종료돼도 그 직전까지 재생 가능)
+    """
+
+    def __init__(self, directory, meta=None, flush_interval=FLUSH_SEC):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.meta = dict(meta or {}, compression="zlib")
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.ticks = 0
+        self._last = None
+        self._offset = 0
+        self._next_flush = None
+        self._frames = open(os.path.join(directory, FRAMES_FILE), "wb")
+        self._index = open(os.path.join(directory, INDEX_FILE), "wb")
+        self._ticks = open(os.path.join(directory, TICKS_FILE), "wb")
+
+    def record(self, frame, t):
+        if self._last is None:
+            self.meta["shape"] = list(frame.shape)
+            self._write_meta()
+        elif frame.shape != self._last.shape:
+            raise ValueError("frame shape changed during recording")
+
+        if self._last is None or not np.array_equal(frame, self._last):
+            self._last = np.array(frame, dtype=np.uint8)
+            data = zlib.compress(self._last.tobytes(), COMPRESS_LEVEL)
+            self._frames.write(data)
+            self._index.write(np.array((self._offset, len(data)), dtype=INDEX_DTYPE).tobytes())
+            self._offset += len(data)
+            self.count += 1
+
+        self._ticks.write(np.array((t, self.count - 1), dtype=TICK_DTYPE).tobytes())
+        self.ticks += 1
+        if self._next_flush is None:
+            self._next_flush = t + self.flush_interval
+        elif t >= self._next_flush:
+            self._next_flush = t + self.flush_interval
+            self.flush()
+
+    def flush(self):
+        # 틱이 아직 디스크에 없는 프레임을 가리키지 않도록 프레임부터
+        self._frames.flush()
+        self._index.flush()
+        self._ticks.flush()
+
+    def close(self):
+        self.flush()
+        self._frames.close()
+        self._index.close()
+        self._ticks.close()
+
+    def _write_meta(self):
+        with open(os.path.join(self.directory, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=4, ensure_ascii=False)
+
+
+class CompressedFrames:
+    """frames.bin(memmap) + index.bin → frames[i] 로 i 번째 프레임을 풀어 주는 시퀀스 (직전 하나 캐시)"""
+
+    def __init__(self, frames_path, index_path, shape):
+        n = os.path.getsize(index_path) // INDEX_DTYPE.itemsize
+        index = np.fromfile(index_path, dtype=INDEX_DTYPE, count=n)
+        size = os.path.getsize(frames_path)
+        # 강제 종료로 프레임 데이터가 덜 써졌으면 그 앞까지만
+        self.index = index[index["offset"] + index["size"] <= size]
+        self.data = np.memmap(frames_path, dtype=np.uint8, mode="r") if size else np.zeros(0, np.uint8)
+        self.shape = shape
+        self._cached = (None, None)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        if self._cached[0] == i:
+            return self._cached[1]
+        offset, size = self.index[i].tolist()
+        raw = zlib.decompress(self.data[offset:offset + size])
+        frame = np.frombuffer(raw, dtype=np.uint8).reshape(self.shape)
+        self._cached = (i, frame)
+        return frame
+
+
+class FrameReader:
+    """
+    FrameRecorder 기록을 읽는 리더 (압축 전 녹화는 frames.bin 을 그대로 memmap)
+
+    강제 종료된 녹화는 디스크에 남은 프레임까지의 틱만 읽는다.
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        shape = tuple(self.meta["shape"])
+        frames_path = os.path.join(directory, FRAMES_FILE)
+        if self.meta.get("compression") == "zlib":
+            self.frames = CompressedFrames(frames_path, os.path.join(directory, INDEX_FILE), shape)
+        else:
+            count = os.path.getsize(frames_path) // int(np.prod(shape))
+            self.frames = np.memmap(frames_path, dtype=np.uint8, mode="r", shape=(count,) + shape)
+
+        ticks_path = os.path.join(directory, TICKS_FILE)
+        n = os.path.getsize(ticks_path) // TICK_DTYPE.itemsize
+        ticks = np.fromfile(ticks_path, dtype=TICK_DTYPE, count=n)
+        self.ticks = ticks[ticks["frame"] < len(self.frames)]
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def __iter__(self):
+        """(시각, 프레임) 순서대로"""
+        frames = self.frames
+        for t, i in self.ticks.tolist():
+            yield t, frames[i]
@@ -0,0 +1,79 @@
+# gate.py
+import numpy as np
+
+
+class RegionGate:
+    """
+    대상별 프로브 주변 영역이 바뀌었는지 보는 변화 감지 게이트
+
+    - 대상마다 (x0,y0), (x1,y1) 중심 size x size 영역을 캡처 버퍼 인덱스로 미리 계산
+      (size=1 이면 프로브 픽셀만, 크게 하면 주변 다시 그리기도 잡지만 그만큼 느려짐)
+      offsets([(dy, dx), ...]) 를 주면 그 위치만 (분류기 커널과 같은 샘플을 지켜보도록)
+    - 픽셀을 RGB → uint32 로 묶은 서명을 직전 틱과 비교 (손실 없는 서명이라 충돌 없음)
+    - 바뀌지 않은 대상은 분류/상태 갱신을 건너뛴다 (판정 결과는 같음)
+    """
+
+    def __init__(self, targets, bbox, size=1, offsets=None):
+        if offsets is None:
+            s = size // 2
+            dy, dx = np.mgrid[-s:size - s, -s:size - s]
+            dy, dx = dy.ravel(), dx.ravel()
+        else:
+            dy, dx = np.asarray(offsets, dtype=np.intp).reshape(-1, 2).T
+
+        left, top = bbox[0], bbox[1]
+        xs, ys = [], []
+        for t in targets:
+            xs.append(np.concatenate([t["x0"] + dx, t["x1"] + dx]) - left)
+            ys.append(np.concatenate([t["y0"] + dy, t["y1"] + dy]) - top)
+        self.xs = np.array(xs, dtype=np.intp).reshape(len(targets), -1)
+        self.ys = np.array(ys, dtype=np.intp).reshape(len(targets), -1)
+        # 버퍼 밖 좌표는 가장자리로 (bbox 크기 기준)
+        self.xs = self.xs.clip(0, bbox[2] - left - 1)
+        self.ys = self.ys.clip(0, bbox[3] - top - 1)
+
+        self._last = None
+        self.checks = 0
+        self.skips = 0
+
+    def signature(self, frame):
+        """(대상 수, 영역 픽셀 수) uint32 서명"""
+        px = frame[self.ys, self.xs].astype(np.uint32)
+        return (px[..., 0] << 16) | (px[..., 1] << 8) | px[..., 2]
+
+    def changed(self, frame, indices=None):
+        """
+        직전 호출 이후 영역이 바뀐 대상 인덱스 배열
+
+        indices 를 주면 그 대상만 비교 (나머지는 서명도 갱신하지 않음)
+        """
+        sig = self.signature(frame)
+        n = len(sig) if indices is None else len(indices)
+        self.checks += n
+
+        if self._last is None:
+            self._last = sig
+            out = np.arange(len(sig)) if indices is None else np.asarray(indices, dtype=np.intp)
+            return out
+
+        if indices is None:
+            diff = np.flatnonzero((sig != self._last).any(axis=1))
+            self._last[diff] = sig[diff]
+        else:
+            indices = np.asarray(indices, dtype=np.intp)
+            diff = indices[(sig[indices] != self._last[indices]).any(axis=1)]
+            self._last[diff] = sig[diff]
+
+        self.skips += n - len(diff)
+        return diff
+
+    def reset(self):
+        """다음 호출은 전체 대상을 바뀐 것으로"""
+        self._last = None
+
+    def metrics(self):
+        return {
+            "checks": self.checks,
+            "skips": self.skips,
+            "skip_rate": self.skips / self.checks if self.checks else 0.0,
+        }
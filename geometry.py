@@ -0,0 +1,97 @@
+# geometry.py
+import time
+
+
+class WindowTracker:
+    """
+    대상 창의 위치/크기/DPI 배율을 캐시하는 추적기
+
+    - poll() 은 매 틱 호출해도 되며, refresh 초가 지났을 때만 provider 를 부름 (틱마다 win32 호출 없음)
+    - 창이 움직이거나 배율이 바뀌면 listeners 에 (origin, scale) 을 알림
+    - 창을 잃으면(닫힘/재시작) 다음 갱신 때 다시 찾음
+    - provider: find(title) → 핸들 또는 None, rect(핸들) → (x, y, w, h), scale(핸들) → 배율
+      (Windows 는 winutil.Win32WindowProvider, 리눅스 시험은 FakeWindowProvider)
+    """
+
+    def __init__(self, provider, title, refresh=1.0):
+        self.provider = provider
+        self.title = title
+        self.refresh_interval = refresh
+        self.handle = None
+        self.rect = None
+        self.scale = 1.0
+        self.listeners = []
+        self.calls = 0
+        self.moves = 0
+        self._next = 0.0
+
+    @property
+    def origin(self):
+        return (self.rect[0], self.rect[1]) if self.rect else (0, 0)
+
+    def poll(self, now=None):
+        """갱신 주기가 됐으면 refresh(), 바뀌었으면 True"""
+        now = time.monotonic() if now is None else now
+        if now < self._next:
+            return False
+        self._next = now + self.refresh_interval
+        return self.refresh()
+
+    def refresh(self):
+        """provider 에서 창 위치를 다시 읽고, 바뀌었으면 listeners 호출 후 True"""
+        self.calls += 1
+        try:
+            if self.handle is None:
+                self.handle = self.provider.find(self.title)
+                if self.handle is None:
+                    return False
+            rect = tuple(self.provider.rect(self.handle))
+            scale = float(self.provider.scale(self.handle))
+        except Exception:
+            # 창이 사라짐 → 다음에 다시 찾기
+            self.handle = None
+            return False
+
+        if rect == self.rect and scale == self.scale:
+            return False
+
+        moved = self.rect is not None
+        self.rect, self.scale = rect, scale
+        self.moves += moved
+        for listener in self.listeners:
+            listener(self.origin, self.scale)
+        return True
+
+
+class FakeWindowProvider:
+    """테스트/헤드리스용 가짜 창 (move / set_scale / close 로 상황 재현)"""
+
+    def __init__(self, rect=(0, 0, 1920, 1080), scale=1.0, title="buja chart"):
+        self.title = title
+        self._rect = tuple(rect)
+        self._scale = scale
+        self.alive = True
+        self.calls = 0
+
+    def move(self, x, y):
+        self._rect = (x, y) + self._rect[2:]
+
+    def set_scale(self, scale):
+        self._scale = scale
+
+    def close(self):
+        self.alive = False
+
+    def find(self, title):
+        self.calls += 1
+        return 1 if self.alive and title.lower() in self.title.lower() else None
+
+    def rect(self, handle):
+        self.calls += 1
+        if not self.alive:
+            raise RuntimeError("window closed")
+        return self._rect
+
+    def scale(self, handle):
+        return self._scale
+
@@ -0,0 +1,232 @@
+# grabber.py
+import os
+import time
+
+import numpy as np
+
+WHITE = (255, 255, 255)
+
+
+class MssGrabber:
+    """
+    mss 핸들 하나를 재사용하는 화면 캡처기
+
+    grab() 은 (h, w, 3) RGB uint8 배열을 반환한다.
+    mss 핸들은 만든 스레드에서만 써야 하므로 캡처 루프 스레드에서 사용할 것.
+    """
+
+    def __init__(self):
+        self._sct = None
+
+    def grab(self, left, top, width, height):
+        if self._sct is None:
+            import mss
+            self._sct = mss.mss()
+
+        img = self._sct.grab(
+            {"left": int(left), "top": int(top), "width": int(width), "height": int(height)}
+        )
+        arr = np.frombuffer(img.raw, dtype=np.uint8).reshape(img.height, img.width, 4)
+
+        # BGRA → RGB (복사 없이 view)
+        return arr[:, :, 2::-1]
+
+    def close(self):
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+
+class ArrayGrabber:
+    """
+    메모리 상의 '가상 화면' 배열에서 캡처하는 캡처기 (파일/합성 프레임용)
+
+    Windows 데스크탑 없이(리눅스 서버 등) 엔진과 벤치마크를 돌리기 위해 사용.
+    화면 밖 영역은 흰색으로 채운다.
+    """
+
+    def __init__(self, screen):
+        self.screen = np.ascontiguousarray(screen, dtype=np.uint8)
+
+    @classmethod
+    def blank(cls, width, height, color=WHITE):
+        screen = np.empty((height, width, 3), dtype=np.uint8)
+        screen[:] = color
+        return cls(screen)
+
+    @classmethod
+    def load(cls, path):
+        """.npy 또는 이미지 파일(png 등)에서 화면 배열을 읽는다."""
+        if os.path.splitext(path)[1].lower() == ".npy":
+            return cls(np.load(path))
+
+        from PIL import Image
+        with Image.open(path) as img:
+            return cls(np.asarray(img.convert("RGB")))
+
+    def paint(self, x, y, color, size=1):
+        """(x, y) 를 중심으로 size x size 크기를 color 로 칠한다."""
+        s = size // 2
+        self.screen[max(0, y - s):y - s + size, max(0, x - s):x - s + size] = color
+
+    def grab(self, left, top, width, height):
+        left, top, width, height = int(left), int(top), int(width), int(height)
+        sh, sw = self.screen.shape[:2]
+
+        out = np.empty((height, width, 3), dtype=np.uint8)
+        out[:] = WHITE
+
+        x0, y0 = max(0, left), max(0, top)
+        x1, y1 = min(sw, left + width), min(sh, top + height)
+        if x0 < x1 and y0 < y1:
+            out[y0 - top:y1 - top, x0 - left:x1 - left] = self.screen[y0:y1, x0:x1]
+        return out
+
+    def close(self):
+        pass
+
+
+class FakeGrabber(ArrayGrabber):
+    """
+    ArrayGrabber 에 캡처 기록을 더한 가짜 캡처기 (Windows 없이 color.PointSampler 등을 확인)
+
+    calls: grab 호출 수, pixels: 읽은 픽셀 수, rects: 마지막 grab 영역들 (reset 으로 비움)
+    """
+
+    def __init__(self, screen):
+        super().__init__(screen)
+        self.calls = 0
+        self.pixels = 0
+        self.rects = []
+
+    def grab(self, left, top, width, height):
+        self.calls += 1
+        self.pixels += int(width) * int(height)
+        self.rects.append((int(left), int(top), int(width), int(height)))
+        return super().grab(left, top, width, height)
+
+    def reset(self):
+        self.calls = 0
+        self.pixels = 0
+        self.rects = []
+
+
+class CaptureEngine:
+    """
+    틱당 한 번만 화면을 캡처하는 엔진
+
+    - 모든 프로브 좌표(target.json 의 x0,y0 / x1,y1)의 합집합 bbox 를 한 번 캡처
+    - getPixel / 디버그 크롭은 모두 그 버퍼에서 읽음
+    - 좌표는 모두 Buja Chart 창 기준 상대 좌표, origin 은 창의 화면 좌표
+    - bus(framebus.FrameBus) 가 있으면 캡처한 프레임을 공유 메모리에도 게시
+    """
+
+    def __init__(self, grabber, points, margin=0, bus=None):
+        self.grabber = grabber
+        self.origin = (0, 0)
+        self.frame = None
+        self.bus = bus
+        self.set_points(points, margin)
+
+    def set_points(self, points, margin=0):
+        """프로브 좌표 목록으로 캡처 bbox(창 기준) 를 다시 계산한다."""
+        if not points:
+            self.bbox = (0, 0, 1, 1)
+            return
+
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        left = min(xs) - margin
+        top = min(ys) - margin
+        right = max(xs) + margin + 1
+        bottom = max(ys) + margin + 1
+        self.bbox = (left, top, right, bottom)
+
+    def set_origin(self, wx, wy):
+        self.origin = (wx, wy)
+
+    def tick(self):
+        """합집합 영역을 한 번 캡처해 버퍼를 갱신한다."""
+        left, top, right, bottom = self.bbox
+        ox, oy = self.origin
+        self.frame = self.grabber.grab(ox + left, oy + top, right - left, bottom - top)
+        if self.bus is not None:
+            # 다른 소비자(프로세스)도 같은 프레임을 쓰도록 공유 메모리에 게시
+            self.bus.publish(self.frame, time.time(), (ox + left, oy + top), (ox, oy))
+        return self.frame
+
+    def pixel(self, x, y):
+        """창 기준 (x, y) 의 RGB 튜플"""
+        r, g, b = self.frame[y - self.bbox[1], x - self.bbox[0]]
+        return (int(r), int(g), int(b))
+
+    def crop(self, x, y, w, h):
+        """창 기준 (x, y, w, h) 영역 (버퍼 밖은 잘림)"""
+        left, top, right, bottom = self.bbox
+        x0, y0 = max(x, left) - left, max(y, top) - top
+        x1, y1 = min(x + w, right) - left, min(y + h, bottom) - top
+        return self.frame[y0:y1, x0:x1]
+
+    def close(self):
+        self.grabber.close()
+
+
+class FileGrabber(ArrayGrabber):
+    """
+    이미지/.npy 파일을 화면으로 쓰는 캡처기 (리눅스 헤드리스 실행용)
+
+    다른 프로세스가 스크린샷 파일을 갱신하면 grab() 때 다시 읽는다 (mtime 비교).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._mtime = None
+        self._reload()
+
+    def _reload(self):
+        mtime = os.path.getmtime(self.path)
+        if mtime != self._mtime:
+            self.screen = ArrayGrabber.load(self.path).screen
+            self._mtime = mtime
+
+    def grab(self, left, top, width, height):
+        try:
+            self._reload()
+        except OSError:
+            pass  # 쓰는 중이면 이전 화면 사용
+        return super().grab(left, top, width, height)
+
+
+class BusGrabber:
+    """
+    FrameBus 의 최신 프레임에서 잘라 주는 캡처기 (화면을 다시 캡처하지 않음)
+
+    요청 좌표는 생산자 창 기준 (target.json 그대로) — 슬롯에 기록된 창 좌표로 옮기므로
+    생산자 창이 움직여도 소비자는 origin 을 몰라도 된다.
+    요청 영역이 버스 프레임 안이면 복사 없는 view, 벗어나면 흰색으로 채운 복사본.
+    seq 는 마지막으로 읽은 프레임 번호 (같은 프레임이면 새 프레임 아님).
+    """
+
+    def __init__(self, bus):
+        self.bus = bus
+        self.seq = 0
+
+    def grab(self, left, top, width, height):
+        seq, _, frame = self.bus.latest()
+        self.seq = seq
+        left, top, width, height = int(left), int(top), int(width), int(height)
+        if frame is None:
+            out = np.empty((height, width, 3), dtype=np.uint8)
+            out[:] = WHITE
+            return out
+
+        ox, oy = self.bus.origin(seq)
+        wx, wy = self.bus.window(seq)
+        x, y = left - (ox - wx), top - (oy - wy)
+        fh, fw = frame.shape[:2]
+        if 0 <= x and 0 <= y and x + width <= fw and y + height <= fh:
+            return frame[y:y + height, x:x + width]
+        return ArrayGrabber(frame).grab(x, y, width, height)
+
+    def close(self):
+        pass
@@ -0,0 +1,110 @@
+# layout.py
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+# probes 축 순서
+P0, P1 = 0, 1
+X, Y = 0, 1
+
+
+class TargetLayout:
+    """
+    target.json + config.json 을 정수 ID 로 색인한 배열 테이블로 컴파일
+
+    - 대상 i 의 이름/ROI/프로브 좌표를 모두 같은 i 로 찾음 (틱마다 dict/문자열 조회 없음)
+    - probes : (N, 2, 2) 창 기준 프로브 좌표 [대상, p0/p1, x/y] (배율 반영)
+    - rois   : (N, 4) 스냅샷 ROI x, y, w, h (config.json 에 없는 대상은 -1)
+    - keys   : 디버그 크롭 키 "<이름>_p0", "<이름>_p1" 을 대상 순서로 편 튜플 (미리 만든 문자열)
+    - bind(bbox) 로 캡처 버퍼 기준 인덱스(xs, ys)와 디버그 크롭 인덱스를 한 번 계산
+    - 창 배율이 바뀌면 scaled() 로 새 테이블을 만든다 (시작 / 배율 변경 때만)
+    """
+
+    def __init__(self, targets, config=(), scale=1.0):
+        self.base_targets = list(targets)
+        self.config = list(config)
+        self.scale = scale
+        self.names = [t["name"] for t in self.base_targets]
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.keys = tuple(name + suffix for name in self.names for suffix in ("_p0", "_p1"))
+
+        n = len(self.names)
+        base = np.array([[[t["x0"], t["y0"]], [t["x1"], t["y1"]]] for t in self.base_targets],
+                        dtype=np.intp).reshape(n, 2, 2)
+        self.probes = np.rint(base * scale).astype(np.intp) if scale != 1.0 else base
+
+        self.rois = np.full((n, 4), -1, dtype=np.intp)
+        for item in self.config:
+            i = self.ids.get(item["name"])
+            if i is not None:
+                self.rois[i] = [item["x"], item["y"], item["w"], item["h"]]
+        if scale != 1.0:
+            has = self.rois[:, 2] >= 0
+            self.rois[has] = np.rint(self.rois[has] * scale).astype(np.intp)
+
+        self.bbox = None
+        self.xs = self.ys = None
+        self._crop = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def scaled(self, scale):
+        """같은 target.json / config.json 을 배율 scale 로 다시 컴파일"""
+        return TargetLayout(self.base_targets, self.config, scale)
+
+    @property
+    def targets(self):
+        """배율 반영한 target.json 형식 목록 (녹화 meta / 하위 호환용)"""
+        return [
+            dict(t, x0=int(p[P0, X]), y0=int(p[P0, Y]), x1=int(p[P1, X]), y1=int(p[P1, Y]))
+            for t, p in zip(self.base_targets, self.probes)
+        ]
+
+    def points(self):
+        """캡처 영역 계산용 프로브 좌표 [(x, y), ...] (p0 전체, p1 전체 순)"""
+        return [tuple(p) for p in self.probes[:, P0].tolist()] + \
+            [tuple(p) for p in self.probes[:, P1].tolist()]
+
+    def roi_points(self):
+        """ROI 가 있는 대상의 좌상단 / 우하단 좌표 (ROI 까지 캡처 영역에 넣을 때)"""
+        points = []
+        for x, y, w, h in self.rois[self.rois[:, 2] >= 0].tolist():
+            points += [(x, y), (x + w - 1, y + h - 1)]
+        return points
+
+    def roi(self, i):
+        """대상 i 의 (x, y, w, h), 없으면 None"""
+        x, y, w, h = self.rois[i].tolist()
+        return None if w < 0 else (x, y, w, h)
+
+    def bind(self, bbox):
+        """캡처 버퍼(bbox = 창 기준 left, top, right, bottom) 기준 인덱스 계산"""
+        self.bbox = tuple(bbox)
+        self.xs = self.probes[..., X] - bbox[0]
+        self.ys = self.probes[..., Y] - bbox[1]
+        self._crop = None
+        return self
+
+    def crops(self, frame, size):
+        """
+        모든 프로브의 디버그 크롭을 한 번에 → (N * 2, size*2, size*2, 3) (keys 순서)
+
+        프로브 - size//2 부터 size*2 칸.
+        버퍼 가장자리에 걸리면 버퍼 안쪽으로 밀어서 자름 (margin 을 size*2 이상 주면 생기지 않음).
+        프레임 위의 (y, x) 별 창 view 에서 좌상단 인덱스로 한 번에 복사한다.
+        """
+        side = size * 2
+        h, w = frame.shape[:2]
+        if h < side or w < side:
+            frame = np.pad(frame, ((0, max(0, side - h)), (0, max(0, side - w)), (0, 0)), mode="edge")
+            h, w = frame.shape[:2]
+        if self._crop is None or self._crop[0] != (size, h, w):
+            top = self.ys.ravel() - size // 2
+            left = self.xs.ravel() - size // 2
+            self._crop = ((size, h, w), top.clip(0, h - side), left.clip(0, w - side))
+        _, top, left = self._crop
+
+        sy, sx, sc = frame.strides
+        windows = as_strided(frame, (h - side + 1, w - side + 1, side, side, 3),
+                             (sy, sx, sy, sx, sc), writeable=False)
+        return windows[top, left]
@@ -0,0 +1,119 @@
+# logview.py
+import collections
+import json
+import logging
+import os
+import re
+import time
+from logging.handlers import RotatingFileHandler
+
+# "[0117 101010] ..." 처럼 앞에 붙은 시각은 중복 판단에서 뺀다
+_STAMP = re.compile(r"^\[[0-9 :\-]+\]\s*")
+
+
+class _JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 하나 (time, level, msg + extra 필드)"""
+
+    def format(self, record):
+        out = {"time": record.created, "level": record.levelname.lower(), "msg": record.getMessage()}
+        out.update(getattr(record, "fields", {}))
+        return json.dumps(out, ensure_ascii=False)
+
+
+class LogBuffer:
+    """
+    오래 켜 두는 세션용 로그 (Qt 없이 동작, UI 는 drain() 결과만 붙임)
+
+    - write() 는 메모리 큐에 넣기만 함 → UI 는 타이머로 drain() 해 한 번에 붙임 (메시지마다 갱신 없음)
+    - 큐는 max_lines 까지만 (UI 가 못 따라오면 오래된 줄부터 버리고 dropped 로 셈)
+    - 같은 key(기본: 앞 시각을 뺀 메시지)가 처음 보인 뒤 dup_window 초 안에 또 나오면 세기만 하고
+      창이 끝나면 "같은 메시지 N회 반복" 한 줄로 요약 (전송 실패 폭주 등)
+      → 폭주가 계속돼도 key 하나당 dup_window 마다 최대 두 줄
+    - path 를 주면 JSON lines 파일로도 기록, max_bytes 넘으면 backups 개까지 .1 .2 ... 로 교체
+      (파일에는 억제한 반복도 suppressed: true 로 모두 남김 — 장애 중 어떤 대상이 실패했는지 추적)
+    - echo=True 면 표준 출력에도 (요약 규칙 동일)
+    """
+
+    def __init__(self, path=None, max_lines=2000, dup_window=5.0, max_bytes=5 << 20, backups=5,
+                 echo=True):
+        self.dup_window = dup_window
+        self.echo = echo
+        self.lines = collections.deque(maxlen=max_lines)
+        self.written = 0
+        self.suppressed = 0
+        self.dropped = 0
+        self._repeats = {}  # key → [처음 보인 시각, 억제한 수, 마지막 메시지, level]
+
+        self.logger = None
+        if path is not None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                          encoding="utf-8")
+            handler.setFormatter(_JsonFormatter())
+            self.logger = logging.getLogger(f"bujasignal.{os.path.abspath(path)}")
+            self.logger.propagate = False
+            self.logger.setLevel(logging.INFO)
+            self.logger.handlers[:] = [handler]
+
+    def write(self, msg, level="info", key=None, now=None, **fields):
+        """메시지 하나 기록 (반복이면 세기만 하고 False)"""
+        now = time.monotonic() if now is None else now
+        key = _STAMP.sub("", msg) if key is None else key
+        repeat = self._repeats.get(key)
+        if repeat is not None and now - repeat[0] < self.dup_window:
+            repeat[1] += 1
+            repeat[2] = msg
+            self.suppressed += 1
+            self._record(msg, level, dict(fields, suppressed=True))
+            return False
+
+        if repeat is not None:
+            self._summarize(key, repeat)
+        self._repeats[key] = [now, 0, msg, level]
+        self._emit(msg, level, fields)
+        return True
+
+    def tick(self, now=None):
+        """dup_window 가 지난 key 를 요약 줄로 정리 (drain 전에 호출)"""
+        now = time.monotonic() if now is None else now
+        for key, repeat in list(self._repeats.items()):
+            if now - repeat[0] >= self.dup_window:
+                self._summarize(key, repeat)
+                del self._repeats[key]
+
+    def drain(self):
+        """UI 에 붙일 줄 목록 (비움)"""
+        lines = list(self.lines)
+        self.lines.clear()
+        return lines
+
+    def _summarize(self, key, repeat):
+        _, count, last, level = repeat
+        if count:
+            self._emit(f"  └ 같은 메시지 {count}회 반복 (마지막: {last})", level, {"repeat": count})
+
+    def _emit(self, msg, level, fields):
+        if len(self.lines) == self.lines.maxlen:
+            self.dropped += 1
+        self.lines.append(msg)
+        self.written += 1
+        if self.echo:
+            print(msg)
+        self._record(msg, level, fields)
+
+    def _record(self, msg, level, fields):
+        if self.logger is not None:
+            self.logger.log(logging.getLevelName(level.upper()), msg, extra={"fields": fields})
+
+    def metrics(self):
+        return {"written": self.written, "suppressed": self.suppressed, "dropped": self.dropped,
+                "pending": len(self.lines), "repeating": len(self._repeats)}
+
+    def close(self):
+        for key, repeat in list(self._repeats.items()):
+            self._summarize(key, repeat)
+        self._repeats.clear()
+        if self.logger is not None:
+            for handler in self.logger.handlers:
+                handler.close()
+            self.logger.handlers[:] = []
@@ -1,43 +1,78 @@
 import json
-import io
 import os
 import sys
 import time
 import threading
-import requests
-from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QTextEdit, QVBoxLayout
+from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QPlainTextEdit, QVBoxLayout
 from PyQt5.QtCore import QTimer, Qt
-from PIL import ImageGrab
+import numpy as np
 
 from datetime import datetime
 import win32gui
 import win32con
 
-
-
-
-# 개발 모드 여부 확인
-IS_DEV = "--dev" in sys.argv
-
-if IS_DEV:
-    FASTAPI_URL = "http://buja.tim.pe.kr/dev/signal"
-    FASTAPI_URL_IMG = "http://buja.tim.pe.kr/dev/signalimg"
-else:
-    FASTAPI_URL = "https://buja.tim.pe.kr/signal"
-    FASTAPI_URL_IMG = "https://buja.tim.pe.kr/signalimg"
+from core import (METRICS_FILE, PROBE_KERNEL, SIGNAL_COOLDOWN_SEC, SIGNAL_DEBOUNCE, SIGNAL_HOLD_SEC,
+                  WHITE, DetectionCore)
+from debug_recorder import DebugRecorder
+from delta import DeltaEncoder
+from endpoints import FASTAPI_URL, FASTAPI_URL_BATCH, FASTAPI_URL_IMG
+from framebus import FrameBus
+from framerec import FrameRecorder
+from geometry import WindowTracker
+from grabber import MssGrabber
+from logview import LogBuffer
+from metrics import Metrics
+from outbox import Outbox
+from palette import PaletteFile
+from scheduler import BarScheduler
+from sender import SignalSender
+from snapshot import SnapshotEncoder
+from watchdog import Heartbeat
+from winutil import Win32WindowProvider
+
+
+
+# 같은 봉 마감에 여러 신호가 나면 이 시간(초) 동안 모아 한 번에 전송 (0 이면 끔)
+SEND_COALESCE = 0.05 if "--coalesce" in sys.argv else 0.0
 WIN_TITLE = "buja chart"  # "파일 탐색기" #
 CONFIG_FILE = os.path.join("dist", "config.json")
 TARGET_FILE = os.path.join("dist", "target.json")
+OUTBOX_FILE = os.path.join("dist", "outbox.db")
+DEBUG_DIR = os.path.join("dist", "debug")
+RECORD_DIR = os.path.join("dist", "record")
+# 캡처 프레임을 녹화 (replay.py 로 재생)
+IS_RECORD = "--record" in sys.argv
 IS_SEND_IMAGE = True
-
-# ===== 색 정의 =====
-SIGNAL_COLORS = {
-    (255, 0, 255): ("1", "상승"),
-    (0, 255, 255): ("2", "하락"),
-    (255, 0, 0): ("3", "상위 상승"),
-    (0, 0, 255): ("4", "상위 하락"),
-}
-WHITE = (255, 255, 255)
+DEBUG_SIZE = 10  # 디버그 크롭 크기 (프로브 - size//2 부터 size*2 칸, layout.crops)
+DEBUG_FRAMES = 64  # 대상별로 메모리에 보관할 디버그 크롭 수
+DEBUG_FORMAT = "npy"  # npy / archive (debug_recorder.py)
+DEBUG_SAMPLE_SEC = 0.0  # 이 간격(초)마다 디버그 크롭 저장 (0 이면 신호/수동 저장만)
+SNAPSHOT_CODEC = "png8"  # png / png8 / webp / jpeg (snapshot.py)
+# 같은 대상의 직전 업로드와 비교해 바뀐 타일만 전송 (서버는 delta.DeltaDecoder 로 복원)
+IS_SEND_DELTA = "--delta" in sys.argv
+# 봉 마감 근처에서만 빠르게 폴링 (config.json 의 period/offset, 없으면 학습)
+IS_ADAPTIVE = "--adaptive" in sys.argv
+# 스냅샷 ROI 까지 한 번에 캡처해 공유 메모리(FrameBus)에 게시
+# (스냅샷은 다시 캡처하지 않고, 다른 프로세스는 run.py headless --source bus:<이름> 으로 읽음,
+#  슬롯마다 창 좌표를 같이 쓰므로 소비자는 --origin 없이 창 기준 좌표로 읽음)
+IS_FRAME_BUS = "--bus" in sys.argv
+FRAME_BUS_NAME = "bujasignal_frames"
+# 버스 슬롯 용량 = 처음 캡처 영역 x 이 배수 (DPI 배율 150% 까지는 버스를 다시 만들지 않음)
+FRAME_BUS_HEADROOM = 2.25
+GEOMETRY_REFRESH_SEC = 1.0  # 창 위치/배율 다시 읽는 간격 (틱마다 win32 호출 안 함)
+# 신호색 / 허용 오차 (없으면 palette.DEFAULT), 차트 테마가 바뀌면 이 파일만 고치면 실행 중에 다시 읽음
+PALETTE_FILE = os.path.join("dist", "palette.json")
+PALETTE_REFRESH_SEC = 1.0
+# 단계별 지연 히스토그램을 이 간격(초)마다 METRICS_FILE 에 기록
+METRICS_DUMP_SEC = 10.0
+# --metrics 면 127.0.0.1:<포트>/metrics 로도 제공
+METRICS_PORT = 9465 if "--metrics" in sys.argv else None
+LOG_FILE = os.path.join("dist", "logs", "signal.log")  # JSON lines, 5MB x 5 개로 교체
+LOG_MAX_LINES = 2000  # 로그 창에 남길 최대 줄 수 (넘으면 오래된 줄부터 지움)
+LOG_FLUSH_MS = 200  # 로그 창 갱신 간격 (메시지마다 갱신하지 않음)
+LOG_DUP_SEC = 5.0  # 같은 메시지가 이 시간 안에 반복되면 요약 한 줄로
+
+# 색 정의는 palette.py (dist/palette.json)
 wx = 0
 wy = 0
 
@@ -50,15 +85,19 @@ class SignalApp(QWidget):
 
         # UI
         self.startBtn = QPushButton("시작", self)
-        self.logBox = QTextEdit(self)
+        self.debugBtn = QPushButton("디버그 저장", self)
+        self.logBox = QPlainTextEdit(self)
         self.logBox.setReadOnly(True)
+        self.logBox.setMaximumBlockCount(LOG_MAX_LINES)
 
         layout = QVBoxLayout()
         layout.addWidget(self.startBtn)
+        layout.addWidget(self.debugBtn)
         layout.addWidget(self.logBox)
         self.setLayout(layout)
 
         self.startBtn.clicked.connect(self.toggleStart)
+        self.debugBtn.clicked.connect(self.saveDebugImages)
 
         # 모니터링 타이머
         self.timer = QTimer(self)
@@ -66,30 +105,87 @@ class SignalApp(QWidget):
 
         self.timer.timeout.connect(self.checkSignals)
 
+        # 로그는 버퍼에 모았다가 LOG_FLUSH_MS 마다 한 번에 붙임
+        self.logbuf = LogBuffer(LOG_FILE, max_lines=LOG_MAX_LINES, dup_window=LOG_DUP_SEC)
+        self.logTimer = QTimer(self)
+        self.logTimer.setInterval(LOG_FLUSH_MS)
+        self.logTimer.timeout.connect(self.flushLog)
+        self.logTimer.start()
+
         # target.json 로드
         with open(TARGET_FILE, "r", encoding="utf-8") as f:
             self.targets = json.load(f)
 
-        self.prev_color = {
-            item["name"]: {"p0": None, "p1": None} for item in self.targets
-        }
-        # 중복 전송 방지
-        self.sent_flag = {item["name"]: False for item in self.targets}
-
         # config.json 로드
         with open(CONFIG_FILE, "r", encoding="utf-8") as f:
             self.config = json.load(f)
-        self.capturepoints = {
-            item["name"]: {
-                "x": item["x"],
-                "y": item["y"],
-                "w": item["w"],
-                "h": item["h"],
-            }
-            for item in self.config
-        }
 
-        self.send_color = None
+        # 대상별 봉 주기 스케줄
+        self.scheduler = None
+        if IS_ADAPTIVE:
+            periods = {
+                item["name"]: (item["period"], item.get("offset"))
+                for item in self.config if item.get("period")
+            }
+            self.scheduler = BarScheduler([periods.get(t["name"]) for t in self.targets])
+
+        # 단계별 지연 / 카운터 (grab, classify, detect, debug, check, encode, http, deliver)
+        self.metrics = Metrics(METRICS_FILE, METRICS_DUMP_SEC)
+
+        # 캡처(틱당 1회) → 벡터 분류 → 신호 판정 (core.DetectionCore, Qt 없이도 동작)
+        # target.json / config.json 은 대상 ID 로 색인한 배열 테이블(core.layout)로 컴파일
+        # 버스 모드면 스냅샷 ROI 도 캡처 영역에 포함
+        # 분류는 팔레트 LUT (RGB → 신호색, dist/cache 에 캐시) 한 번 색인
+        self.palettes = PaletteFile(PALETTE_FILE, refresh=PALETTE_REFRESH_SEC)
+        palette = self.palettes.palette
+        # run.py watch 로 띄웠으면 틱마다 하트비트, 재시작 전 판정 상태(prev_color)를 이어받음
+        self.heartbeat = Heartbeat.attach()
+        self.core = DetectionCore(
+            MssGrabber(), self.targets, palette.signal_colors, tol=palette.tol, margin=DEBUG_SIZE * 2,
+            scheduler=self.scheduler, gate=True, config=self.config, roi=IS_FRAME_BUS,
+            metrics=self.metrics, kernel=PROBE_KERNEL, debounce=SIGNAL_DEBOUNCE,
+            hold=SIGNAL_HOLD_SEC, cooldown=SIGNAL_COOLDOWN_SEC, lut=True, heartbeat=self.heartbeat,
+        )
+        self.engine = self.core.engine
+        # 팔레트가 바뀌면 LUT(16MB 빌드 + 디스크 캐시)는 작업 스레드에서 만들고 끝나면 교체 (core.poll_palette)
+        self.core.watch_palette(self.palettes)
+        self.startupLogged = False  # run.py 시작 → 첫 틱 시간 로그 (한 번)
+
+        # 창 위치/배율 캐시 (창을 옮기면 프로브 좌표를 다시 맞춤)
+        self.tracker = WindowTracker(Win32WindowProvider(), WIN_TITLE, refresh=GEOMETRY_REFRESH_SEC)
+        self.tracker.listeners.append(self.onWindowMoved)
+        if IS_FRAME_BUS:
+            left, top, right, bottom = self.engine.bbox
+            self.engine.bus = FrameBus.create((bottom - top, right - left), FRAME_BUS_NAME,
+                                              headroom=FRAME_BUS_HEADROOM)
+        self.busGeneration = 0  # 캡처 영역이 버스 용량을 넘어 새 이름으로 다시 만든 횟수
+        self.classifier = self.core.classifier
+        self.detector = self.core.detector
+        self.framerec = None
+
+        # 전송은 백그라운드 스레드에서 (타이머가 네트워크를 기다리지 않음)
+        # 전송 전 아웃박스에 기록 → 실패/재시작 후에도 다시 전송
+        self.sender = SignalSender(
+            outbox=Outbox(OUTBOX_FILE),
+            batch_url=FASTAPI_URL_BATCH,
+            coalesce=SEND_COALESCE,
+            timings=self.metrics,
+        )
+        self.metrics.add_source("sender", self.sender.metrics)
+        if self.heartbeat is not None:
+            # 전송 스레드가 막혀도 (틱은 돌아도) 감독자가 재시작
+            self.heartbeat.send = lambda: self.sender.alive
+        self.metrics.add_source("gate", lambda: self.core.gate.metrics())
+        self.metrics.add_source("detector", self.detector.metrics)
+        self.metrics.add_source("log", self.logbuf.metrics)
+        # 스냅샷 인코딩도 UI 스레드 밖에서 (델타는 서버에서 정확히 복원되도록 무손실 png)
+        self.encoder = SnapshotEncoder("png" if IS_SEND_DELTA else SNAPSHOT_CODEC)
+        self.delta = DeltaEncoder() if IS_SEND_DELTA else None
+
+        # 디버그 크롭은 메모리 링버퍼에만 (신호/수동/샘플링 때만 디스크에 씀)
+        self.recorder = DebugRecorder(
+            DEBUG_DIR, size=DEBUG_FRAMES, fmt=DEBUG_FORMAT, sample_interval=DEBUG_SAMPLE_SEC
+        )
 
     # --------------------------------------------------------
     # Buja Chart 창을 최상단으로
@@ -106,18 +202,71 @@ class SignalApp(QWidget):
         if found:
             self.hwnd = found[0]
             win32gui.SetForegroundWindow(self.hwnd)
-            self.wx, self.wy, _, _ = win32gui.GetWindowRect(self.hwnd)
             win32gui.ShowWindow(self.hwnd, win32con.SW_RESTORE)
+            self.tracker.handle = self.hwnd
+            self.tracker.refresh()
             self.log(f"Buja Chart 창을 최상단으로 띄움. {self.wx}, {self.wy}")
+            if len(found) > 1:
+                self.log(f"Buja Chart 창 {len(found)}개 중 첫 번째만 감시 (전체는 run.py multi)")
         else:
             self.log("Buja Chart 창을 찾지 못함.")
 
+    def onWindowMoved(self, origin, scale):
+        moved = self.tracker.moves > 0
+        self.wx, self.wy = origin
+        bbox = self.engine.bbox
+        self.core.set_geometry(origin, scale)
+        if moved:
+            self.log(f"Buja Chart 창 이동/배율 변경: {self.wx}, {self.wy} x{scale:.2f}")
+        if self.engine.bbox != bbox:
+            self.onCaptureResized()
+
+    def onCaptureResized(self):
+        # 배율이 바뀌어 캡처 영역 크기가 바뀜 → 고정 크기 출력(버스 / 녹화)을 새 크기로
+        left, top, right, bottom = self.engine.bbox
+        shape = (bottom - top, right - left)
+        bus = self.engine.bus
+        if bus is not None and not bus.fits(shape):
+            # 붙어 있는 소비자가 있으면 윈도우는 같은 이름의 매핑을 지우지 못하므로 새 이름으로 만듦
+            self.busGeneration += 1
+            name = f"{FRAME_BUS_NAME}_{self.busGeneration}"
+            try:
+                self.engine.bus = FrameBus.create(shape, name, headroom=FRAME_BUS_HEADROOM)
+            except OSError as e:
+                # 버스 없이 계속 (스냅샷은 다시 캡처)
+                self.engine.bus = None
+                self.log(f"[프레임 버스 생성 실패] {name} / {e}", "warning")
+            else:
+                self.log(f"프레임 버스 다시 만듦 ({shape[1]}x{shape[0]}), "
+                         f"버스 소비자는 --source bus:{name} 으로 다시 시작해야 함", "warning")
+            bus.close()
+        if self.framerec is not None:
+            # 녹화는 프레임 크기가 고정이므로 새 메타로 새 녹화를 시작
+            self.framerec.close()
+            self.startRecording()
+
+    def pollPalette(self):
+        palette = self.core.poll_palette()
+        if palette is not None:
+            self.classifier = self.core.classifier
+            self.log(f"팔레트 다시 읽음: {', '.join(palette.names)} (tol={palette.tol})")
+        elif self.palettes.error is not None:
+            # 읽기 시도(PALETTE_REFRESH_SEC 마다) 한 번에 한 줄, 반복은 로그 요약
+            error, self.palettes.error = self.palettes.error, None
+            self.log(f"[팔레트 읽기 실패] {PALETTE_FILE} / {error}", "warning", ("palette", str(error)))
+
     # --------------------------------------------------------
     # UI 로그 출력
     # --------------------------------------------------------
-    def log(self, msg):
-        print(msg)
-        self.logBox.append(msg)
+    def log(self, msg, level="info", key=None):
+        # 화면 갱신은 flushLog 에서 (반복 메시지는 요약)
+        self.logbuf.write(msg, level, key)
+
+    def flushLog(self):
+        self.logbuf.tick()
+        lines = self.logbuf.drain()
+        if lines:
+            self.logBox.appendPlainText("\n".join(lines))
 
     # --------------------------------------------------------
     # 시작 / 종료 버튼
@@ -126,55 +275,82 @@ class SignalApp(QWidget):
         if self.startBtn.text() == "시작":
             self.startBtn.setText("종료")
             self.bringBujaToFront()
+            self.sender.start()
+            if METRICS_PORT is not None:
+                self.metrics.serve(METRICS_PORT)
+            if IS_RECORD:
+                self.startRecording()
             self.timer.start()
             self.log("신호 모니터링 시작.")
+            if self.core.restored:
+                self.log(f"재시작 전 판정 상태 인계: {self.core.restored}개 대상")
         else:
             self.timer.stop()
+            gate = self.core.gate.metrics()
+            self.log(f"변화 없음 건너뜀: {gate['skips']}/{gate['checks']} ({gate['skip_rate']:.1%})")
+            self.core.close()
+            if self.engine.bus is not None:
+                self.engine.bus.close()
+            if self.framerec is not None:
+                self.framerec.close()
+            self.encoder.close()
+            self.sender.stop()
+            self.sender.outbox.close()
+            self.metrics.close()
+            self.logSendResults()
             self.log("신호 모니터링 종료.")
+            self.logbuf.close()
             QApplication.quit()
 
     # --------------------------------------------------------
     # 픽셀 색 읽기
     # --------------------------------------------------------
     def getPixel(self, x, y):
-        rx = self.wx + x
-        ry = self.wy + y
-        img = ImageGrab.grab(bbox=(rx, ry, rx + 1, ry + 1))
-        pixel = img.getpixel((0, 0))
-
-        if pixel not in SIGNAL_COLORS:
-            pixel = (255, 255, 255)
-
-        return pixel  # RGB 튜플
+        # 이번 틱에 캡처한 버퍼에서 읽음 (화면 캡처 없음)
+        index = int(self.classifier.match(self.engine.pixel(x, y)))
+        return self.classifier.color(index) or WHITE  # RGB 튜플
 
     # --------------------------------------------------------
     # FastAPI 서버 전송
     # --------------------------------------------------------
-    def sendToServerWithImg(self, name, signal, msg, img):
-        # PIL Image → bytes
-        img_bytes = io.BytesIO()
-        img.save(img_bytes, format="PNG")
-        img_bytes.seek(0)
-
+    def sendToServerWithImg(self, name, signal, msg, img, detected_at=None):
         timestamp = datetime.now().strftime("%m%d %H%M%S")
+        header = None
+        # 델타 모드: 바뀐 타일만 (헤더는 frame 필드로)
+        if self.delta is not None:
+            header, img = self.delta.encode(name, img)
+        self.uploadImage(timestamp, name, signal, msg, img, header, detected_at)
+
+    def uploadImage(self, timestamp, name, signal, msg, img, header=None, detected_at=None):
         data = {
             "timestamp": timestamp,
             "name": name,
             "signal": signal,
         }
-
-        files = {"image": ("signal.png", img_bytes, "image/png")}
-
-        try:
-            requests.post(FASTAPI_URL_IMG, data=data, files=files, timeout=(2, 5))
-            self.log(
-                f"[{timestamp}] {name} - {signal} ({msg} {img_bytes.getbuffer().nbytes / 1024:.2f}KB)"
-            )
-
-        except Exception as e:
-            self.log(f"[{timestamp}] [전송 실패] {name} / {type(e).__name__}: {e}")
-
-    def sendToServer(self, name, signal, msg):
+        retry = ()
+        if header is not None:
+            data["frame"] = json.dumps(header)
+            if header["mode"] == "delta":
+                # 실패하면 logSendResults 가 같은 프레임을 키프레임으로 다시 보냄 (델타는 아웃박스에 안 남김)
+                retry = ((header["seq"], msg, detected_at),)
+
+        # RGB 배열 → 인코딩 스레드에서 bytes 로 만든 뒤 전송 큐로
+        submitted = time.perf_counter()
+
+        def post(img_bytes, filename, ctype):
+            self.metrics.record("encode", time.perf_counter() - submitted)
+            files = {"image": (filename, img_bytes, ctype)}
+            info = f"{msg} {len(img_bytes) / 1024:.2f}KB"
+            self.sender.post_multipart(FASTAPI_URL_IMG, data, files, (timestamp, name, signal, info) + retry,
+                                       detected_at=detected_at, durable=not retry)
+
+        def failed(e):
+            # 인코딩 / 아웃박스 기록 실패도 전송 실패로 로그 (델타면 다음은 키프레임)
+            self.sender.fail((timestamp, name, signal, msg), f"{type(e).__name__}: {e}")
+
+        self.encoder.submit(img, post, failed)
+
+    def sendToServer(self, name, signal, msg, detected_at=None):
         timestamp = datetime.now().strftime("%m%d %H%M%S")
         data = {
             "timestamp": timestamp,
@@ -182,89 +358,127 @@ class SignalApp(QWidget):
             "signal": signal,
             # "msg": msg
         }
-        try:
-            requests.post(FASTAPI_URL, json=data, timeout=(2, 5))
-            self.log(f"[{timestamp}] {name} - {signal} ({msg})")
-        except Exception as e:
-            self.log(f"[{timestamp}] [전송 실패] {name} / {type(e).__name__}: {e}")
+        if not self.sender.post_json(FASTAPI_URL, data, (timestamp, name, signal, msg),
+                                     detected_at=detected_at):
+            self.logSendResults()
+
+    def logSendResults(self):
+        # 백그라운드 전송 결과를 UI 스레드에서 로그로 출력
+        for meta, ok, error, _ in self.sender.results():
+            timestamp, name, signal, info = meta[:4]
+            if ok:
+                self.log(f"[{timestamp}] {name} - {signal} ({info})")
+            else:
+                # 장애 중 폭주하는 실패는 오류 종류별로 묶어 요약
+                self.log(f"[{timestamp}] [전송 실패] {name} / {error}", "warning", ("send_fail", error))
+                if self.delta is None:
+                    continue
+                if len(meta) > 4:
+                    # 실패한 델타 → 같은 프레임을 새 seq 키프레임으로 (아웃박스에 남겨 재전송)
+                    seq, msg, detected_at = meta[4]
+                    rekey = self.delta.rekey(name, seq)
+                    if rekey is not None:
+                        self.uploadImage(timestamp, name, signal, msg, rekey[1], rekey[0], detected_at)
+                else:
+                    # 서버 기준 프레임이 어긋났으므로 다음은 키프레임
+                    self.delta.reset(name)
 
     # --------------------------------------------------------
     # 메인 체크 로직
     # --------------------------------------------------------
     def checkSignals(self):
-        for item in self.targets:
-            name = item["name"]
-            x0, y0 = item["x0"], item["y0"]
-            x1, y1 = item["x1"], item["y1"]
-
-            # 현재 색 읽기
-            p0 = self.getPixel(x0, y0)
-            p1 = self.getPixel(x1, y1)
-
-            self.captureDebugImage(x0, y0, name + "_p0")
-            self.captureDebugImage(x1, y1, name + "_p1")
-
-            # 이전 색 가져오기
-            prev_p0 = self.prev_color[name]["p0"]
-            prev_p1 = self.prev_color[name]["p1"]
-
-            if prev_p1 != p1:
-                self.send_color = None
-
-            # 변화 여부 체크
-            changed = (prev_p0 != p0) or (prev_p1 != p1)
-
-            # 변화 없으면 아무 동작 안함
-            if not changed:
-                continue
-
-            # 이전 색 업데이트
-            self.prev_color[name]["p0"] = p0
-            self.prev_color[name]["p1"] = p1
-
-            # p0이 지정 색이 아니라면 skip
-            if p0 not in SIGNAL_COLORS or self.send_color == p0:
-                continue
-
-            self.send_color = p0
-            print(p0, p1)
+        start = time.perf_counter()
+        self.logSendResults()
+        self.tracker.poll()
+        self.pollPalette()
+
+        signals = self.core.tick()
+        if self.core.startup is not None and not self.startupLogged:
+            self.startupLogged = True
+            self.log(f"시작 → 첫 틱 {self.core.startup * 1000:.0f}ms")
+        if self.scheduler is not None:
+            # 다음 폴링 시각까지 타이머 간격 조정
+            self.timer.setInterval(max(1, int(self.scheduler.next_wakeup(time.time()) * 1000)))
+            if not self.core.captured:
+                self.recorder.tick()
+                self.metrics.maybe_dump()
+                return
+
+        if self.framerec is not None:
+            self.framerec.record(self.core.frame, time.time())
+
+        # 전체 프로브 크롭을 한 번에 잘라 링버퍼에 보관 (대상별 dict / 문자열 조회 없음)
+        layout = self.core.layout
+        debug_start = time.perf_counter()
+        self.recorder.record_many(layout.keys, layout.crops(self.core.frame, DEBUG_SIZE))
+        self.metrics.record("debug", time.perf_counter() - debug_start)
+
+        for sig in signals:
+            name = sig["name"]
+            signal, msg = sig["signal"], sig["msg"]
+            print(sig["p0"], sig["p1"])
 
             # 전송!
-            signal, msg = SIGNAL_COLORS[p0]
-            if IS_SEND_IMAGE:
-                point = self.capturepoints[name]
-                img = self.capture(point["x"], point["y"], point["w"], point["h"])
-                self.sendToServerWithImg(name, signal, msg, img)
+            roi = layout.roi(sig["index"])
+            if IS_SEND_IMAGE and roi is not None:
+                img = self.capture(*roi)
+                self.sendToServerWithImg(name, signal, msg, img, sig["time"])
             else:
-                self.sendToServer(name, signal, msg)
-            self.sent_flag[name] = True
+                self.sendToServer(name, signal, msg, sig["time"])
+            self.recorder.flush(layout.keys[2 * sig["index"]:2 * sig["index"] + 2])
+
+        self.recorder.tick()
+
+        # checkSignals 전체 시간 (타이머 간격을 넘기면 다음 틱이 밀림)
+        elapsed = time.perf_counter() - start
+        self.metrics.record("check", elapsed)
+        if elapsed * 1000 > self.timer.interval():
+            self.metrics.count("tick_overrun")
+        self.metrics.maybe_dump()
+
+    def startRecording(self):
+        base = os.path.join(RECORD_DIR, datetime.now().strftime("%m%d_%H%M%S"))
+        path, n = base, 1
+        while os.path.exists(path):
+            # 같은 초에 다시 시작 (배율 변경으로 녹화 교체)
+            n += 1
+            path = f"{base}_{n}"
+        self.framerec = FrameRecorder(path, {
+            "bbox": list(self.engine.bbox),
+            "targets": self.core.targets,
+            "palette": [list(c) for c in self.classifier.colors],
+            "tol": self.classifier.tol,
+            "kernel": self.classifier.kernel,
+            "min_votes": self.classifier.min_votes,
+            "debounce": self.detector.debounce,
+            "hold": self.detector.hold,
+            "cooldown": self.detector.cooldown,
+        })
+        self.log(f"캡처 프레임 녹화: {path}")
 
     def capture(self, x, y, w, h, save_path=None):
         """
-        Buja Chart 상의 영역을 캡처.
+        Buja Chart 상의 영역을 캡처해 (h, w, 3) RGB 배열로 반환.
         (x, y) 좌상단 좌표, w, h 너비 높이
         save_path: 저장 경로
         """
-        left = self.wx + x
-        top = self.wy + y
-        right = self.wx + x + w
-        bottom = self.wy + y + h
-
-        img = ImageGrab.grab(bbox=(left, top, right, bottom))
+        if self.engine.bus is not None:
+            # 이번 틱 프레임에 ROI 가 들어 있으므로 다시 캡처하지 않음
+            img = np.array(self.engine.crop(x, y, w, h))
+        else:
+            img = np.ascontiguousarray(self.engine.grabber.grab(self.wx + x, self.wy + y, w, h))
 
         if save_path:
-            img.save(save_path)
+            # PIL 은 파일로 저장할 때만 (시작 시간 단축)
+            from PIL import Image
+
+            Image.fromarray(img).save(save_path)
             return save_path
         return img
 
-    def captureAreaAround(self, x, y, size=5, save_path=None):
-        s = int(size / 2)
-        return self.capture(x - s, y - s, size * 2, size * 2, save_path)
-
-    def captureDebugImage(self, x, y, name):
-        img = self.captureAreaAround(x, y, size=10, save_path=None)
-        img.save(f"debug_{name}.png")
-        # self.log(f"디버그 이미지 저장: debug_{name}.png")
+    def saveDebugImages(self):
+        paths = self.recorder.flush()
+        self.log(f"디버그 크롭 저장: {len(paths)}개 → {DEBUG_DIR}")
 
 
 # ============================================================
@@ -274,6 +488,9 @@ def main():
     app = QApplication(sys.argv)
     win = SignalApp()
     win.show()
+    if win.heartbeat is not None:
+        # 감독자가 다시 띄운 경우 시작 버튼을 기다리지 않음
+        win.toggleStart()
     sys.exit(app.exec_())
 
 
@@ -0,0 +1,188 @@
+# metrics.py
+import json
+import os
+import threading
+import time
+
+# 히스토그램 정밀도: 2^SUB_BITS 칸 안에서는 정확, 그 위로는 2배 구간마다 HALF 칸 (상대 오차 < 1/HALF)
+SUB_BITS = 7
+SUB = 1 << SUB_BITS
+HALF = SUB >> 1
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class Histogram:
+    """
+    HDR 식 로그-선형 지연 히스토그램 (마이크로초 정수 단위)
+
+    - record() 는 비트 연산 + 리스트 칸 증가뿐 (할당 없음, 틱마다 불러도 됨)
+    - 0 ~ 127us 는 1us 칸, 그 위는 2배 구간마다 64 칸 → 어느 값이든 상대 오차 1.6% 이하
+    - 칸 수는 최대값에 따라 늘어남 (1시간 ≈ 2^32us 까지 약 1800 칸)
+    """
+
+    def __init__(self):
+        self.counts = [0] * SUB
+        self.count = 0
+        self.total = 0
+        self.min = 1 << 62
+        self.max = 0
+
+    @staticmethod
+    def _index(v):
+        if v < SUB:
+            return v
+        shift = v.bit_length() - SUB_BITS
+        return SUB + (shift - 1) * HALF + (v >> shift) - HALF
+
+    @staticmethod
+    def _value(i):
+        """칸 i 의 대표값 (구간 중간)"""
+        if i < SUB:
+            return i
+        shift, sub = divmod(i - SUB, HALF)
+        shift += 1
+        return ((sub + HALF) << shift) + (1 << shift) // 2
+
+    def record(self, seconds):
+        v = int(seconds * 1e6)
+        if v < SUB:
+            if v < 0:
+                v = 0
+            i = v
+        else:
+            # _index 를 풀어 씀 (호출 오버헤드 없이)
+            shift = v.bit_length() - SUB_BITS
+            i = SUB - HALF + (shift - 1) * HALF + (v >> shift)
+        counts = self.counts
+        if i >= len(counts):
+            counts.extend([0] * (i + 1 - len(counts)))
+        counts[i] += 1
+        self.count += 1
+        self.total += v
+        if v > self.max:
+            self.max = v
+        if v < self.min:
+            self.min = v
+
+    def percentile(self, p):
+        """p(0~100) 백분위 지연 (us)"""
+        if not self.count:
+            return 0
+        rank = max(1, int(self.count * p / 100 + 0.5))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._value(i), self.max)
+        return self.max
+
+    def merge(self, other):
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.min = min(self.min, other.min)
+
+    def to_dict(self):
+        out = {"count": self.count, "mean_us": self.total / self.count if self.count else 0.0,
+               "min_us": self.min if self.count else 0, "max_us": self.max}
+        for p in PERCENTILES:
+            out[f"p{p:g}_us"] = self.percentile(p)
+        return out
+
+
+class Metrics:
+    """
+    단계별 지연 히스토그램 + 카운터 모음
+
+    - record(단계, 초) / count(이름) 은 어느 스레드에서나 호출 (단계마다 쓰는 스레드는 하나)
+    - snapshot() 은 JSON 으로 쓸 수 있는 dict (add_source 로 등록한 다른 지표도 포함)
+    - dump_path 를 주면 maybe_dump() 가 dump_interval 초마다 JSON 파일로 씀 (임시 파일 → 교체)
+    - serve(port) 는 127.0.0.1:port/metrics 로 같은 JSON 을 제공 (데몬 스레드)
+    """
+
+    def __init__(self, dump_path=None, dump_interval=10.0):
+        self.histograms = {}
+        self.counters = {}
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.started = time.time()
+        self._next_dump = time.monotonic() + dump_interval
+        self._server = None
+        self.sources = {}
+
+    def record(self, stage, seconds):
+        hist = self.histograms.get(stage)
+        if hist is None:
+            hist = self.histograms.setdefault(stage, Histogram())
+        hist.record(seconds)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_source(self, name, fn):
+        """snapshot 때마다 fn() 결과를 name 으로 포함 (예: SignalSender.metrics)"""
+        self.sources[name] = fn
+
+    def snapshot(self):
+        out = {
+            "time": time.time(),
+            "uptime": time.time() - self.started,
+            "stages": {k: h.to_dict() for k, h in list(self.histograms.items())},
+            "counters": dict(self.counters),
+        }
+        for name, fn in list(self.sources.items()):
+            out[name] = fn()
+        return out
+
+    def dump(self, path=None):
+        path = path or self.dump_path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=1)
+        os.replace(tmp, path)
+        return path
+
+    def maybe_dump(self):
+        """dump_interval 이 지났으면 dump (매 틱 호출)"""
+        if self.dump_path is None or time.monotonic() < self._next_dump:
+            return None
+        self._next_dump = time.monotonic() + self.dump_interval
+        return self.dump()
+
+    def serve(self, port):
+        """로컬 지표 엔드포인트 시작 (GET /metrics → snapshot JSON)"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(metrics.snapshot()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True).start()
+        return self._server.server_address[1]
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self.dump_path is not None:
+            self.dump()
@@ -0,0 +1,126 @@
+# outbox.py
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    created   REAL NOT NULL,
+    url       TEXT NOT NULL,
+    json      TEXT,
+    data      TEXT,
+    file      TEXT,
+    payload   BLOB,
+    meta      TEXT,
+    attempts  INTEGER NOT NULL DEFAULT 0,
+    next_try  REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_next_try ON outbox (next_try);
+"""
+
+
+class Outbox:
+    """
+    전송 전 신호를 보관하는 SQLite(WAL) 아웃박스
+
+    - add()   : 전송 전에 기록 (next_try=NULL → 지금 메모리 큐에서 전송 중)
+    - ack()   : 전송 성공 → 삭제
+    - defer() : 전송 실패 → next_try 이후 due() 로 다시 꺼냄
+    - 프로세스가 죽어도 남은 행은 다음 실행 때 recover() 후 다시 전송
+    - 파일은 (필드명, 파일명, content-type) 을 file 컬럼에, 내용은 payload BLOB 에 저장
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def add(self, job, due=False):
+        """job(dict: url, json/data/files, meta) 기록 후 id 반환"""
+        file, payload = None, None
+        files = job.get("files") or {}
+        if len(files) > 1:
+            raise ValueError("outbox stores at most one file per signal")
+        for field, (name, content, ctype) in files.items():
+            file, payload = json.dumps([field, name, ctype]), content
+
+        row = (
+            job.get("time", time.time()),
+            job["url"],
+            _dumps(job.get("json")),
+            _dumps(job.get("data")),
+            file,
+            payload,
+            _dumps(job.get("meta")),
+            0.0 if due else None,
+        )
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO outbox (created, url, json, data, file, payload, meta, next_try)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            return cur.lastrowid
+
+    def ack(self, ids):
+        ids = [ids] if isinstance(ids, int) else list(ids)
+        if not ids:
+            return
+        with self._lock:
+            self._db.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+
+    def defer(self, ids, delay):
+        """ids 를 delay 초 뒤에 다시 시도하도록 미룬다."""
+        ids = [ids] if isinstance(ids, int) else list(ids)
+        with self._lock:
+            self._db.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, next_try = ? WHERE id = ?",
+                [(time.time() + delay, i) for i in ids],
+            )
+
+    def recover(self):
+        """이전 실행에서 전송 중이던 행(next_try=NULL)을 바로 재전송 대상으로"""
+        with self._lock:
+            return self._db.execute("UPDATE outbox SET next_try = 0 WHERE next_try IS NULL").rowcount
+
+    def due(self, limit=50):
+        """지금 재전송할 job 목록 (오래된 순)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, created, url, json, data, file, payload, meta, attempts FROM outbox"
+                " WHERE next_try IS NOT NULL AND next_try <= ? ORDER BY id LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+        return [_job(row) for row in rows]
+
+    def pending(self):
+        """아웃박스에 남은 행 수"""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _dumps(value):
+    return None if value is None else json.dumps(value, ensure_ascii=False)
+
+
+def _loads(value):
+    return None if value is None else json.loads(value)
+
+
+def _job(row):
+    id, created, url, js, data, file, payload, meta, attempts = row
+    job = {"id": id, "time": created, "url": url, "json": _loads(js), "data": _loads(data),
+           "meta": _loads(meta), "attempts": attempts}
+    if file is not None:
+        field, name, ctype = json.loads(file)
+        job["files"] = {field: (name, bytes(payload), ctype)}
+    return job
@@ -0,0 +1,227 @@
+# palette.py
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+# 팔레트의 어느 색과도 가깝지 않은 픽셀(배경, 캔들 등)
+NONE = -1
+
+PALETTE_FILE = os.path.join("dist", "palette.json")
+LUT_DIR = os.path.join("dist", "cache")
+
+# 기본 팔레트 (dist/palette.json 이 없을 때)
+# signal 이 있는 항목만 신호색, 나머지(white)는 배경 등 이름만 붙이는 색
+DEFAULT = {
+    "tol": 20,
+    "colors": [
+        {"name": "pink", "rgb": [255, 0, 255], "signal": "1", "msg": "상승"},
+        {"name": "sky", "rgb": [0, 255, 255], "signal": "2", "msg": "하락"},
+        {"name": "red", "rgb": [255, 0, 0], "signal": "3", "msg": "상위 상승"},
+        {"name": "blue", "rgb": [0, 0, 255], "signal": "4", "msg": "상위 하락"},
+        {"name": "white", "rgb": [255, 255, 255]},
+    ],
+}
+
+
+def nearest(pixels, rgb, tol):
+    """
+    (..., 3) RGB 배열 → (...) rgb 목록 인덱스 (채널별 오차가 tol 이하인 가장 가까운 색, 없으면 NONE)
+
+    채널을 앞으로 빼서 (색 수, 픽셀 수) 거리로 계산 (마지막 축 3 짜리 브로드캐스트보다 훨씬 빠름)
+    거리가 같으면 앞쪽 색
+    """
+    px = np.asarray(pixels)
+    shape = px.shape[:-1]
+    pal = np.asarray(rgb, dtype=np.int16).reshape(-1, 3)
+    flat = px.reshape(-1, 3).T.astype(np.int16)
+    dist = np.abs(flat[0] - pal[:, 0, None])
+    np.maximum(dist, np.abs(flat[1] - pal[:, 1, None]), out=dist)
+    np.maximum(dist, np.abs(flat[2] - pal[:, 2, None]), out=dist)
+    best = dist.argmin(axis=0)
+    ok = dist.min(axis=0) <= tol
+    return np.where(ok, best, NONE).reshape(shape)
+
+
+def pack(pixels):
+    """(..., 3) RGB uint8 → (...) 0xRRGGBB 정수 (LUT 인덱스)"""
+    px = np.asarray(pixels)
+    out = px[..., 0].astype(np.intp) << 16
+    out |= px[..., 1].astype(np.intp) << 8
+    out |= px[..., 2]
+    return out
+
+
+def build_lut(rgb, tol, cache_dir=LUT_DIR):
+    """
+    RGB 24 비트 전체 → 팔레트 인덱스 LUT (int8, 16M 칸, nearest 와 같은 결과)
+
+    색마다 ±tol 상자만 계산하므로 빠르고, cache_dir 에 <팔레트 해시>.npy 로 저장해
+    다음부터는 memmap 으로 연다 (실제로 읽은 페이지만 메모리에 올라옴).
+    cache_dir 이 None 이면 메모리에만 만든다.
+    """
+    rgb = [tuple(int(v) for v in c) for c in rgb]
+    path = None
+    if cache_dir is not None:
+        key = hashlib.sha1(json.dumps([rgb, tol]).encode()).hexdigest()[:16]
+        path = os.path.join(cache_dir, f"lut_{key}.npy")
+        if os.path.exists(path):
+            return np.load(path, mmap_mode="r")
+
+    lut = np.full((256, 256, 256), NONE, dtype=np.int8)
+    best = np.full((256, 256, 256), 256, dtype=np.uint16)
+    axis = np.arange(256, dtype=np.int16)
+    for i, c in enumerate(rgb):
+        lo = [max(0, v - tol) for v in c]
+        hi = [min(255, v + tol) + 1 for v in c]
+        if any(a >= b for a, b in zip(lo, hi)):
+            continue
+        dr, dg, db = (np.abs(axis[a:b] - v).astype(np.uint16) for a, b, v in zip(lo, hi, c))
+        dist = np.maximum(np.maximum(dr[:, None, None], dg[None, :, None]), db[None, None, :])
+        box = (slice(lo[0], hi[0]), slice(lo[1], hi[1]), slice(lo[2], hi[2]))
+        # 앞쪽 색이 이미 같은 거리로 차지한 칸은 그대로 (nearest 의 argmin 과 같음)
+        win = dist < best[box]
+        best[box][win] = dist[win]
+        lut[box][win] = i
+    lut = lut.reshape(-1)
+    if path is None:
+        return lut
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, lut)
+    os.replace(tmp, path)
+    return np.load(path, mmap_mode="r")
+
+
+def prune_luts(keep=(), cache_dir=LUT_DIR):
+    """
+    cache_dir 의 lut_*.npy 중 keep(경로 목록)에 없는 파일을 지운다 → 지운 수
+
+    팔레트를 고칠 때마다 16MB 씩 쌓이지 않도록 교체 후 호출.
+    아직 열려 있는 파일(윈도우 memmap)은 지우지 못하므로 건너뛰고 다음 정리 때 다시 시도.
+    """
+    keep = {os.path.abspath(p) for p in keep if p}
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return 0
+    removed = 0
+    for name in names:
+        path = os.path.abspath(os.path.join(cache_dir, name))
+        if not (name.startswith("lut_") and name.endswith(".npy")) or path in keep:
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class Palette:
+    """
+    신호색 / 이름 붙은 색 목록과 허용 오차 (dist/palette.json 또는 DEFAULT)
+
+    - colors: {이름: RGB}, signal_colors: {RGB: (signal, msg)} (core.SIGNAL_COLORS 형식)
+    - classify(pixels): 전체 색 기준 인덱스 (names[i], NONE), lut=True 면 LUT 한 번 색인
+    - 차트 테마가 바뀌면 palette.json 만 고치면 됨 (PaletteFile 이 다시 읽음)
+    """
+
+    def __init__(self, entries, tol=20):
+        self.entries = [dict(e) for e in entries]
+        self.tol = int(tol)
+        self.names = [e["name"] for e in self.entries]
+        self.rgb = [tuple(int(v) for v in e["rgb"]) for e in self.entries]
+        # ±tol 상자끼리 겹치지 않으면 처음 맞는 색 = 가장 가까운 색 (match_color 빠른 경로)
+        self.disjoint = all(max(abs(a - b) for a, b in zip(p, q)) > 2 * self.tol
+                            for i, p in enumerate(self.rgb) for q in self.rgb[i + 1:])
+        self._lut = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["colors"], data.get("tol", DEFAULT["tol"]))
+
+    @classmethod
+    def load(cls, path=PALETTE_FILE):
+        """palette.json 을 읽는다 (없으면 DEFAULT)"""
+        if not os.path.exists(path):
+            return cls.from_dict(DEFAULT)
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self):
+        return {"tol": self.tol, "colors": self.entries}
+
+    @property
+    def colors(self):
+        return dict(zip(self.names, self.rgb))
+
+    @property
+    def signal_colors(self):
+        return {c: (e["signal"], e.get("msg", "")) for c, e in zip(self.rgb, self.entries)
+                if e.get("signal") is not None}
+
+    def lut(self, cache_dir=LUT_DIR):
+        if self._lut is None:
+            self._lut = build_lut(self.rgb, self.tol, cache_dir)
+        return self._lut
+
+    def classify(self, pixels, lut=False):
+        """(..., 3) RGB → (...) 색 인덱스 (없으면 NONE)"""
+        if lut:
+            return self.lut()[pack(pixels)].astype(np.intp)
+        return nearest(pixels, self.rgb, self.tol)
+
+    def __eq__(self, other):
+        return isinstance(other, Palette) and self.to_dict() == other.to_dict()
+
+
+class PaletteFile:
+    """
+    palette.json 핫 리로드 (FileGrabber 처럼 mtime 비교, refresh 초에 한 번만 stat)
+
+    poll() 은 바뀐 새 Palette 를 (없으면 None) 반환한다.
+    읽다 실패하면(쓰는 중 등) 이전 팔레트를 유지하고 error 에 남긴다 (다음 refresh 때 다시 시도).
+    """
+
+    def __init__(self, path=PALETTE_FILE, refresh=1.0):
+        self.path = path
+        self.refresh = refresh
+        self.error = None
+        self._mtime = self._stat()
+        self.palette = Palette.load(path)
+        self._next = 0.0
+
+    def _stat(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def poll(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now < self._next:
+            return None
+        self._next = now + self.refresh
+
+        mtime = self._stat()
+        if mtime == self._mtime:
+            return None
+        try:
+            palette = Palette.load(self.path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.error = e
+            return None
+        self._mtime = mtime
+        self.error = None
+        if palette == self.palette:
+            return None
+        self.palette = palette
+        return palette
+
+
+DEFAULT_PALETTE = Palette.from_dict(DEFAULT)
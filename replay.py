@@ -0,0 +1,59 @@
+# replay.py
+"""
+녹화한 캡처 프레임을 checkSignals 와 같은 판정 로직으로 재생 (헤드리스)
+
+    python replay.py <녹화 폴더>
+
+녹화 당시의 대상/팔레트/허용 오차/프로브 커널/디바운스 설정은 meta.json 에서 읽는다.
+"""
+import sys
+import time
+
+from classifier import SignalClassifier
+from detector import SignalDetector
+from framerec import FrameReader
+
+
+def replay(directory):
+    """녹화를 처음부터 재생해 [(시각, 대상 이름, p0 RGB, p1 RGB), ...] 반환"""
+    reader = FrameReader(directory)
+    meta = reader.meta
+
+    classifier = SignalClassifier(meta["palette"], tol=meta["tol"], kernel=meta.get("kernel", "pixel"),
+                                  min_votes=meta.get("min_votes"))
+    classifier.set_targets(meta["targets"], meta["bbox"])
+    detector = SignalDetector([t["name"] for t in meta["targets"]], classifier.colors,
+                              debounce=meta.get("debounce", 1), hold=meta.get("hold", 0.0),
+                              cooldown=meta.get("cooldown", 0.0))
+
+    events = []
+    last = -1
+    labels = None
+    for t, i in reader.ticks.tolist():
+        # 같은 프레임이면 분류 결과도 같고, 확정 대기 중인 대상이 없으면 신호도 없음
+        if i == last and not detector.waiting:
+            continue
+        if i != last:
+            labels = classifier.classify(reader.frames[i])
+            last = i
+        for n, p0, p1 in detector.step(labels, now=t):
+            events.append((t, detector.names[n], detector.color(p0), detector.color(p1)))
+    return events, len(reader)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    start = time.perf_counter()
+    events, ticks = replay(sys.argv[1])
+    elapsed = time.perf_counter() - start
+
+    for t, name, p0, p1 in events:
+        print(f"{time.strftime('%m%d %H%M%S', time.localtime(t))} {name} {p0} {p1}")
+    print(f"ticks={ticks} signals={len(events)} elapsed={elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,117 @@
 # run.py
+"""
+부자차트 신호발생기 런처
+
+하위 명령을 새 인터프리터를 띄우지 않고 같은 프로세스에서 실행한다.
+명령 모듈은 고른 것 하나만 import (Qt 는 UI 명령에서만, requests 는 전송 스레드가 시작할 때).
+명령 모듈 import 시간을 재서 예산(IMPORT_BUDGET_MS)을 넘으면 경고, --timing 이면 항상 출력.
+"""
+import importlib
+import os
 import sys
-import subprocess
+import time
+
+# 프로세스 시작 시각 → core.DetectionCore 가 첫 틱까지 걸린 시간(startup)을 잰다
+# (이 프로세스를 띄운 쪽이 이미 넣었으면 그 시각부터, 인터프리터 시작 시간까지 포함)
+STARTED_ENV = "BUJA_STARTED"
+os.environ.setdefault(STARTED_ENV, repr(time.time()))
+
+# 이름: (별칭, 모듈, import 예산 ms, 설명)
+# 모듈의 main() 은 sys.argv 를 ["run.py <이름>", 나머지 인자...] 로 바꾼 뒤 인자 없이 부른다
+COMMANDS = {
+    "run": (("--run", "-r"), "main", 1500, "ROI 기반 자동 실행 (기본)"),
+    "setting": (("--setting", "-s"), "setting", 1500, "설정창(UI) 실행"),
+    "headless": (("--headless",), "core", 400,
+                 "Qt 없이 신호 감지 (core.py, 리눅스에서 파일 화면으로도 실행)"),
+    "multi": (("--multi",), "workers", 400, "창/모니터마다 워커 프로세스로 감지 (workers.py)"),
+    "replay": (("--replay",), "replay", 400, "녹화한 캡처 프레임 재생 (replay.py)"),
+    "watch": (("--watch",), "watchdog", 400,
+              "명령을 자식 프로세스로 감시, 멈추거나 죽으면 다시 띄움 (watchdog.py)"),
+    "help": (("--help", "-h"), None, 0, "도움말 출력"),
+}
+DEFAULT_COMMAND = "run"
+DEV_ARGS = ("--dev", "-d", "dev")
 
 
 def print_help():
     filename = "run.exe"
+    lines = []
+    for name, (aliases, _, _, text) in COMMANDS.items():
+        lines.append(f"  {', '.join(aliases + (name,)):26s} {text}")
     help_text = f"""
-사용법: {filename} [옵션]
+사용법: {filename} [명령] [옵션]
 
-옵션 목록:
-  --setting, -s, setting     설정창(UI) 실행
-  --run,     -r, run         ROI 기반 자동 실행
-  --dev,     -d, dev         개발 모드로 실행 (로컬호스트 사용)
-  --help,    -h, help        도움말 출력
+명령 목록:
+{chr(10).join(lines)}
+
+옵션:
+  --dev,     -d, dev         개발 모드로 실행 (개발 서버 사용, 명령 없이 주면 run, 명령 뒤에는 --dev / -d)
+  --timing                   명령 모듈 import 시간 출력
 
 예시:
   {filename} --setting
   {filename} -r
+  {filename} headless --source screen.png --ticks 100
+  {filename} watch headless --send
   {filename} -d
+  {filename} headless -d
   {filename} -h
 """
     print(help_text)
 
 
-def start():
-    
-    param_dev = "--dev" if arg in ("--dev", "-d", "dev") else ""
-    
-    if len(sys.argv) > 1:
-        arg = sys.argv[1].lower()
+def resolve(argv):
+    """
+    명령줄 → (명령 이름, 명령에 넘길 인자) (모르는 명령이면 이름 None)
+
+    명령 앞의 --dev / -d / dev 와 명령 뒤의 -d 는 --dev 로 바꾼다 (run.exe run -d 가 운영 서버로 보내지 않도록,
+    endpoints / 각 명령은 --dev 만 봄). 명령 뒤의 dev 는 위치 인자 / 옵션 값일 수 있으므로 그대로 둔다.
+    """
+    if not argv:
+        return DEFAULT_COMMAND, []
+    first, rest = argv[0].lower(), list(argv[1:])
+    if first in DEV_ARGS:
+        # run.exe -d [명령] → 명령(없으면 기본 명령)을 개발 모드로
+        name, rest = resolve(rest)
+        return name, (["--dev"] + rest if name is not None else rest)
+    # -d 는 옵션 값이 될 수 없으므로 (argparse 가 옵션으로 봄) 명령 뒤 어디서나 플래그
+    rest = ["--dev" if a == "-d" else a for a in rest]
+    for name, (aliases, _, _, _) in COMMANDS.items():
+        if first == name or first in aliases:
+            return name, rest
+    return None, list(argv)
+
+
+def load(name, timing=False):
+    """명령 모듈 import (시간을 재서 예산을 넘거나 timing 이면 stderr 로 출력)"""
+    _, module, budget, _ = COMMANDS[name]
+    start = time.perf_counter()
+    mod = importlib.import_module(module)
+    elapsed = (time.perf_counter() - start) * 1000
+    if timing or elapsed > budget:
+        over = " (예산 초과)" if elapsed > budget else ""
+        print(f"[run.py] import {module}: {elapsed:.0f}ms / 예산 {budget}ms{over}", file=sys.stderr)
+    return mod
+
 
-        # 도움말
-        if arg in ("--help", "-h", "help"):
-            print_help()
-            return
+def start(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    timing = "--timing" in argv
+    argv = [a for a in argv if a != "--timing"]
 
-        # 설정창 실행
-        if arg in ("--setting", "-s", "setting"):
-            subprocess.Popen(["python", "setting.py", param_dev])
-            return
+    name, rest = resolve(argv)
+    if name is None:
+        print(f"알 수 없는 명령: {rest[0]}")
+        print_help()
+        return 2
+    if name == "help":
+        print_help()
+        return 0
 
-        # 자동 작업 실행
-        if arg in ("--run", "-r", "run"):
-            subprocess.Popen(["python", "main.py", param_dev])
-            return
+    # main.py / endpoints.py 는 import 할 때 sys.argv 의 플래그(--dev 등)를 읽으므로 먼저 바꿈
+    sys.argv = [f"run.py {name}"] + rest
+    return load(name, timing).main()
 
-    # 기본 → 자동작업 실행
-    subprocess.Popen(["python", "main2.py", param_dev])
 
 if __name__ == "__main__":
-    start()
+    sys.exit(start())
@@ -0,0 +1,79 @@
+# scheduler.py
+import math
+
+
+class BarScheduler:
+    """
+    대상별 봉 마감 시각에 맞춘 폴링 스케줄러
+
+    - 봉 주기(period, 초)를 설정하거나, 관측한 p1 변화 간격의 중앙값으로 학습
+    - 예상 마감 시각 ±window 초 안에서는 fast 간격으로, 그 밖에서는 slow 간격으로 폴링
+      (봉 사이 차트 다시 그리기도 slow 간격 안에는 잡힘)
+    - 주기를 모르는 대상은 항상 fast
+    - 시각은 호출자가 넘겨주므로(now) 가상 시계로 시험할 수 있음
+
+    periods 의 각 항목: None(학습) 또는 (period, offset) — offset 은 epoch 기준 마감 위상,
+    offset 이 None 이면 첫 p1 변화를 마감으로 본다
+    """
+
+    def __init__(self, periods, window=3.0, fast=0.01, slow=1.0, min_samples=3):
+        self.window = window
+        self.fast = fast
+        self.slow = slow
+        self.min_samples = min_samples
+
+        n = len(periods)
+        self.period = [None] * n
+        self.anchor = [None] * n  # 마지막으로 관측(또는 설정)한 마감 시각
+        for i, p in enumerate(periods):
+            if p is not None:
+                self.period[i] = float(p[0])
+                self.anchor[i] = None if p[1] is None else float(p[1])
+        self.next_poll = [0.0] * n
+        self.flips = [[] for _ in range(n)]
+        self.polls = 0
+
+    def expected_close(self, i, now):
+        """now 기준 아직 창(window)이 끝나지 않은 다음 마감 시각 (모르면 None)"""
+        period, anchor = self.period[i], self.anchor[i]
+        if period is None or anchor is None:
+            return None
+        k = math.ceil((now - self.window - anchor) / period)
+        return anchor + k * period
+
+    def interval(self, i, now):
+        close = self.expected_close(i, now)
+        if close is None or now >= close - self.window:
+            return self.fast
+        return max(self.fast, min(self.slow, close - self.window - now))
+
+    def due(self, now):
+        """지금 폴링할 대상 인덱스 목록 (각 대상의 다음 폴링 시각도 갱신)"""
+        out = []
+        for i, t in enumerate(self.next_poll):
+            if t <= now:
+                out.append(i)
+                self.next_poll[i] = now + self.interval(i, now)
+        self.polls += len(out)
+        return out
+
+    def next_wakeup(self, now):
+        """다음 폴링까지 남은 초"""
+        return max(0.0, min(self.next_poll) - now) if self.next_poll else self.slow
+
+    def observe(self, i, now):
+        """대상 i 의 p1 변화(봉 마감) 관측 → 위상 보정, 주기 학습"""
+        close = self.expected_close(i, now)
+        if close is not None and abs(now - close) > self.window:
+            return  # 봉 중간 다시 그리기 → 위상은 그대로
+        self.anchor[i] = now
+
+        flips = self.flips[i]
+        flips.append(now)
+        del flips[:-(self.min_samples + 1)]
+
+        if len(flips) > self.min_samples:
+            gaps = sorted(b - a for a, b in zip(flips, flips[1:]))
+            learned = gaps[len(gaps) // 2]
+            if self.period[i] is None and learned > 2 * self.window:
+                self.period[i] = learned
@@ -0,0 +1,369 @@
+# sender.py
+import json
+import queue
+import threading
+import time
+
+# requests 는 전송 스레드가 시작할 때 import (프로그램 시작 → 첫 틱 경로에서 뺌, ~100ms)
+requests = None
+
+
+def _import_requests():
+    global requests
+    if requests is None:
+        import requests as module
+        requests = module
+    return requests
+
+# 재시도하지 않는 HTTP 상태 (요청 자체가 잘못된 경우)
+NO_RETRY_STATUS = range(400, 500)
+
+
+class SendError(Exception):
+    """서버가 오류 상태 코드로 응답한 경우"""
+
+    def __init__(self, status, retry=True):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry = retry
+
+
+class SignalSender:
+    """
+    백그라운드 스레드에서 신호를 전송하는 비동기 전송기
+
+    - post_json / post_multipart 는 큐에 넣고 바로 반환 (Qt 타이머가 네트워크를 기다리지 않음)
+    - 큐가 가득 차면 버리고 dropped 로 센다
+    - requests.Session 하나로 keep-alive 커넥션을 재사용
+    - 실패하면 backoff * 2^n (최대 backoff_max) 간격으로 retries 번 재시도
+    - 결과는 results() 로 꺼내 UI 스레드에서 로그 출력
+    """
+
+    def __init__(self, max_queue=256, retries=3, backoff=0.5, backoff_max=8.0,
+                 timeout=(2, 5), pool_size=4, outbox=None, drain_batch=50,
+                 drain_interval=1.0, drain_backoff_max=60.0, batch_url=None,
+                 coalesce=0.0, max_batch=20, timings=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        # outbox.Outbox: 전송 전에 기록, 끝내 실패한 신호는 남겨 서버가 돌아오면 (또는 재시작 후)
+        # drain_batch 개씩 같은 커넥션으로 다시 보냄
+        self.outbox = outbox
+        self.drain_batch = drain_batch
+        self.drain_interval = drain_interval
+        self.drain_backoff_max = drain_backoff_max
+        self._next_drain = 0.0
+        # coalesce 초 > 0 이고 batch_url 이 있으면 그 시간 동안 모인 신호를 한 요청으로
+        # (서버가 배치를 거부하면 단건 전송으로 되돌아감)
+        self.batch_url = batch_url
+        self.coalesce = coalesce
+        self.max_batch = max_batch
+        self._batch_ok = True
+        # metrics.Metrics: 요청별 http 지연과 감지(detected_at, 없으면 큐에 넣은 시각) → 전송 완료(deliver) 지연
+        self.timings = timings
+        self.pool_size = pool_size
+        self.session = None
+        # 전송 스레드가 마지막으로 진행한 시각 (time.monotonic, watchdog 하트비트)
+        # 루프 한 바퀴와 요청 / 재시도 시도마다 갱신 (긴 drain / 단건 되돌림도 진행 중이면 정지로 안 봄)
+        self.alive = None
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._results = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {"sent": 0, "failed": 0, "dropped": 0, "retries": 0, "max_depth": 0,
+                       "replayed": 0, "batches": 0}
+
+    # ------------------------------------------------------------
+    # 시작 / 종료
+    # ------------------------------------------------------------
+    def start(self):
+        if self._thread is not None:
+            return
+        if self.outbox is not None:
+            self.outbox.recover()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="signal-sender", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """남은 큐를 timeout 초 동안 비운 뒤 종료"""
+        if self._thread is None:
+            return
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self._stop.set()
+        self._thread.join(max(0.0, deadline - time.monotonic()) + 0.1)
+        self._thread = None
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    # ------------------------------------------------------------
+    # 전송 요청 (논블로킹)
+    # ------------------------------------------------------------
+    def post_json(self, url, payload, meta=None, detected_at=None):
+        return self._put({"url": url, "json": payload, "meta": meta}, detected_at)
+
+    def post_multipart(self, url, data, files, meta=None, detected_at=None, durable=True):
+        """
+        files 값은 (파일명, bytes, content-type) — 재시도 시 다시 읽을 수 있게 bytes 로
+
+        durable=False 면 아웃박스에 남기지 않는다 (나중에 재전송하면 안 되는 델타 업로드 등)
+        """
+        return self._put({"url": url, "data": data, "files": files, "meta": meta}, detected_at, durable)
+
+    def _put(self, job, detected_at=None, durable=True):
+        job["queued"] = time.monotonic()
+        job["time"] = time.time() if detected_at is None else detected_at
+        if self.outbox is not None and durable:
+            job["id"] = self.outbox.add(job)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            if "id" in job:
+                # 버리지 않고 아웃박스에서 나중에 전송
+                self.outbox.defer(job["id"], 0)
+                return True
+            self._count("dropped")
+            self._results.put((job["meta"], False, "queue full", 0.0))
+            return False
+
+        depth = self._queue.qsize()
+        with self._lock:
+            if depth > self._stats["max_depth"]:
+                self._stats["max_depth"] = depth
+        return True
+
+    # ------------------------------------------------------------
+    # 결과 / 지표
+    # ------------------------------------------------------------
+    def results(self):
+        """완료된 전송 [(meta, ok, error, 지연초), ...] 를 꺼낸다."""
+        out = []
+        while True:
+            try:
+                out.append(self._results.get_nowait())
+            except queue.Empty:
+                return out
+
+    def fail(self, meta, error):
+        """큐에 넣기 전에 실패한 신호(스냅샷 인코딩 실패 등)를 실패 결과로 남긴다"""
+        self._count("failed")
+        self._results.put((meta, False, error, 0.0))
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["depth"] = self._queue.qsize()
+        if self.outbox is not None:
+            stats["outbox"] = self.outbox.pending()
+        return stats
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._stats[key] += n
+
+    # ------------------------------------------------------------
+    # 워커
+    # ------------------------------------------------------------
+    def _connect(self):
+        """keep-alive 세션 (전송 스레드에서 처음 한 번)"""
+        if self.session is None:
+            _import_requests()
+            from requests.adapters import HTTPAdapter
+
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self.session = session
+        return self.session
+
+    def _run(self):
+        self._connect()
+        while not self._stop.is_set():
+            self.alive = time.monotonic()
+            try:
+                job = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                self._drain()
+                continue
+            jobs = [job] + self._coalesce(job)
+            try:
+                if len(jobs) > 1:
+                    self._send_batch(jobs)
+                else:
+                    self._send(job)
+            finally:
+                for _ in jobs:
+                    self._queue.task_done()
+
+    def _coalesce(self, first):
+        """coalesce 초 동안 큐에 들어온 신호를 모은다 (배치 모드일 때만)"""
+        if not self._batching():
+            return []
+        jobs = []
+        deadline = first["queued"] + self.coalesce
+        while len(jobs) + 1 < self.max_batch:
+            wait = deadline - time.monotonic()
+            try:
+                jobs.append(self._queue.get(timeout=wait) if wait > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return jobs
+
+    def _batching(self):
+        return self.coalesce > 0 and self.batch_url is not None and self._batch_ok
+
+    def _send(self, job):
+        ok, error = self._retry(lambda: self._post(job))
+        self._finish(job, ok, error)
+
+    def _send_batch(self, jobs):
+        ok, error = self._retry(lambda: self._post_batch(jobs))
+        if not ok and not self._batch_ok:
+            # 서버가 배치를 거부 → 하나씩 전송
+            for job in jobs:
+                self._send(job)
+            return
+        self._count("batches")
+        for job in jobs:
+            self._finish(job, ok, error)
+
+    def _finish(self, job, ok, error):
+        self._count("sent" if ok else "failed")
+        if ok and self.timings is not None:
+            self.timings.record("deliver", time.time() - job["time"])
+        if "id" in job:
+            if ok:
+                self.outbox.ack(job["id"])
+            else:
+                self.outbox.defer(job["id"], self.drain_interval)
+        self._results.put((job["meta"], ok, error, time.monotonic() - job["queued"]))
+
+    def _drain(self):
+        """아웃박스에 남은 신호를 drain_batch 개씩 재전송 (실패하면 backoff 후 다시)"""
+        if self.outbox is None or time.monotonic() < self._next_drain:
+            return
+        self._next_drain = time.monotonic() + self.drain_interval
+
+        jobs = self.outbox.due(self.drain_batch)
+        sent = 0
+        if len(jobs) > 1 and self.batch_url is not None and self._batch_ok:
+            try:
+                for i in range(0, len(jobs), self.max_batch):
+                    self.alive = time.monotonic()
+                    chunk = jobs[i:i + self.max_batch]
+                    self._post_batch(chunk)
+                    self._replayed(chunk)
+                    sent = i + len(chunk)
+            except (SendError, requests.RequestException):
+                if self._batch_ok:
+                    self._defer_rest(jobs[sent:])
+                    return
+
+        for i, job in enumerate(jobs[sent:], sent):
+            if self._stop.is_set():
+                return
+            self.alive = time.monotonic()
+            try:
+                self._post(job)
+            except (SendError, requests.RequestException):
+                # 서버가 아직 안 살아남 → 나머지는 다음 drain 으로
+                self._defer_rest(jobs[i:])
+                return
+            self._replayed([job])
+
+        if len(jobs) == self.drain_batch:
+            # 더 남았으면 바로 다음 배치
+            self._next_drain = 0.0
+
+    def _replayed(self, jobs):
+        self.outbox.ack([job["id"] for job in jobs])
+        self._count("replayed", len(jobs))
+        for job in jobs:
+            if self.timings is not None:
+                self.timings.record("deliver", time.time() - job["time"])
+            self._results.put((job["meta"], True, None, 0.0))
+
+    def _defer_rest(self, jobs):
+        delay = min(self.backoff * 2 ** jobs[0]["attempts"], self.drain_backoff_max)
+        self.outbox.defer([job["id"] for job in jobs], delay)
+
+    def _retry(self, post):
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retries")
+                delay = min(self.backoff * 2 ** (attempt - 1), self.backoff_max)
+                if self._stop.wait(delay):
+                    break
+            self.alive = time.monotonic()
+            try:
+                post()
+                return True, None
+            except SendError as e:
+                error = str(e)
+                if not e.retry:
+                    break
+            except requests.RequestException as e:
+                error = f"{type(e).__name__}: {e}"
+        return False, error
+
+    def _post(self, job):
+        self.alive = time.monotonic()
+        start = time.perf_counter()
+        res = self.session.post(
+            job["url"],
+            json=job.get("json"),
+            data=job.get("data"),
+            files=job.get("files"),
+            timeout=self.timeout,
+        )
+        if self.timings is not None:
+            self.timings.record("http", time.perf_counter() - start)
+        if res.status_code >= 400:
+            raise SendError(res.status_code, retry=res.status_code not in NO_RETRY_STATUS)
+        return res
+
+    def _post_batch(self, jobs):
+        """
+        여러 신호를 batch_url 로 한 번에 전송
+
+        - 신호 목록은 "signals" 필드(JSON), 각 항목에 detected_at(감지 시각, epoch 초)
+        - 이미지가 있으면 multipart 로, 파일 필드는 "<필드명>_<순번>" 으로 바꿔 항목에 기록
+        - 4xx 응답이면 배치 미지원으로 보고 이후엔 단건 전송
+        """
+        signals, files = [], {}
+        for i, job in enumerate(jobs):
+            item = dict(job.get("json") or job.get("data") or {})
+            item["detected_at"] = job["time"]
+            for field, content in (job.get("files") or {}).items():
+                key = f"{field}_{i}"
+                files[key] = content
+                item[field] = key
+            signals.append(item)
+
+        self.alive = time.monotonic()
+        start = time.perf_counter()
+        if files:
+            res = self.session.post(
+                self.batch_url,
+                data={"signals": json.dumps(signals, ensure_ascii=False)},
+                files=files,
+                timeout=self.timeout,
+            )
+        else:
+            res = self.session.post(self.batch_url, json={"signals": signals}, timeout=self.timeout)
+        if self.timings is not None:
+            self.timings.record("http_batch", time.perf_counter() - start)
+
+        if res.status_code in NO_RETRY_STATUS:
+            self._batch_ok = False
+        if res.status_code >= 400:
+            raise SendError(res.status_code, retry=res.status_code not in NO_RETRY_STATUS)
+        return res
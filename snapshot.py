@@ -0,0 +1,81 @@
+# snapshot.py
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# 코덱 이름 → (확장자, content-type)
+CODECS = {
+    "png": ("png", "image/png"),
+    "png8": ("png", "image/png"),
+    "webp": ("webp", "image/webp"),
+    "jpeg": ("jpg", "image/jpeg"),
+}
+
+
+def encode(arr, codec="png", level=1, quality=80, colors=16):
+    """
+    (h, w, 3) RGB uint8 배열 → (bytes, 파일명, content-type)
+
+    - png  : zlib 압축 레벨 level (0~9, 기본 1 = 빠름)
+    - png8 : colors 색으로 팔레트 양자화한 PNG (차트는 색이 몇 개 안 됨)
+    - webp : quality (무손실은 quality=100)
+    - jpeg : quality
+    """
+    from PIL import Image
+
+    if codec not in CODECS:
+        raise ValueError(f"unknown snapshot codec: {codec}")
+
+    arr = np.ascontiguousarray(arr, dtype=np.uint8)
+    h, w = arr.shape[:2]
+    # 배열 메모리를 그대로 쓰는 Image (복사 없음)
+    img = Image.frombuffer("RGB", (w, h), arr, "raw", "RGB", 0, 1)
+
+    out = io.BytesIO()
+    if codec == "png":
+        img.save(out, format="PNG", compress_level=level)
+    elif codec == "png8":
+        img = img.quantize(colors=colors, method=Image.Quantize.FASTOCTREE)
+        img.save(out, format="PNG", compress_level=level)
+    elif codec == "webp":
+        img.save(out, format="WEBP", quality=quality, lossless=quality >= 100, method=0)
+    else:
+        img.save(out, format="JPEG", quality=quality)
+
+    ext, ctype = CODECS[codec]
+    return out.getvalue(), f"signal.{ext}", ctype
+
+
+class SnapshotEncoder:
+    """
+    신호 스냅샷을 UI 스레드 밖에서 인코딩하는 인코더
+
+    submit(arr, callback, errback) 은 바로 반환하고, 인코딩이 끝나면 작업 스레드에서
+    callback(bytes, 파일명, content-type) 을 호출한다.
+    인코딩이나 callback 이 실패하면 errback(예외) 을 호출한다 (신호가 조용히 사라지지 않도록).
+    """
+
+    def __init__(self, codec="png", workers=1, **options):
+        if codec not in CODECS:
+            raise ValueError(f"unknown snapshot codec: {codec}")
+        self.codec = codec
+        self.options = options
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="snapshot")
+
+    def encode(self, arr):
+        return encode(arr, self.codec, **self.options)
+
+    def submit(self, arr, callback, errback=None):
+        def run():
+            try:
+                callback(*self.encode(arr))
+            except Exception as e:
+                if errback is None:
+                    raise
+                errback(e)
+
+        return self._pool.submit(run)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
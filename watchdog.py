@@ -0,0 +1,312 @@
+# watchdog.py
+"""
+감시 프로세스 워치독 / 핫 재시작 감독자
+
+    python run.py watch [--stall 3] [--grab-stall 10] [--send-stall 60] [--grace 30] [명령 [인자...]]
+    python run.py watch headless --source screen --send
+    python run.py watch run --dev
+
+명령(기본 run)을 자식 프로세스로 띄우고 하트비트를 본다.
+- 하트비트: 자식이 틱마다 메모리 맵 파일(float64 몇 칸)에 쓰는 마지막 틱 / 마지막 캡처 / 전송 스레드 시각
+  (시스템 전체 time.monotonic, 틱마다 파일 쓰기 없음)
+- 틱이 stall 초, 캡처가 grab_stall 초, 전송 스레드가 send_stall 초 넘게 멈추거나
+  첫 틱이 grace 초 안에 없으면 자식을 kill 하고 다시 띄운다 (Qt 이벤트 루프 정지, 막힌 전송 등)
+- 비정상 종료(exit != 0)도 다시 띄운다. 정상 종료(종료 버튼, --ticks)면 감독자도 끝낸다
+- 판정 상태(detector.SignalDetector.state) 는 확정 상태가 바뀔 때마다 자식이 상태 파일에 쓰고,
+  새 자식이 시작할 때 읽어 이어받는다 → 재시작해도 화면이 그대로면 같은 신호를 다시 보내지 않음
+- 지표(METRICS_FILE): heartbeat_age(틱 정지 분포), outage(마지막 틱 → 새 자식 첫 틱),
+  recovery(감지 → 새 자식 첫 틱), restarts / stall_<원인> 카운터
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from metrics import Metrics
+
+WATCH_ENV = "BUJA_WATCHDOG"  # 감독자가 자식에게 넘기는 하트비트 / 상태 파일 폴더
+STARTED_ENV = "BUJA_STARTED"  # core.STARTED_ENV (자식마다 띄운 시각으로 새로)
+WATCH_DIR = os.path.join("dist", "watchdog")
+METRICS_FILE = os.path.join("dist", "watchdog.json")
+HEARTBEAT_FILE = "heartbeat.bin"
+STATE_FILE = "state.json"
+RUN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run.py")
+
+# 하트비트 (float64 8칸): 자식 pid, 첫 틱, 마지막 틱, 마지막 캡처, 전송 스레드, 틱 수, 상태 저장 수, 인계 대상 수
+FIELDS = 8
+PID, FIRST, TICK, GRAB, SEND, TICKS, SAVES, RESTORED = range(FIELDS)
+
+
+class Heartbeat:
+    """
+    자식 쪽 하트비트 + 판정 상태 체크포인트 (core.DetectionCore 가 틱마다 호출)
+
+    - tick(): 틱 시작, grabbed(): 캡처 성공 (또는 이번 틱에 캡처할 대상 없음)
+    - send 에 전송 스레드의 마지막 동작 시각을 돌려주는 함수를 주면 틱마다 같이 기록
+      (예: lambda: sender.alive, 전송 스레드가 막히면 틱은 돌아도 감독자가 재시작)
+    - checkpoint(detector): 확정 상태가 바뀌었을 때만 상태 파일에 씀 (임시 파일 → 교체)
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.state_path = os.path.join(directory, STATE_FILE)
+        self.fields = np.memmap(os.path.join(directory, HEARTBEAT_FILE), dtype=np.float64,
+                                mode="r+", shape=(FIELDS,))
+        self.send = None
+        self._version = None
+        self.fields[GRAB] = time.monotonic()
+        self.fields[PID] = os.getpid()
+
+    @classmethod
+    def attach(cls):
+        """감독자 아래에서 실행 중이면 Heartbeat, 아니면 None"""
+        directory = os.environ.get(WATCH_ENV)
+        if not directory:
+            return None
+        return cls(directory)
+
+    def tick(self):
+        fields = self.fields
+        fields[TICK] = now = time.monotonic()
+        if not fields[TICKS]:
+            fields[FIRST] = now
+        fields[TICKS] += 1
+        if self.send is not None:
+            alive = self.send()
+            if alive is not None:
+                fields[SEND] = alive
+
+    def grabbed(self):
+        self.fields[GRAB] = time.monotonic()
+
+    def restore(self, detector):
+        """이전 자식이 남긴 판정 상태를 detector 로 (복원한 대상 수)"""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        restored = detector.restore(state)
+        self.fields[RESTORED] = restored
+        self._version = detector.version
+        return restored
+
+    def checkpoint(self, detector):
+        if detector.version == self._version:
+            return False
+        self._version = detector.version
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(detector.state(), f)
+        os.replace(tmp, self.state_path)
+        self.fields[SAVES] += 1
+        return True
+
+
+class Watchdog:
+    """
+    명령을 자식 프로세스로 띄우고 하트비트가 멈추면 kill 후 다시 띄우는 감독자
+
+    복구 시간 ≈ stall + check + 자식 시작 시간 (최악 신호 지연).
+    첫 틱 전에 죽거나 멈추는 자식(설정 오류 등)은 backoff 초부터 두 배씩(최대 backoff_max)
+    기다렸다 다시 띄운다 (한 번이라도 틱하면 초기화, 돌던 자식은 바로 다시 띄움).
+    handover=False 면 판정 상태를 인계하지 않는다 (자식마다 처음부터 읽음).
+    """
+
+    def __init__(self, command, stall=3.0, grab_stall=10.0, send_stall=60.0, grace=30.0,
+                 check=0.1, backoff=0.5, backoff_max=10.0, handover=True,
+                 metrics=None, directory=None):
+        self.command = list(command)
+        self.stall = stall
+        self.grab_stall = grab_stall
+        self.send_stall = send_stall
+        self.grace = grace
+        self.check = check
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.handover = handover
+        self.metrics = metrics or Metrics()
+        self.metrics.add_source("watchdog", self.status)
+
+        self.directory = directory or os.path.join(WATCH_DIR, str(os.getpid()))
+        os.makedirs(self.directory, exist_ok=True)
+        self.state_path = os.path.join(self.directory, STATE_FILE)
+        # 이전 감독자가 남긴 상태는 인계하지 않음 (처음 띄우는 자식은 새로 읽음)
+        self._clear_state()
+        self.fields = np.memmap(os.path.join(self.directory, HEARTBEAT_FILE), dtype=np.float64,
+                                mode="w+", shape=(FIELDS,))
+
+        self.proc = None
+        self.spawned = 0.0
+        self.generation = 0
+        self.restarts = 0
+        self.failures = 0
+        self.failed_at = None  # 정지 / 종료를 감지한 시각 (새 자식 첫 틱까지 recovery)
+        self.last_tick = None  # 죽은 자식의 마지막 틱 (새 자식 첫 틱까지 outage)
+        self.last_reason = None
+
+    def child_args(self):
+        if getattr(sys, "frozen", False):
+            # run.exe 로 묶였으면 실행 파일 자체가 run.py
+            return [sys.executable] + self.command
+        return [sys.executable, RUN_FILE] + self.command
+
+    def _clear_state(self):
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+    def spawn(self):
+        if not self.handover:
+            self._clear_state()
+        self.fields[:] = 0
+        env = dict(os.environ)
+        env[WATCH_ENV] = self.directory
+        # run.py 는 이미 있는 시작 시각을 그대로 쓰므로 자식마다 새로 (startup 은 자식 기준)
+        env[STARTED_ENV] = repr(time.time())
+        self.proc = subprocess.Popen(self.child_args(), env=env)
+        self.spawned = time.monotonic()
+        self.generation += 1
+        return self.proc
+
+    def stalled(self, now):
+        """하트비트로 본 정지 원인 (tick / grab / send / startup), 정상이면 None"""
+        fields = self.fields
+        if fields[TICKS] == 0:
+            return "startup" if now - self.spawned > self.grace else None
+        age = now - fields[TICK]
+        self.metrics.record("heartbeat_age", max(0.0, age))
+        if age > self.stall:
+            return "tick"
+        if now - fields[GRAB] > self.grab_stall:
+            return "grab"
+        if fields[SEND] and now - fields[SEND] > self.send_stall:
+            return "send"
+        return None
+
+    def poll(self, now=None):
+        """
+        자식 상태를 한 번 확인 (필요하면 kill / 다시 띄움)
+
+        반환: None(정상), 재시작 원인 문자열, 자식이 정상 종료했으면 "exit"
+        """
+        now = time.monotonic() if now is None else now
+        fields = self.fields
+        if self.failed_at is not None and fields[TICKS] > 0:
+            # 새 자식의 첫 틱 → 복구 완료
+            self.metrics.record("recovery", fields[FIRST] - self.failed_at)
+            if self.last_tick is not None:
+                self.metrics.record("outage", fields[FIRST] - self.last_tick)
+            self.failed_at = self.last_tick = None
+
+        code = self.proc.poll()
+        if code == 0:
+            return "exit"
+        reason = "crash" if code is not None else self.stalled(now)
+        if reason is None:
+            return None
+
+        delay = 0.0
+        if fields[TICKS] > 0:
+            self.last_tick = float(fields[TICK])
+            self.failures = 0
+        else:
+            delay = min(self.backoff_max, self.backoff * 2 ** self.failures)
+            self.failures += 1
+        if self.failed_at is None:
+            self.failed_at = now
+        if code is None:
+            self.proc.kill()
+            self.proc.wait()
+        self.metrics.count(f"stall_{reason}")
+        self.metrics.count("restarts")
+        self.restarts += 1
+        self.last_reason = reason
+        print(f"[watchdog] 자식 재시작: {reason} (pid {self.proc.pid}, exit {self.proc.returncode}, "
+              f"{delay:.1f}초 뒤)", file=sys.stderr, flush=True)
+        if delay:
+            time.sleep(delay)
+        self.spawn()
+        return reason
+
+    def run(self, duration=None):
+        """자식이 정상 종료하거나 duration 초가 지날 때까지 감시"""
+        end = None if duration is None else time.monotonic() + duration
+        if self.proc is None:
+            self.spawn()
+        while end is None or time.monotonic() < end:
+            if self.poll() == "exit":
+                return 0
+            self.metrics.maybe_dump()
+            time.sleep(self.check)
+        return None
+
+    def status(self):
+        fields = self.fields
+        now = time.monotonic()
+        ticks = int(fields[TICKS]) if fields is not None else 0
+        return {
+            "generation": self.generation,
+            "pid": self.proc.pid if self.proc is not None else None,
+            "restarts": self.restarts,
+            "last_reason": self.last_reason,
+            "ticks": ticks,
+            "heartbeat_age": now - float(fields[TICK]) if ticks else None,
+            "state_saves": int(fields[SAVES]) if fields is not None else 0,
+            "restored": int(fields[RESTORED]) if fields is not None else 0,
+        }
+
+    def stop(self, timeout=5.0):
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self.metrics.close()
+        # 윈도우는 맵을 닫아야 파일을 지울 수 있음
+        self.fields = None
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="run.py watch", description="감시 프로세스 워치독 / 핫 재시작")
+    parser.add_argument("--stall", type=float, default=3.0, help="틱이 이 시간(초) 넘게 멈추면 재시작")
+    parser.add_argument("--grab-stall", type=float, default=10.0, help="캡처가 이 시간(초) 넘게 실패하면 재시작")
+    parser.add_argument("--send-stall", type=float, default=60.0,
+                        help="전송 스레드가 이 시간(초) 넘게 멈추면 재시작")
+    parser.add_argument("--grace", type=float, default=30.0, help="첫 틱까지 기다리는 시간(초)")
+    parser.add_argument("--check", type=float, default=0.1, help="하트비트 확인 간격(초)")
+    parser.add_argument("--no-handover", action="store_true",
+                        help="재시작할 때 판정 상태를 인계하지 않음 (화면의 신호를 다시 보냄)")
+    parser.add_argument("--duration", type=float, default=None)
+    parser.add_argument("--metrics", default=METRICS_FILE, help="재시작 / 정지 지표 JSON 파일")
+    parser.add_argument("--dev", action="store_true", help="개발 서버로 전송 (감시할 명령에 넘김)")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="감시할 run.py 명령 (기본 run)")
+    args = parser.parse_args(argv)
+
+    command = args.command or ["run"]
+    if args.dev and "--dev" not in command:
+        command = command + ["--dev"]
+    watchdog = Watchdog(command, stall=args.stall, grab_stall=args.grab_stall,
+                        send_stall=args.send_stall, grace=args.grace, check=args.check,
+                        handover=not args.no_handover, metrics=Metrics(args.metrics))
+    print(f"[watchdog] 감시 시작: {' '.join(command)}", file=sys.stderr, flush=True)
+    code = 0
+    try:
+        code = watchdog.run(args.duration) or 0
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watchdog.stop()
+        print(f"[watchdog] restarts={watchdog.restarts} {watchdog.metrics.counters}", file=sys.stderr)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,6 +26,22 @@ def get_window_list():
     return window_list
 
 
+def find_windows(title: str):
+    """
+    제목에 title 이 들어간(대소문자 무시) 모든 창.
+    return: [(hwnd, x, y, w, h), ...]  - 화면 좌표, EnumWindows 순서
+    """
+    found = []
+
+    def enum_handler(hwnd, _):
+        if title.lower() in win32gui.GetWindowText(hwnd).lower():
+            x1, y1, x2, y2 = win32gui.GetWindowRect(hwnd)
+            found.append((hwnd, x1, y1, x2 - x1, y2 - y1))
+
+    win32gui.EnumWindows(enum_handler, None)
+    return found
+
+
 def get_window_rect(title: str = "Buja Chart"):
     """
     제목이 title 인 윈도우의 핸들과 위치/크기를 반환.
@@ -68,4 +84,29 @@ def remove_topmost(hwnd):
         win32con.HWND_NOTOPMOST,
         0, 0, 0, 0,
         win32con.SWP_NOMOVE | win32con.SWP_NOSIZE
-    )
\ No newline at end of file
+    )
+
+class Win32WindowProvider:
+    """geometry.WindowTracker 용 win32 창 정보 (찾기는 제목 부분 일치, 대소문자 무시, index 번째 창)"""
+
+    def __init__(self, index=0):
+        self.index = index
+
+    def find(self, title):
+        found = find_windows(title)
+        return found[self.index][0] if len(found) > self.index else None
+
+    def rect(self, hwnd):
+        if not win32gui.IsWindow(hwnd):
+            raise RuntimeError("window closed")
+        x1, y1, x2, y2 = win32gui.GetWindowRect(hwnd)
+        return x1, y1, x2 - x1, y2 - y1
+
+    def scale(self, hwnd):
+        import ctypes
+
+        try:
+            return ctypes.windll.user32.GetDpiForWindow(hwnd) / 96.0
+        except AttributeError:
+            # Windows 10 이전
+            return 1.0
@@ -0,0 +1,256 @@
+# workers.py
+"""
+창/모니터별 캡처+감지 워커 프로세스와 단일 전송 감독자
+
+    python run.py multi [--title "buja chart"] [--windows windows.json] [--send] [--dev]
+                        [--kernel vstrip] [--debounce 2] [--hold 0] [--cooldown 1]
+
+windows.json 예:
+[
+    { "name": "left",  "title": "buja chart", "index": 0, "targets": "dist/target.json" },
+    { "name": "right", "monitor": 2, "targets": "dist/target_right.json" },
+    { "name": "file",  "source": "screen.png", "origin": [0, 0], "targets": "dist/target.json" }
+]
+
+- 워커마다 자기 mss 핸들 / DetectionCore 로 독립 실행 (GIL 공유 없음)
+- 신호는 multiprocessing.Queue 로 감독자에게 보내고,
+  감독자는 같은 (이름, 신호) 를 dedup_window 초 안에 한 번만 전송
+"""
+import argparse
+import json
+import multiprocessing as mp
+import queue
+import time
+
+from core import (PROBE_KERNEL, SIGNAL_COOLDOWN_SEC, SIGNAL_DEBOUNCE, SIGNAL_HOLD_SEC, TARGET_FILE,
+                  DetectionCore, add_detect_args, load_targets, open_source)
+from palette import PALETTE_FILE, PaletteFile
+
+WIN_TITLE = "buja chart"
+
+
+def resolve_origin(spec):
+    """워커 설정 → 모니터(또는 고정 origin) 좌상단 화면 좌표 (창은 worker_main 이 WindowTracker 로 추적)"""
+    if spec.get("origin") is not None:
+        return tuple(spec["origin"])
+    if spec.get("monitor") is not None:
+        import mss
+
+        with mss.mss() as sct:
+            mon = sct.monitors[spec["monitor"]]
+        return mon["left"], mon["top"]
+    return 0, 0
+
+
+def worker_main(spec, out, stop, interval=0.01, kernel=PROBE_KERNEL, debounce=SIGNAL_DEBOUNCE,
+                hold=SIGNAL_HOLD_SEC, cooldown=SIGNAL_COOLDOWN_SEC):
+    """워커 프로세스 본체: 틱마다 감지한 신호를 out 큐로 (커널 / 디바운스 / 쿨다운은 앱 / headless 와 같은 기본값)"""
+    # 앱 / headless 와 같은 dist/palette.json (LUT 분류, 실행 중 수정하면 다시 읽음)
+    palettes = PaletteFile(PALETTE_FILE)
+    core = DetectionCore(
+        open_source(spec.get("source", "screen")),
+        load_targets(spec.get("targets", TARGET_FILE)),
+        palettes.palette.signal_colors,
+        tol=palettes.palette.tol,
+        gate=True,
+        kernel=kernel,
+        debounce=debounce,
+        hold=hold,
+        cooldown=cooldown,
+        lut=True,
+    )
+    core.watch_palette(palettes)
+    name = spec["name"]
+    tracker = None
+    if spec.get("title") is not None:
+        # 앱처럼 창 위치/배율을 주기적으로 다시 읽어 창을 옮겨도 같은 자리를 읽음
+        from geometry import WindowTracker
+        from winutil import Win32WindowProvider
+
+        tracker = WindowTracker(Win32WindowProvider(spec.get("index", 0)), spec["title"])
+        tracker.listeners.append(core.set_geometry)
+        if not tracker.refresh():
+            print(f"[{name}] 창을 찾지 못함: {spec['title']} (찾을 때까지 다시 시도)", flush=True)
+    else:
+        core.engine.set_origin(*resolve_origin(spec))
+
+    next_tick = time.monotonic()
+    try:
+        while not stop.is_set():
+            if tracker is not None:
+                tracker.poll()
+            for sig in core.tick():
+                out.put((name, sig))
+            palette = core.poll_palette()
+            if palette is not None:
+                print(f"[{name}] 팔레트 다시 읽음: {', '.join(palette.names)} (tol={palette.tol})", flush=True)
+            elif palettes.error is not None:
+                error, palettes.error = palettes.error, None
+                print(f"[{name}] [팔레트 읽기 실패] {palettes.path} / {error}", flush=True)
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        core.close()
+
+
+class SignalDeduper:
+    """여러 창에서 같은 종목 신호가 겹칠 때 window 초 안의 중복을 거른다."""
+
+    def __init__(self, window=5.0):
+        self.window = window
+        self._seen = {}
+        self.dropped = 0
+
+    def accept(self, sig):
+        key = (sig["name"], sig["signal"])
+        last = self._seen.get(key)
+        if last is not None and sig["time"] - last < self.window:
+            self.dropped += 1
+            return False
+        self._seen[key] = sig["time"]
+        return True
+
+
+class Supervisor:
+    """
+    워커 프로세스를 띄우고 결과를 모아 싱크(PrintSink, HttpSink 등)로 보내는 감독자
+
+    워커가 죽으면 restart=True 일 때 다시 띄운다.
+    detect 는 worker_main 에 넘길 kernel / debounce / hold / cooldown (없으면 core 기본값).
+    """
+
+    def __init__(self, specs, sinks, dedup_window=5.0, interval=0.01, restart=True, detect=None):
+        self.specs = specs
+        self.sinks = sinks
+        self.deduper = SignalDeduper(dedup_window)
+        self.interval = interval
+        self.restart = restart
+        self.detect = dict(detect or {})
+
+        ctx = mp.get_context("spawn")
+        self._ctx = ctx
+        self.queue = ctx.Queue()
+        self.stop_event = ctx.Event()
+        self.procs = {}
+        self.received = 0
+
+    def start(self):
+        for spec in self.specs:
+            self._spawn(spec)
+
+    def _spawn(self, spec):
+        proc = self._ctx.Process(
+            target=worker_main,
+            args=(spec, self.queue, self.stop_event, self.interval),
+            kwargs=self.detect,
+            name=f"worker-{spec['name']}",
+            daemon=True,
+        )
+        proc.start()
+        self.procs[spec["name"]] = (spec, proc)
+
+    def poll(self, timeout=0.1):
+        """결과 큐를 비우고 중복 아닌 신호를 싱크로 (처리한 신호 목록 반환)"""
+        out = []
+        try:
+            item = self.queue.get(timeout=timeout)
+        except queue.Empty:
+            item = None
+        while item is not None:
+            worker, sig = item
+            self.received += 1
+            if self.deduper.accept(sig):
+                sig["worker"] = worker
+                for sink in self.sinks:
+                    sink.emit(sig)
+                out.append(sig)
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                item = None
+
+        if self.restart and not self.stop_event.is_set():
+            for spec, proc in list(self.procs.values()):
+                if not proc.is_alive():
+                    print(f"워커 재시작: {spec['name']} (exit {proc.exitcode})")
+                    self._spawn(spec)
+        return out
+
+    def run(self, duration=None):
+        end = None if duration is None else time.monotonic() + duration
+        while end is None or time.monotonic() < end:
+            self.poll()
+
+    def stop(self, timeout=5.0):
+        self.stop_event.set()
+        for _, proc in self.procs.values():
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        self.poll(timeout=0)
+        for sink in self.sinks:
+            sink.close()
+
+
+def discover(title=WIN_TITLE, targets=TARGET_FILE):
+    """제목에 title 이 들어간 창마다 워커 하나"""
+    from winutil import find_windows
+
+    return [
+        {"name": f"win{i}", "title": title, "index": i, "targets": targets}
+        for i in range(len(find_windows(title)))
+    ]
+
+
+def main(argv=None):
+    from core import HttpSink, PrintSink
+
+    parser = argparse.ArgumentParser(prog="run.py multi", description="창/모니터별 워커 프로세스")
+    parser.add_argument("--windows", help="워커 설정 JSON (없으면 --title 로 창 검색)")
+    parser.add_argument("--title", default=WIN_TITLE)
+    parser.add_argument("--targets", default=TARGET_FILE)
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--dedup", type=float, default=5.0, help="중복 신호 무시 시간(초)")
+    parser.add_argument("--duration", type=float, default=None)
+    parser.add_argument("--send", action="store_true")
+    parser.add_argument("--dev", action="store_true", help="개발 서버로 전송")
+    add_detect_args(parser)
+    args = parser.parse_args(argv)
+
+    if args.windows:
+        with open(args.windows, "r", encoding="utf-8") as f:
+            specs = json.load(f)
+    else:
+        specs = discover(args.title, args.targets)
+    if not specs:
+        print("감시할 창이 없음.")
+        return
+
+    sinks = [PrintSink()]
+    if args.send:
+        from endpoints import FASTAPI_URL
+
+        sinks.append(HttpSink(FASTAPI_URL))
+
+    sup = Supervisor(specs, sinks, dedup_window=args.dedup, interval=args.interval,
+                     detect={"kernel": args.kernel, "debounce": args.debounce, "hold": args.hold,
+                             "cooldown": args.cooldown})
+    sup.start()
+    print(f"워커 {len(specs)}개 시작: {', '.join(s['name'] for s in specs)}")
+    try:
+        sup.run(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sup.stop()
+        print(f"received={sup.received} duplicates={sup.deduper.dropped}")
+
+
+if __name__ == "__main__":
+    main()